@@ -30,6 +30,8 @@ class UserAdmin(BaseUserAdmin):
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "first_name_fa",
                     "last_name_fa", "city", "sms_opt_in")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
     search_fields = ("user__phone_number", "first_name_fa",
                      "last_name_fa", "city")
 
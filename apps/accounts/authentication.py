@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.tokens import is_revoked
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user built from access-token claims (id, is_staff, is_superuser,
+    profile flags). Anything else — other fields, permissions, related
+    objects — loads the User row once on first access.
+    """
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+    @property
+    def db_user(self):
+        """The real User instance, for ORM assignments and writes."""
+        if "_db_user" not in self.__dict__:
+            self.__dict__["_db_user"] = get_user_model()._default_manager.get(
+                **{api_settings.USER_ID_FIELD: self.id})
+        return self.__dict__["_db_user"]
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.db_user, attr)
+
+    @property
+    def groups(self):
+        return self.db_user.groups
+
+    @property
+    def user_permissions(self):
+        return self.db_user.user_permissions
+
+    def get_group_permissions(self, obj=None):
+        return self.db_user.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj=None):
+        return self.db_user.get_all_permissions(obj)
+
+    def has_perm(self, perm, obj=None):
+        return self.db_user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return self.db_user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module):
+        return self.db_user.has_module_perms(module)
+
+
+class RevocableJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that also rejects tokens on the revocation list."""
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_revoked(token):
+            raise InvalidToken(_("Token has been revoked"))
+        return token
+
+
+class StatelessJWTAuthentication(RevocableJWTAuthentication):
+    """No user query per request: `request.user` is a ClaimsUser."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return ClaimsUser(validated_token)
@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from apps.accounts.services.phone import normalize_phone
+
+UserModel = get_user_model()
+
+
+class PhoneNumberBackend(ModelBackend):
+    """
+    ModelBackend that accepts the phone in any format users type (09…, 0098…,
+    +98…) and looks it up as E.164: one query on the unique phone column.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        raw = username if username is not None else kwargs.get(UserModel.USERNAME_FIELD)
+        if raw is None:
+            return None
+        return super().authenticate(request, username=normalize_phone(raw) or raw,
+                                    password=password)
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.checks import Tags, register
+
+from apps.common.checks import require_shared_cache
+
+
+@register(Tags.security, deploy=True)
+def check_revocation_cache(app_configs, **kwargs):
+    # with stateless JWT the revocation list is the only thing that ends a session early
+    if not settings.ACCOUNTS_STATELESS_JWT:
+        return []
+    return require_shared_cache("JWT revocations", "accounts.E001")
+
+
+@register(Tags.security, deploy=True)
+def check_rate_limit_cache(app_configs, **kwargs):
+    # per-process windows multiply the OTP limits by the number of workers
+    return require_shared_cache("OTP rate-limit windows", "accounts.E002")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_userprofile_city_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['phone_number', 'purpose', '-created_at'], name='accounts_ot_phone_n_1600d0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['expires_at'], name='accounts_ot_expires_2f08f4_idx'),
+        ),
+    ]
@@ -89,6 +89,12 @@ class OTPCode(UUIDModel):
     consumed_at = models.DateTimeField(null=True, blank=True)
     attempts = models.PositiveSmallIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["phone_number", "purpose", "-created_at"]),
+            models.Index(fields=["expires_at"]),  # purge_expired_otps
+        ]
+
     def __str__(self):
         return f"OTP<{self.phone_number}, {self.purpose}>"
 
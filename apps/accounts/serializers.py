@@ -0,0 +1,24 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.tokens import add_user_claims, is_revoked
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        if is_revoked(RefreshToken(attrs["refresh"])):
+            raise InvalidToken(_("Token has been revoked"))
+        return super().validate(attrs)
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
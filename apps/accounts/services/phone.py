@@ -0,0 +1,9 @@
+from phonenumber_field.phonenumber import PhoneNumber, to_python
+
+
+def normalize_phone(value) -> str | None:
+    """E.164 form of a phone number (Iranian numbers may be given locally), or None."""
+    number = to_python(value, region="IR")
+    if not isinstance(number, PhoneNumber) or not number.is_valid():
+        return None
+    return number.as_e164
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import User
+from apps.accounts.tokens import revoke_user
+
+# fields carried in (or guarding) issued JWTs; changing one revokes the user's tokens
+TOKEN_FIELDS = ("is_active", "is_staff", "is_superuser", "password")
+
+
+def _token_state(user):
+    return tuple(user.__dict__.get(name) for name in TOKEN_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_token_state(sender, instance, **kwargs):
+    instance._loaded_token_state = _token_state(instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, created, raw=False, **kwargs):
+    state = _token_state(instance)
+    if not (created or raw) and state != instance._loaded_token_state:
+        revoke_user(instance.pk)
+    instance._loaded_token_state = state
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user(instance.pk)
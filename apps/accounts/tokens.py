@@ -0,0 +1,61 @@
+"""
+JWT claims and the cache-backed revocation list.
+
+Access tokens carry the few user attributes read on most requests (see
+CLAIM_FIELDS), so the stateless authentication path can skip the user query.
+Revoking stores the token's jti until it would expire anyway; revoking a user
+stores a cut-off time and rejects every token of theirs issued before it.
+`iat` only has whole seconds, so tokens issued in the second of the cut-off
+are kept: a re-login right after revoking (e.g. a password change) must
+work, and an older token can outlive the revocation by at most that second.
+The list has to be in a cache all workers share (CACHE_URL); with stateless
+JWT `check --deploy` fails otherwise (accounts/checks.py).
+"""
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+CLAIM_FIELDS = ("is_staff", "is_superuser")
+PROFILE_CLAIM_FIELDS = ("sms_opt_in",)
+
+
+def add_user_claims(token, user):
+    for name in CLAIM_FIELDS:
+        token[name] = getattr(user, name)
+    profile = getattr(user, "profile", None)
+    for name in PROFILE_CLAIM_FIELDS:
+        token[name] = bool(profile and getattr(profile, name))
+    return token
+
+
+def _jti_key(jti) -> str:
+    return f"jwt:revoked:{jti}"
+
+
+def _user_key(user_id) -> str:
+    return f"jwt:revoked-before:{user_id}"
+
+
+def revoke_token(token):
+    """Reject this token (access or refresh) until it expires."""
+    ttl = int(token["exp"] - time.time())
+    if ttl > 0:
+        cache.set(_jti_key(token[api_settings.JTI_CLAIM]), 1, ttl)
+
+
+def revoke_user(user_id):
+    """Reject every token of the user issued before the current second."""
+    cache.set(_user_key(user_id), int(time.time()),
+              int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()))
+
+
+def is_revoked(token) -> bool:
+    """One cache round trip for both the jti and the per-user cut-off."""
+    jti_key = _jti_key(token.get(api_settings.JTI_CLAIM))
+    user_key = _user_key(token.get(api_settings.USER_ID_CLAIM))
+    found = cache.get_many([jti_key, user_key])
+    if jti_key in found:
+        return True
+    cutoff = found.get(user_key)
+    return cutoff is not None and token.get("iat", 0) < cutoff
@@ -1,3 +1,27 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
 
-# Create your views here.
+from apps.accounts.serializers import LogoutSerializer
+from apps.accounts.tokens import revoke_token
+
+
+class LogoutView(APIView):
+    """Revokes the given refresh token and the access token of this request."""
+    permission_classes = [IsAuthenticated]
+    serializer_class = LogoutSerializer
+
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            refresh = RefreshToken(serializer.validated_data["refresh"])
+        except TokenError as exc:
+            raise InvalidToken(exc.args[0])
+        revoke_token(refresh)
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
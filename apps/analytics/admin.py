@@ -1,12 +1,20 @@
 from django.contrib import admin
-from .models import EventLog, DailyUserSnapshot, DailyInventorySnapshot
+from apps.common.admin import EstimatedCountAdminMixin
+from .models import (
+    EventLog, DailyUserSnapshot, DailyInventorySnapshot,
+    HourlySales, HourlyVariantSales, DailyCategorySales, ArticleAttributionDaily,
+)
 
 
 @admin.register(EventLog)
-class EventLogAdmin(admin.ModelAdmin):
+class EventLogAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("name", "timestamp", "user", "anonymous_id",
                     "sent_to_ga", "sent_to_mixpanel")
-    list_filter = ("name", "sent_to_ga", "sent_to_mixpanel")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    date_hierarchy = "timestamp"
+    # no "name" filter: its choices are a DISTINCT over the whole table (?name=... still works)
+    list_filter = ("sent_to_ga", "sent_to_mixpanel")
     search_fields = ("name", "user__phone_number")
 
 
@@ -14,7 +22,10 @@ class EventLogAdmin(admin.ModelAdmin):
 class DailyUserSnapshotAdmin(admin.ModelAdmin):
     list_display = ("snapshot_date", "user", "total_orders",
                     "total_spend_toman", "rfm_score", "churn_risk")
-    list_filter = ("snapshot_date", "churn_risk")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    date_hierarchy = "snapshot_date"
+    list_filter = ("churn_risk",)
     search_fields = ("user__phone_number",)
 
 
@@ -22,5 +33,42 @@ class DailyUserSnapshotAdmin(admin.ModelAdmin):
 class DailyInventorySnapshotAdmin(admin.ModelAdmin):
     list_display = ("snapshot_date", "variant", "units_on_hand",
                     "inventory_value_toman", "sell_through_rate")
-    list_filter = ("snapshot_date",)
+    list_select_related = ("variant__product",)
+    raw_id_fields = ("variant",)
+    date_hierarchy = "snapshot_date"
     search_fields = ("variant__sku", "variant__product__name_fa")
+
+
+@admin.register(HourlySales)
+class HourlySalesAdmin(admin.ModelAdmin):
+    list_display = ("hour", "orders", "units", "revenue_toman",
+                    "discounts_toman", "margin_toman")
+    date_hierarchy = "hour"
+
+
+@admin.register(HourlyVariantSales)
+class HourlyVariantSalesAdmin(admin.ModelAdmin):
+    list_display = ("hour", "variant", "orders", "units",
+                    "revenue_toman", "margin_toman")
+    list_select_related = ("variant__product",)
+    raw_id_fields = ("variant",)
+    date_hierarchy = "hour"
+    search_fields = ("variant__sku",)
+
+
+@admin.register(DailyCategorySales)
+class DailyCategorySalesAdmin(admin.ModelAdmin):
+    list_display = ("date", "category", "orders", "units",
+                    "revenue_toman", "margin_toman")
+    list_select_related = ("category",)
+    date_hierarchy = "date"
+    list_filter = ("category",)
+
+
+@admin.register(ArticleAttributionDaily)
+class ArticleAttributionDailyAdmin(admin.ModelAdmin):
+    list_display = ("date", "article", "orders", "revenue_toman", "linked_revenue_toman")
+    list_select_related = ("article",)
+    raw_id_fields = ("article",)
+    date_hierarchy = "date"
+    search_fields = ("article__title_fa",)
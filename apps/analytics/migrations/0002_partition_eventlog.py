@@ -0,0 +1,78 @@
+# Converts analytics_eventlog into a PostgreSQL table partitioned by month.
+
+from datetime import date, datetime, timezone
+
+from django.db import migrations
+
+TABLE = "analytics_eventlog"
+LEGACY = f"{TABLE}_legacy"
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, n):
+    idx = month.year * 12 + month.month - 1 + n
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def _utc(d):
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+def partition_eventlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return  # other backends keep a plain table (see services/partitions.py)
+
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = %s AND indexname <> %s", [TABLE, f"{TABLE}_pkey"])
+        indexes = cur.fetchall()
+        cur.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype = 'f'", [TABLE])
+        foreign_keys = cur.fetchall()
+
+        cur.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+        cur.execute(
+            f'ALTER TABLE "{LEGACY}" RENAME CONSTRAINT "{TABLE}_pkey" TO "{LEGACY}_pkey"')
+        for name, _ in indexes:
+            cur.execute(f'DROP INDEX "{name}"')
+
+        # the partition key has to be part of the primary key
+        cur.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE ("timestamp")')
+        cur.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, "timestamp")')
+        for _, indexdef in indexes:
+            cur.execute(indexdef)
+        for name, definition in foreign_keys:
+            cur.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}')
+
+        cur.execute(f'SELECT MIN("timestamp") FROM "{LEGACY}"')
+        oldest = cur.fetchone()[0]
+        today = datetime.now(timezone.utc).date()
+        month = date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            cur.execute(
+                f'CREATE TABLE "{TABLE}_p{month:%Y_%m}" PARTITION OF "{TABLE}" '
+                "FOR VALUES FROM (%s) TO (%s)",
+                [_utc(month), _utc(_add_months(month, 1))])
+            month = _add_months(month, 1)
+        cur.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+        cur.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY}"')
+        cur.execute(f'DROP TABLE "{LEGACY}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        # Irreversible in place: rolling back leaves a (working) partitioned table.
+        migrations.RunPython(partition_eventlog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_partition_eventlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(condition=models.Q(('sent_to_ga', False)), fields=['timestamp', 'id'], name='eventlog_unsent_ga_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(condition=models.Q(('sent_to_mixpanel', False)), fields=['timestamp', 'id'], name='eventlog_unsent_mixpanel_idx'),
+        ),
+    ]
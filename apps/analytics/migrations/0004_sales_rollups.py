@@ -0,0 +1,76 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_eventlog_unsent_indexes'),
+        ('catalog', '0002_globaldiscount_coupon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.IntegerField(default=0, verbose_name='تعداد سفارش')),
+                ('units', models.BigIntegerField(default=0, verbose_name='تعداد اقلام')),
+                ('gross_toman', models.BigIntegerField(default=0, verbose_name='فروش ناخالص (تومان)')),
+                ('discounts_toman', models.BigIntegerField(default=0, verbose_name='تخفیف\u200cها (تومان)')),
+                ('revenue_toman', models.BigIntegerField(default=0, verbose_name='فروش خالص (تومان)')),
+                ('cogs_toman', models.BigIntegerField(default=0, verbose_name='بهای تمام\u200cشده (تومان)')),
+                ('margin_toman', models.BigIntegerField(default=0, verbose_name='حاشیه سود (تومان)')),
+                ('hour', models.DateTimeField(unique=True, verbose_name='ساعت')),
+            ],
+            options={
+                'verbose_name': 'فروش ساعتی',
+                'verbose_name_plural': 'فروش ساعتی',
+                'ordering': ['-hour'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCategorySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.IntegerField(default=0, verbose_name='تعداد سفارش')),
+                ('units', models.BigIntegerField(default=0, verbose_name='تعداد اقلام')),
+                ('gross_toman', models.BigIntegerField(default=0, verbose_name='فروش ناخالص (تومان)')),
+                ('discounts_toman', models.BigIntegerField(default=0, verbose_name='تخفیف\u200cها (تومان)')),
+                ('revenue_toman', models.BigIntegerField(default=0, verbose_name='فروش خالص (تومان)')),
+                ('cogs_toman', models.BigIntegerField(default=0, verbose_name='بهای تمام\u200cشده (تومان)')),
+                ('margin_toman', models.BigIntegerField(default=0, verbose_name='حاشیه سود (تومان)')),
+                ('date', models.DateField(verbose_name='تاریخ')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='catalog.category')),
+            ],
+            options={
+                'verbose_name': 'فروش روزانه دسته',
+                'verbose_name_plural': 'فروش روزانه دسته\u200cها',
+                'indexes': [models.Index(fields=['category', 'date'], name='analytics_d_categor_1457a8_idx')],
+                'unique_together': {('date', 'category')},
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyVariantSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.IntegerField(default=0, verbose_name='تعداد سفارش')),
+                ('units', models.BigIntegerField(default=0, verbose_name='تعداد اقلام')),
+                ('gross_toman', models.BigIntegerField(default=0, verbose_name='فروش ناخالص (تومان)')),
+                ('discounts_toman', models.BigIntegerField(default=0, verbose_name='تخفیف\u200cها (تومان)')),
+                ('revenue_toman', models.BigIntegerField(default=0, verbose_name='فروش خالص (تومان)')),
+                ('cogs_toman', models.BigIntegerField(default=0, verbose_name='بهای تمام\u200cشده (تومان)')),
+                ('margin_toman', models.BigIntegerField(default=0, verbose_name='حاشیه سود (تومان)')),
+                ('hour', models.DateTimeField(verbose_name='ساعت')),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_sales', to='catalog.productvariant')),
+            ],
+            options={
+                'verbose_name': 'فروش ساعتی گونه',
+                'verbose_name_plural': 'فروش ساعتی گونه\u200cها',
+                'indexes': [models.Index(fields=['variant', 'hour'], name='analytics_h_variant_5b2e10_idx')],
+                'unique_together': {('hour', 'variant')},
+            },
+        ),
+    ]
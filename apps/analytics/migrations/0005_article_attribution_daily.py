@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_sales_rollups'),
+        ('cms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleAttributionDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='تاریخ')),
+                ('orders', models.IntegerField(default=0, verbose_name='تعداد سفارش')),
+                ('revenue_toman', models.BigIntegerField(default=0, verbose_name='فروش منتسب (تومان)')),
+                ('linked_revenue_toman', models.BigIntegerField(default=0, verbose_name='فروش محصولات مرتبط (تومان)')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_attribution', to='cms.article')),
+            ],
+            options={
+                'verbose_name': 'انتساب روزانه مقاله',
+                'verbose_name_plural': 'انتساب روزانه مقاله\u200cها',
+                'indexes': [models.Index(fields=['article', 'date'], name='analytics_a_article_ab866c_idx')],
+                'unique_together': {('date', 'article')},
+            },
+        ),
+    ]
@@ -1,9 +1,10 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.models import UUIDModel
-from apps.catalog.models import ProductVariant
+from apps.catalog.models import Category, ProductVariant
 
 # ---------- Event log ----------
 
@@ -39,6 +40,11 @@ class EventLog(UUIDModel):
             models.Index(fields=["name", "timestamp"]),
             models.Index(fields=["user", "timestamp"]),
             models.Index(fields=["anonymous_id", "timestamp"]),
+            # forwarder keyset scans over rows not yet sent to each vendor
+            models.Index(fields=["timestamp", "id"], condition=Q(sent_to_ga=False),
+                         name="eventlog_unsent_ga_idx"),
+            models.Index(fields=["timestamp", "id"], condition=Q(sent_to_mixpanel=False),
+                         name="eventlog_unsent_mixpanel_idx"),
         ]
         ordering = ["-timestamp"]
 
@@ -101,3 +107,88 @@ class DailyInventorySnapshot(models.Model):
 
     def __str__(self):
         return f"{self.variant_id} @ {self.snapshot_date}"
+
+
+# ---------- Sales rollups ----------
+# Maintained incrementally from order status changes (services/sales.py);
+# dashboards read these instead of OrderHeader/OrderLine.
+
+
+class SalesFacts(models.Model):
+    orders = models.IntegerField(_("تعداد سفارش"), default=0)
+    units = models.BigIntegerField(_("تعداد اقلام"), default=0)
+    gross_toman = models.BigIntegerField(_("فروش ناخالص (تومان)"), default=0)
+    discounts_toman = models.BigIntegerField(_("تخفیف‌ها (تومان)"), default=0)
+    revenue_toman = models.BigIntegerField(_("فروش خالص (تومان)"), default=0)
+    cogs_toman = models.BigIntegerField(_("بهای تمام‌شده (تومان)"), default=0)
+    margin_toman = models.BigIntegerField(_("حاشیه سود (تومان)"), default=0)
+
+    class Meta:
+        abstract = True
+
+
+class HourlySales(SalesFacts):
+    hour = models.DateTimeField(_("ساعت"), unique=True)
+
+    class Meta:
+        verbose_name = _("فروش ساعتی")
+        verbose_name_plural = _("فروش ساعتی")
+        ordering = ["-hour"]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00"
+
+
+class HourlyVariantSales(SalesFacts):
+    hour = models.DateTimeField(_("ساعت"))
+    variant = models.ForeignKey(
+        ProductVariant, on_delete=models.CASCADE, related_name="hourly_sales")
+
+    class Meta:
+        verbose_name = _("فروش ساعتی گونه")
+        verbose_name_plural = _("فروش ساعتی گونه‌ها")
+        unique_together = [("hour", "variant")]
+        indexes = [models.Index(fields=["variant", "hour"])]
+
+    def __str__(self):
+        return f"{self.variant_id} @ {self.hour:%Y-%m-%d %H}:00"
+
+
+class DailyCategorySales(SalesFacts):
+    date = models.DateField(_("تاریخ"))
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="daily_sales")
+
+    class Meta:
+        verbose_name = _("فروش روزانه دسته")
+        verbose_name_plural = _("فروش روزانه دسته‌ها")
+        unique_together = [("date", "category")]
+        indexes = [models.Index(fields=["category", "date"])]
+
+    def __str__(self):
+        return f"{self.category_id} @ {self.date}"
+
+
+# ---------- Content attribution ----------
+# Orders credited to the last article the buyer viewed within the lookback
+# window (services/attribution.py), by the local day the order was paid.
+
+
+class ArticleAttributionDaily(models.Model):
+    date = models.DateField(_("تاریخ"))
+    article = models.ForeignKey(
+        "cms.Article", on_delete=models.CASCADE, related_name="daily_attribution")
+    orders = models.IntegerField(_("تعداد سفارش"), default=0)
+    revenue_toman = models.BigIntegerField(_("فروش منتسب (تومان)"), default=0)
+    # part of revenue_toman from products linked to the article (ArticleProduct)
+    linked_revenue_toman = models.BigIntegerField(
+        _("فروش محصولات مرتبط (تومان)"), default=0)
+
+    class Meta:
+        verbose_name = _("انتساب روزانه مقاله")
+        verbose_name_plural = _("انتساب روزانه مقاله‌ها")
+        unique_together = [("date", "article")]
+        indexes = [models.Index(fields=["article", "date"])]
+
+    def __str__(self):
+        return f"{self.article_id} @ {self.date}"
@@ -0,0 +1,182 @@
+"""
+Content → commerce attribution: orders credited to articles.
+
+"Article Viewed" and "Order Paid" events are read as two time-ordered
+streams (`values_list().iterator()` on the (name, timestamp) index) and
+merged with heapq.merge, so the job is one pass over each stream instead of
+a "latest view before this order" query per order. While walking the merged
+stream, the last article seen per identity (user and anonymous_id, whichever
+the event has) is remembered; an order is credited to the most recent of its
+identities' views if it falls within the lookback window (last touch).
+"Order Paid" is tracked when an order becomes a purchase (see
+`on_status_changed`), stamped with its paid_at.
+
+Days are recomputed as a whole: rows for the requested local days are
+deleted and rewritten, so a run is idempotent and late events are picked up
+by re-running the day. An order is credited to the local day of its event,
+the same timestamp that selects it for a run.
+"""
+import heapq
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from apps.analytics.models import ArticleAttributionDaily, EventLog
+from apps.cms.models import Article, ArticleProduct
+from apps.analytics.services.tracking import track
+from apps.orders.models import OrderHeader, OrderLine, PURCHASED_STATUSES
+
+VIEW_EVENT = "Article Viewed"
+ORDER_EVENT = "Order Paid"
+FETCH_CHUNK = 10_000
+ORDER_BATCH = 1_000
+
+# stream kinds; views sort before orders at the same timestamp
+VIEW, ORDER = 0, 1
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _stream(name: str, kind: int, start: datetime, end: datetime, key: str):
+    rows = (EventLog.objects
+            .filter(name=name, timestamp__gte=start, timestamp__lt=end)
+            .order_by("timestamp", "id")
+            .values_list("timestamp", "user_id", "anonymous_id", f"properties__{key}")
+            .iterator(chunk_size=FETCH_CHUNK))
+    for timestamp, user_id, anonymous_id, value in rows:
+        if value:
+            yield timestamp, kind, user_id, anonymous_id, value
+
+
+def _identities(user_id, anonymous_id):
+    if user_id is not None:
+        yield "u", user_id
+    if anonymous_id is not None:
+        yield "a", anonymous_id
+
+
+def last_touches(start: datetime, end: datetime, lookback: timedelta):
+    """Yield (order_id, article_id, paid_at) for orders paid in [start, end) with an article touch."""
+    views = _stream(VIEW_EVENT, VIEW, start - lookback, end, "article_id")
+    orders = _stream(ORDER_EVENT, ORDER, start, end, "order_id")
+    last_view = {}  # identity -> (timestamp, article_id)
+    seen = set()
+    for timestamp, kind, user_id, anonymous_id, value in heapq.merge(
+            views, orders, key=lambda row: (row[0], row[1])):
+        if kind == VIEW:
+            for identity in _identities(user_id, anonymous_id):
+                last_view[identity] = (timestamp, value)
+            continue
+        if value in seen:  # duplicate "Order Paid" event
+            continue
+        seen.add(value)
+        touches = [last_view[i] for i in _identities(user_id, anonymous_id) if i in last_view]
+        if touches:
+            viewed_at, article_id = max(touches)
+            if timestamp - viewed_at <= lookback:
+                yield value, article_id, timestamp
+
+
+def _credit(batch: list, totals: dict, linked: dict):
+    """
+    Add one batch of (order_id, article_id, paid_at) to `totals`
+    {(day, article_id): [orders, revenue, linked]}.
+    """
+    credited = {order_id: (article_id, paid_at) for order_id, article_id, paid_at in batch}
+    orders = (OrderHeader.objects
+              .filter(pk__in=credited, status__in=PURCHASED_STATUSES)
+              .values_list("pk", "total_payable_toman"))
+    days, payable, linked_lines = {}, {}, defaultdict(int)
+    for pk, total in orders:
+        article_id, paid_at = credited[str(pk)]
+        days[pk] = key = (timezone.localdate(paid_at), article_id)
+        payable[pk] = total
+        totals[key][0] += 1
+        totals[key][1] += total
+    lines = (OrderLine.objects
+             .filter(order_id__in=days)
+             .values_list("order_id", "variant__product_id", "qty", "unit_price_toman",
+                          "line_discount_toman"))
+    for order_id, product_id, qty, unit_price, line_discount in lines:
+        if product_id in linked.get(days[order_id][1], ()):
+            linked_lines[order_id] += qty * unit_price - line_discount
+    for order_id, amount in linked_lines.items():
+        # order-level discounts aren't spread over lines here; never exceed what was paid
+        totals[days[order_id]][2] += min(amount, payable[order_id])
+
+
+@transaction.atomic
+def rebuild(since: date, until: date | None = None) -> int:
+    """
+    Recompute ArticleAttributionDaily for local days since..until (inclusive,
+    default today). Returns the number of attributed orders.
+    """
+    until = until or timezone.localdate()
+    start, end = _day_start(since), _day_start(until + timedelta(days=1))
+    lookback = timedelta(days=settings.ATTRIBUTION_LOOKBACK_DAYS)
+
+    linked = defaultdict(set)
+    for article_id, product_id in ArticleProduct.objects.values_list("article_id", "product_id"):
+        linked[str(article_id)].add(product_id)
+    known = {str(pk) for pk in Article.objects.values_list("pk", flat=True)}
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    batch = []
+    for order_id, article_id, paid_at in last_touches(start, end, lookback):
+        if article_id not in known:  # article deleted since
+            continue
+        batch.append((order_id, article_id, paid_at))
+        if len(batch) == ORDER_BATCH:
+            _credit(batch, totals, linked)
+            batch = []
+    if batch:
+        _credit(batch, totals, linked)
+
+    ArticleAttributionDaily.objects.filter(date__gte=since, date__lte=until).delete()
+    ArticleAttributionDaily.objects.bulk_create(
+        [ArticleAttributionDaily(date=day, article_id=article_id, orders=orders,
+                                 revenue_toman=revenue, linked_revenue_toman=linked_revenue)
+         for (day, article_id), (orders, revenue, linked_revenue) in totals.items()],
+        batch_size=2000)
+    return sum(orders for orders, _, _ in totals.values())
+
+
+def resume_date() -> date:
+    """Incremental runs restart at the last rolled-up day (it may have been partial)."""
+    last = ArticleAttributionDaily.objects.aggregate(day=Max("date"))["day"]
+    today = timezone.localdate()
+    return min(last, today) if last else today - timedelta(days=settings.ATTRIBUTION_LOOKBACK_DAYS)
+
+
+def on_status_changed(order, old_status, new_status):
+    """Track "Order Paid" once, when the order becomes a purchase."""
+    if old_status in PURCHASED_STATUSES or new_status not in PURCHASED_STATUSES:
+        return
+    # the visitor id of the cart checked out, so anonymous article views count too
+    anonymous_id = (OrderHeader.objects.filter(pk=order.pk)
+                    .values_list("checkout__cart__anonymous_id", flat=True).first())
+    track(ORDER_EVENT, user=order.user, anonymous_id=anonymous_id,
+          timestamp=order.paid_at or order.placed_at,
+          properties={
+              "order_id": str(order.pk),
+              "total_value_toman": order.total_payable_toman,
+              "gateway_fee_toman": order.gateway_fee_toman,
+          })
+
+
+# ---------- Read API ----------
+
+
+def top_articles(start: date, end: date, limit: int = 20) -> list[dict]:
+    return list(ArticleAttributionDaily.objects
+                .filter(date__gte=start, date__lt=end)
+                .values("article_id", title=F("article__title_fa"))
+                .annotate(orders=Sum("orders"), revenue_toman=Sum("revenue_toman"),
+                          linked_revenue_toman=Sum("linked_revenue_toman"))
+                .order_by("-revenue_toman")[:limit])
@@ -0,0 +1,65 @@
+"""
+Local stand-in for the GA4 / Mixpanel collection endpoints.
+
+Used by `forward_events --fake` and in tests: it accepts any POST, records
+the decoded JSON body and can answer the first N requests with 503 to
+exercise the retry path.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeVendorServer:
+    def __init__(self, fail_first: int = 0, status: int = 204):
+        self.fail_first = fail_first
+        self.status = status
+        self.received = []  # (path, body)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def endpoints(self) -> dict:
+        return {"ga4": f"{self.url}/mp/collect", "mixpanel": f"{self.url}/import"}
+
+    def events_received(self, path_prefix: str) -> int:
+        total = 0
+        for path, body in self.received:
+            if path.startswith(path_prefix):
+                total += len(body["events"]) if isinstance(body, dict) else len(body)
+        return total
+
+    def __enter__(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null")
+                with fake._lock:
+                    if fake.fail_first > 0:
+                        fake.fail_first -= 1
+                        status = 503
+                    else:
+                        fake.received.append((self.path, body))
+                        status = fake.status
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
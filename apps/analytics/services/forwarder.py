@@ -0,0 +1,275 @@
+"""
+Server-side forwarding of EventLog rows to GA4 and Mixpanel.
+
+Unsent rows are read in keyset order on (timestamp, id) using the partial
+"unsent" indexes, converted to each vendor's batch format and posted
+concurrently. Every successfully delivered batch flips its sent flag with a
+single `UPDATE ... WHERE id IN (...)`. Runs against another endpoint (the
+fake vendors, a staging collector) deliver nothing real and leave the flags
+alone.
+"""
+import base64
+import http.client
+import json
+import logging
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from apps.analytics.models import EventLog
+
+logger = logging.getLogger(__name__)
+
+EVENT_FIELDS = ("id", "name", "timestamp", "user_id", "anonymous_id",
+                "session_id", "properties", "utm_json")
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+REQUEST_TIMEOUT = 10
+
+
+class DeliveryError(Exception):
+    """A vendor rejected a request or could not be reached after retries."""
+
+
+@dataclass
+class ForwardStats:
+    vendor: str
+    events: int = 0
+    batches: int = 0
+    requests: int = 0
+    retries: int = 0
+    failed_events: int = 0
+    seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __str__(self):
+        return (f"{self.vendor}: {self.events} sent in {self.batches} batches / "
+                f"{self.requests} requests ({self.retries} retries, "
+                f"{self.failed_events} failed) — {self.events_per_second:,.0f} ev/s")
+
+
+def _distinct_id(event) -> str:
+    return str(event["user_id"] or event["anonymous_id"] or event["id"])
+
+
+class Vendor:
+    name = ""
+    flag_field = ""
+    max_events_per_request = 1
+
+    def __init__(self, endpoint=None):
+        self.endpoint = endpoint or self.default_endpoint()
+
+    def default_endpoint(self) -> str:
+        raise NotImplementedError
+
+    def is_configured(self) -> bool:
+        raise NotImplementedError
+
+    def build_requests(self, events) -> list[tuple[list, str, bytes, dict]]:
+        """Split events into (event_ids, url, body, headers) requests."""
+        raise NotImplementedError
+
+
+class GA4(Vendor):
+    """GA4 Measurement Protocol: one client per request, up to 25 events."""
+    name = "ga4"
+    flag_field = "sent_to_ga"
+    max_events_per_request = 25
+
+    def default_endpoint(self):
+        return settings.ANALYTICS_GA4_ENDPOINT
+
+    def is_configured(self):
+        return bool(settings.ANALYTICS_GA4_MEASUREMENT_ID and settings.ANALYTICS_GA4_API_SECRET)
+
+    @staticmethod
+    def event_name(name: str) -> str:
+        # GA4 names: letters, digits and underscores, max 40 chars
+        return re.sub(r"[^0-9a-zA-Z_]+", "_", name.strip()).lower()[:40]
+
+    @staticmethod
+    def params(event) -> dict:
+        params = {}
+        for source in (event["utm_json"] or {}, event["properties"] or {}):
+            for key, value in source.items():
+                if key == "items" and isinstance(value, list):
+                    params[key] = value
+                elif isinstance(value, (str, int, float, bool)):
+                    params[key] = value
+        if event["session_id"]:
+            params["session_id"] = str(event["session_id"])
+        return dict(list(params.items())[:25])
+
+    def build_requests(self, events):
+        url = f"{self.endpoint}?" + urlencode({
+            "measurement_id": settings.ANALYTICS_GA4_MEASUREMENT_ID,
+            "api_secret": settings.ANALYTICS_GA4_API_SECRET,
+        })
+        by_client = {}
+        for event in events:
+            by_client.setdefault(_distinct_id(event), []).append(event)
+
+        requests = []
+        for client_id, client_events in by_client.items():
+            for i in range(0, len(client_events), self.max_events_per_request):
+                chunk = client_events[i:i + self.max_events_per_request]
+                body = {
+                    "client_id": client_id,
+                    "events": [{
+                        "name": self.event_name(e["name"]),
+                        "timestamp_micros": int(e["timestamp"].timestamp() * 1_000_000),
+                        "params": self.params(e),
+                    } for e in chunk],
+                }
+                if chunk[0]["user_id"]:
+                    body["user_id"] = str(chunk[0]["user_id"])
+                requests.append((
+                    [e["id"] for e in chunk], url,
+                    json.dumps(body, ensure_ascii=False).encode(),
+                    {"Content-Type": "application/json"},
+                ))
+        return requests
+
+
+class Mixpanel(Vendor):
+    """Mixpanel /import: up to 2000 events per request, deduped by $insert_id."""
+    name = "mixpanel"
+    flag_field = "sent_to_mixpanel"
+    max_events_per_request = 2000
+
+    def default_endpoint(self):
+        return settings.ANALYTICS_MIXPANEL_ENDPOINT
+
+    def is_configured(self):
+        return bool(settings.ANALYTICS_MIXPANEL_API_SECRET)
+
+    def build_requests(self, events):
+        token = base64.b64encode(
+            f"{settings.ANALYTICS_MIXPANEL_API_SECRET}:".encode()).decode()
+        headers = {"Content-Type": "application/json",
+                   "Authorization": f"Basic {token}"}
+        url = f"{self.endpoint}?strict=1"
+
+        requests = []
+        for i in range(0, len(events), self.max_events_per_request):
+            chunk = events[i:i + self.max_events_per_request]
+            body = [{
+                "event": e["name"],
+                "properties": {
+                    **(e["utm_json"] or {}),
+                    **(e["properties"] or {}),
+                    "time": int(e["timestamp"].timestamp() * 1000),
+                    "distinct_id": _distinct_id(e),
+                    "$insert_id": e["id"].hex,
+                },
+            } for e in chunk]
+            requests.append(([e["id"] for e in chunk], url,
+                             json.dumps(body, ensure_ascii=False).encode(), headers))
+        return requests
+
+
+VENDORS = {GA4.name: GA4, Mixpanel.name: Mixpanel}
+
+
+def post_with_retry(url, body, headers, stats: ForwardStats, max_retries=None, backoff=0.5):
+    """POST once, retrying transient failures with exponential backoff and jitter."""
+    max_retries = settings.ANALYTICS_FORWARD_MAX_RETRIES if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        stats.add(requests=1)
+        try:
+            req = urllib.request.Request(url, data=body, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
+                return resp.status
+        except urllib.error.HTTPError as exc:
+            if exc.code not in RETRY_STATUSES or attempt >= max_retries:
+                raise DeliveryError(f"HTTP {exc.code} from {url}") from exc
+        except (OSError, http.client.HTTPException) as exc:
+            # URLError, timeouts, resets and dropped connections alike
+            if attempt >= max_retries:
+                raise DeliveryError(f"{url} unreachable: {exc}") from exc
+        attempt += 1
+        stats.add(retries=1)
+        time.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random()))
+
+
+def forward(vendor_name: str, batch_size=None, max_batches=None, concurrency=None,
+            endpoint=None) -> ForwardStats:
+    """
+    Send every unsent event to one vendor. Failed requests stay unsent for the
+    next run; with `endpoint` nothing is marked as sent.
+    """
+    vendor = VENDORS[vendor_name](endpoint=endpoint)
+    mark_sent = endpoint is None
+    batch_size = batch_size or settings.ANALYTICS_FORWARD_BATCH_SIZE
+    concurrency = concurrency or settings.ANALYTICS_FORWARD_CONCURRENCY
+    stats = ForwardStats(vendor=vendor.name)
+
+    unsent = (EventLog.objects.filter(**{vendor.flag_field: False})
+              .order_by("timestamp", "id").values(*EVENT_FIELDS))
+
+    def send(request):
+        ids, url, body, headers = request
+        try:
+            post_with_retry(url, body, headers, stats)
+        except DeliveryError as exc:
+            logger.warning("%s: %d events not delivered: %s", vendor.name, len(ids), exc)
+            stats.add(failed_events=len(ids))
+            return []
+        return ids
+
+    started = time.monotonic()
+    last = None
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while max_batches is None or stats.batches < max_batches:
+            page = unsent
+            if last is not None:
+                page = page.filter(Q(timestamp__gt=last[0]) |
+                                   Q(timestamp=last[0], id__gt=last[1]))
+            events = list(page[:batch_size])
+            if not events:
+                break
+            last = (events[-1]["timestamp"], events[-1]["id"])
+
+            delivered = [pk for ids in pool.map(send, vendor.build_requests(events))
+                         for pk in ids]
+            if delivered and mark_sent:
+                EventLog.objects.filter(id__in=delivered).update(**{vendor.flag_field: True})
+            stats.add(events=len(delivered), batches=1)
+
+    stats.seconds = time.monotonic() - started
+    return stats
+
+
+def forward_all(vendor_names=None, **kwargs) -> list[ForwardStats]:
+    """Run each configured vendor in its own thread (and DB connection)."""
+    names = vendor_names or [name for name, cls in VENDORS.items() if cls().is_configured()]
+    endpoints = kwargs.pop("endpoints", {})
+
+    def run(name):
+        try:
+            return forward(name, endpoint=endpoints.get(name), **kwargs)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=max(len(names), 1)) as pool:
+        return list(pool.map(run, names))
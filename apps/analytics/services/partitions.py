@@ -0,0 +1,257 @@
+"""
+Monthly range partitions for EventLog and partition-based retention.
+
+On PostgreSQL `analytics_eventlog` is a native table partitioned by
+RANGE("timestamp") (see migration 0002) with one child table per UTC month
+plus a DEFAULT partition that catches rows no month covers yet. Retention
+archives whole months to gzipped CSV and drops the child tables; expired
+months that ended up in the DEFAULT partition are archived and deleted from
+it. Other backends have no native partitioning, so the same monthly windows
+are archived and then removed with batched deletes.
+"""
+import csv
+import gzip
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.analytics.models import EventLog
+
+TABLE = EventLog._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+DELETE_BATCH_SIZE = 5_000
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: date  # inclusive
+    end: date    # exclusive
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    idx = month.year * 12 + month.month - 1 + n
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def _utc(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=dt_timezone.utc)
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [TABLE])
+        return cur.fetchone() is not None
+
+
+def list_partitions() -> list[Partition]:
+    """Monthly child partitions, oldest first (the DEFAULT partition is excluded)."""
+    if not is_partitioned():
+        return []
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)", [TABLE])
+        names = [row[0] for row in cur.fetchall()]
+    parts = []
+    for name in names:
+        m = _PARTITION_RE.match(name)
+        if m:
+            start = date(int(m.group(1)), int(m.group(2)), 1)
+            parts.append(Partition(name, start, add_months(start, 1)))
+    return sorted(parts, key=lambda p: p.start)
+
+
+def _has_default_partition(cur) -> bool:
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", [DEFAULT_PARTITION])
+    return cur.fetchone()[0]
+
+
+def ensure_partitions(months_ahead: int = 3, since: date | None = None) -> list[str]:
+    """
+    Create missing monthly partitions from `since` (default: this month) up to
+    `months_ahead` months in the future. Returns the names that were created.
+
+    PostgreSQL refuses a new partition while the DEFAULT partition holds rows
+    in its range, so DEFAULT is detached for the duration, the matching rows
+    are moved into their new month and DEFAULT is attached again.
+    """
+    if not is_partitioned():
+        return []
+    existing = {p.name for p in list_partitions()}
+    month = month_start(since or timezone.now())
+    last = add_months(month_start(timezone.now()), months_ahead)
+    missing = []
+    while month <= last:
+        if partition_name(month) not in existing:
+            missing.append(month)
+        month = add_months(month, 1)
+    if not missing:
+        return []
+
+    with transaction.atomic(), connection.cursor() as cur:
+        has_default = _has_default_partition(cur)
+        if has_default:
+            cur.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+        for month in missing:
+            window = [_utc(month), _utc(add_months(month, 1))]
+            cur.execute(
+                f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{TABLE}" '
+                "FOR VALUES FROM (%s) TO (%s)", window)
+            if has_default:
+                cur.execute(
+                    f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                    '  WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+                    f'INSERT INTO "{TABLE}" SELECT * FROM moved', window)
+        if has_default:
+            cur.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+    return [partition_name(month) for month in missing]
+
+
+def retention_cutoff(keep_months: int) -> date:
+    """First month that is kept; everything strictly before it expires."""
+    return add_months(month_start(timezone.now()), -keep_months)
+
+
+def _archive_path(archive_dir, month: date) -> Path:
+    path = Path(archive_dir) / f"{TABLE}_{month:%Y_%m}.csv.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # late rows for an already archived month get a file of their own
+    n = 1
+    while path.exists():
+        path = path.with_name(f"{TABLE}_{month:%Y_%m}.{n}.csv.gz")
+        n += 1
+    return path
+
+
+def _copy_out(select_sql: str, path: Path) -> Path:
+    with gzip.open(path, "wb") as fh, connection.cursor() as cur:
+        cur.copy_expert(f"COPY ({select_sql}) TO STDOUT WITH CSV HEADER", fh)
+    return path
+
+
+def _archive_partition(partition: Partition, archive_dir) -> Path:
+    return _copy_out(f'SELECT * FROM "{partition.name}"',
+                     _archive_path(archive_dir, partition.start))
+
+
+def _default_window(month: date) -> str:
+    # COPY takes no parameters; the bounds are generated dates, not input
+    return (f'"timestamp" >= \'{_utc(month).isoformat()}\' '
+            f'AND "timestamp" < \'{_utc(add_months(month, 1)).isoformat()}\'')
+
+
+def _expired_default_months(cutoff: date) -> list[date]:
+    """Months before `cutoff` that still have rows in the DEFAULT partition."""
+    with connection.cursor() as cur:
+        if not _has_default_partition(cur):
+            return []
+        cur.execute(
+            "SELECT DISTINCT date_trunc('month', \"timestamp\" AT TIME ZONE 'UTC') "
+            f'FROM "{DEFAULT_PARTITION}" WHERE "timestamp" < %s ORDER BY 1', [_utc(cutoff)])
+        return [row[0].date() for row in cur.fetchall()]
+
+
+def _archive_month(month: date, archive_dir) -> Path:
+    path = _archive_path(archive_dir, month)
+    fields = [f.attname for f in EventLog._meta.concrete_fields]
+    rows = (EventLog.objects
+            .filter(timestamp__gte=_utc(month), timestamp__lt=_utc(add_months(month, 1)))
+            .order_by()
+            .values_list(*fields)
+            .iterator(chunk_size=DELETE_BATCH_SIZE))
+    with gzip.open(path, "wt", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+                             for v in row])
+    return path
+
+
+def _delete_month(month: date) -> int:
+    qs = (EventLog.objects
+          .filter(timestamp__gte=_utc(month), timestamp__lt=_utc(add_months(month, 1)))
+          .order_by())
+    deleted = 0
+    while True:
+        ids = list(qs.values_list("id", flat=True)[:DELETE_BATCH_SIZE])
+        if not ids:
+            return deleted
+        deleted += EventLog.objects.filter(id__in=ids).delete()[0]
+
+
+def apply_retention(keep_months: int, archive_dir=None, dry_run: bool = False) -> list[dict]:
+    """
+    Expire EventLog months older than `keep_months`. When `archive_dir` is
+    given each month is written to `<archive_dir>/<table>_YYYY_MM.csv.gz`
+    before it is removed. Returns one report dict per expired month.
+    """
+    cutoff = retention_cutoff(keep_months)
+    report = []
+
+    if is_partitioned():
+        for part in list_partitions():
+            if part.end > cutoff:
+                continue
+            entry = {"month": part.start, "partition": part.name, "archive": None}
+            if not dry_run:
+                with transaction.atomic():
+                    if archive_dir:
+                        entry["archive"] = str(_archive_partition(part, archive_dir))
+                    with connection.cursor() as cur:
+                        cur.execute(f'DROP TABLE "{part.name}"')
+            report.append(entry)
+
+        for month in _expired_default_months(cutoff):
+            entry = {"month": month, "partition": DEFAULT_PARTITION, "archive": None}
+            if not dry_run:
+                window = _default_window(month)
+                with transaction.atomic():
+                    if archive_dir:
+                        entry["archive"] = str(_copy_out(
+                            f'SELECT * FROM "{DEFAULT_PARTITION}" WHERE {window}',
+                            _archive_path(archive_dir, month)))
+                    with connection.cursor() as cur:
+                        cur.execute(f'DELETE FROM "{DEFAULT_PARTITION}" WHERE {window}')
+                        entry["deleted"] = cur.rowcount
+            report.append(entry)
+        return report
+
+    oldest = (EventLog.objects.filter(timestamp__lt=_utc(cutoff))
+              .order_by("timestamp").values_list("timestamp", flat=True).first())
+    if oldest is None:
+        return report
+    month = month_start(oldest.astimezone(dt_timezone.utc))
+    while month < cutoff:
+        window = EventLog.objects.filter(
+            timestamp__gte=_utc(month), timestamp__lt=_utc(add_months(month, 1)))
+        if not window.exists():
+            month = add_months(month, 1)
+            continue
+        entry = {"month": month, "partition": None, "archive": None}
+        if not dry_run:
+            if archive_dir:
+                entry["archive"] = str(_archive_month(month, archive_dir))
+            entry["deleted"] = _delete_month(month)
+        report.append(entry)
+        month = add_months(month, 1)
+    return report
@@ -0,0 +1,211 @@
+"""
+Sales fact rollups: hour totals, hour x variant and day x category.
+
+An order adds its facts once when it becomes a purchase (PURCHASED_STATUSES)
+and subtracts them again when it is cancelled or refunded, always in the
+local hour/day it was paid. Order-level discounts (coupon + global) are
+spread over the lines in proportion to their gross so every level adds up.
+The read helpers at the bottom only touch the rollup and catalog tables.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.analytics.models import DailyCategorySales, HourlySales, HourlyVariantSales
+from apps.orders.models import OrderHeader, OrderLine, PURCHASED_STATUSES
+
+FACT_FIELDS = ("orders", "units", "gross_toman", "discounts_toman",
+               "revenue_toman", "cogs_toman", "margin_toman")
+LINE_FIELDS = ("order_id", "variant_id", "variant__product__category_id", "qty",
+               "unit_price_toman", "line_discount_toman", "unit_cogs_toman")
+
+
+def local_hour(ts: datetime) -> datetime:
+    return timezone.localtime(ts).replace(minute=0, second=0, microsecond=0)
+
+
+def order_facts(order: dict, lines: list[dict]) -> dict:
+    """
+    Facts contributed by one order (values dicts), keyed by rollup model:
+    {HourlySales: {(hour,): facts}, HourlyVariantSales: {(hour, variant_id): facts}, ...}
+    """
+    paid = order["paid_at"] or order["placed_at"]
+    hour, day = local_hour(paid), timezone.localdate(paid)
+    order_discount = order["discounts_toman"] + order["global_discount_toman"]
+    gross_total = sum(line["qty"] * line["unit_price_toman"] for line in lines)
+
+    result = {HourlySales: {}, HourlyVariantSales: {}, DailyCategorySales: {}}
+    allocated = 0
+    for i, line in enumerate(lines):
+        gross = line["qty"] * line["unit_price_toman"]
+        if i == len(lines) - 1:
+            share = order_discount - allocated  # rounding remainder on the last line
+        else:
+            share = order_discount * gross // gross_total if gross_total else 0
+        allocated += share
+        discounts = line["line_discount_toman"] + share
+        cogs = line["qty"] * line["unit_cogs_toman"]
+        facts = {
+            "units": line["qty"],
+            "gross_toman": gross,
+            "discounts_toman": discounts,
+            "revenue_toman": gross - discounts,
+            "cogs_toman": cogs,
+            "margin_toman": gross - discounts - cogs,
+        }
+        keys = {
+            HourlySales: (hour,),
+            HourlyVariantSales: (hour, line["variant_id"]),
+            DailyCategorySales: (day, line["variant__product__category_id"]),
+        }
+        for model, key in keys.items():
+            bucket = result[model].setdefault(key, dict.fromkeys(FACT_FIELDS, 0))
+            for name, value in facts.items():
+                bucket[name] += value
+
+    # an order counts once per bucket it touches
+    for buckets in result.values():
+        for bucket in buckets.values():
+            bucket["orders"] = 1
+    return result
+
+
+KEY_FIELDS = {
+    HourlySales: ("hour",),
+    HourlyVariantSales: ("hour", "variant_id"),
+    DailyCategorySales: ("date", "category_id"),
+}
+ORDER_FIELDS = ("id", "paid_at", "placed_at", "discounts_toman", "global_discount_toman")
+
+
+def _increment(model, lookup: dict, deltas: dict):
+    changes = {name: F(name) + value for name, value in deltas.items()}
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:  # created concurrently
+        model.objects.filter(**lookup).update(**changes)
+
+
+@transaction.atomic
+def apply_order(order: OrderHeader, sign: int):
+    """Add (sign=1) or remove (sign=-1) one order's facts from every rollup."""
+    values = {name: getattr(order, name) for name in ORDER_FIELDS}
+    lines = list(OrderLine.objects.filter(order_id=order.pk).values(*LINE_FIELDS))
+    if not lines:
+        return
+    for model, buckets in order_facts(values, lines).items():
+        for key, facts in buckets.items():
+            lookup = dict(zip(KEY_FIELDS[model], key))
+            _increment(model, lookup, {k: v * sign for k, v in facts.items()})
+
+
+def on_status_changed(order: OrderHeader, old_status, new_status):
+    was_purchase = old_status in PURCHASED_STATUSES
+    is_purchase = new_status in PURCHASED_STATUSES
+    if was_purchase != is_purchase:
+        apply_order(order, 1 if is_purchase else -1)
+
+
+@transaction.atomic
+def rebuild(since: date) -> int:
+    """Recompute every rollup from `since` (local date) onwards from the order tables."""
+    start = timezone.make_aware(datetime.combine(since, datetime.min.time()))
+    HourlySales.objects.filter(hour__gte=start).delete()
+    HourlyVariantSales.objects.filter(hour__gte=start).delete()
+    DailyCategorySales.objects.filter(date__gte=since).delete()
+
+    # bucketed like order_facts(): by paid_at, placed_at for orders without one
+    orders = (OrderHeader.objects
+              .annotate(bucketed_at=Coalesce("paid_at", "placed_at"))
+              .filter(status__in=PURCHASED_STATUSES, bucketed_at__gte=start)
+              .values(*ORDER_FIELDS))
+    totals = {model: defaultdict(lambda: dict.fromkeys(FACT_FIELDS, 0)) for model in KEY_FIELDS}
+    count = 0
+    for chunk in _chunks(orders.iterator(chunk_size=1000), 1000):
+        lines = defaultdict(list)
+        for line in OrderLine.objects.filter(order_id__in=[o["id"] for o in chunk]).values(*LINE_FIELDS):
+            lines[line["order_id"]].append(line)
+        for order in chunk:
+            if not lines[order["id"]]:
+                continue
+            count += 1
+            for model, buckets in order_facts(order, lines[order["id"]]).items():
+                for key, facts in buckets.items():
+                    target = totals[model][key]
+                    for name, value in facts.items():
+                        target[name] += value
+
+    for model, buckets in totals.items():
+        model.objects.bulk_create(
+            [model(**dict(zip(KEY_FIELDS[model], key)), **facts) for key, facts in buckets.items()],
+            batch_size=2000)
+    return count
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------- Read API (dashboards) ----------
+
+
+def revenue_by_hour(start: datetime, end: datetime, category_id=None) -> list[dict]:
+    """Net revenue / units / margin per local hour; optionally for one category."""
+    if category_id is None:
+        qs = HourlySales.objects.filter(hour__gte=start, hour__lt=end)
+    else:
+        qs = HourlyVariantSales.objects.filter(
+            hour__gte=start, hour__lt=end, variant__product__category_id=category_id)
+    return list(qs.values("hour").annotate(
+        revenue_toman=Sum("revenue_toman"), units=Sum("units"),
+        discounts_toman=Sum("discounts_toman"), margin_toman=Sum("margin_toman"),
+    ).order_by("hour"))
+
+
+def revenue_by_hour_and_category(start: datetime, end: datetime) -> list[dict]:
+    return list(HourlyVariantSales.objects
+                .filter(hour__gte=start, hour__lt=end)
+                .values("hour", "variant__product__category_id",
+                        "variant__product__category__name_fa")
+                .annotate(revenue_toman=Sum("revenue_toman"), units=Sum("units"))
+                .order_by("hour", "-revenue_toman"))
+
+
+def average_order_value(start: datetime, end: datetime) -> int | None:
+    agg = HourlySales.objects.filter(hour__gte=start, hour__lt=end).aggregate(
+        revenue=Sum("revenue_toman"), orders=Sum("orders"))
+    if not agg["orders"]:
+        return None
+    return agg["revenue"] // agg["orders"]
+
+
+def units_per_sku(start: datetime, end: datetime, limit: int = 50) -> list[dict]:
+    return list(HourlyVariantSales.objects
+                .filter(hour__gte=start, hour__lt=end)
+                .values("variant_id", "variant__sku")
+                .annotate(units=Sum("units"), revenue_toman=Sum("revenue_toman"),
+                          margin_toman=Sum("margin_toman"))
+                .order_by("-units")[:limit])
+
+
+def category_sales(first: date, last: date) -> list[dict]:
+    return list(DailyCategorySales.objects
+                .filter(date__gte=first, date__lte=last)
+                .values("category_id", "category__name_fa")
+                .annotate(orders=Sum("orders"), units=Sum("units"),
+                          revenue_toman=Sum("revenue_toman"), margin_toman=Sum("margin_toman"))
+                .order_by("-revenue_toman"))
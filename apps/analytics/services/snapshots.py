@@ -0,0 +1,265 @@
+"""
+Nightly builders for the Daily*Snapshot tables.
+
+User snapshots are incremental: day D = snapshot of D-1 + the orders paid on
+D. Users with an earlier order that changed on D (refunded, cancelled) are
+recomputed from their full history instead, so totals don't keep counting
+orders that stopped being purchases. Only when the previous day is missing
+(first run, gap, --rebuild) the builder aggregates the full history for all.
+
+Inventory snapshots value every StockItem and derive sell-through from the
+day's OrderLine quantities; past days can be backfilled in parallel chunks.
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from apps.analytics.models import DailyInventorySnapshot, DailyUserSnapshot
+from apps.catalog.services.pricing import effective_price_subquery
+from apps.inventory.models import StockItem
+from apps.orders.models import OrderHeader, OrderLine, PURCHASED_STATUSES
+
+WRITE_BATCH_SIZE = 2_000
+PREFERRED_CATEGORIES_LIMIT = 5
+
+# churn bucket by days since last purchase (upper bounds, inclusive)
+CHURN_LOW_DAYS = 60
+CHURN_MEDIUM_DAYS = 180
+
+USER_SNAPSHOT_FIELDS = [
+    "total_orders", "total_spend_toman", "first_purchase_at", "last_purchase_at",
+    "churn_risk", "lifetime_cogs_toman", "preferred_categories",
+]
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """[start, end) of a calendar day in the site timezone."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def churn_risk(last_purchase_at, as_of: datetime) -> str | None:
+    if last_purchase_at is None:
+        return None
+    days = (as_of - last_purchase_at).days
+    if days <= CHURN_LOW_DAYS:
+        return "Low"
+    if days <= CHURN_MEDIUM_DAYS:
+        return "Medium"
+    return "High"
+
+
+def _purchases(start: datetime | None, end: datetime, user_ids=None):
+    qs = OrderHeader.objects.filter(
+        user__isnull=False, status__in=PURCHASED_STATUSES, paid_at__lt=end)
+    if start is not None:
+        qs = qs.filter(paid_at__gte=start)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    return qs
+
+
+def _changed_users(start: datetime, end: datetime) -> set:
+    """Users with an order paid before `start` that was updated in [start, end)."""
+    return set(OrderHeader.objects
+               .filter(user__isnull=False, paid_at__lt=start,
+                       updated_at__gte=start, updated_at__lt=end)
+               .values_list("user_id", flat=True).distinct())
+
+
+def _order_deltas(start, end, user_ids=None) -> dict:
+    rows = (_purchases(start, end, user_ids)
+            .order_by()
+            .values("user_id")
+            .annotate(orders=Count("id"), spend=Sum("total_payable_toman"),
+                      cogs=Sum("cogs_total_toman"), first=Min("paid_at"), last=Max("paid_at")))
+    return {r["user_id"]: r for r in rows}
+
+
+def _category_deltas(start, end, user_ids=None) -> dict:
+    lines = OrderLine.objects.filter(order__in=_purchases(start, end, user_ids))
+    rows = (lines.order_by()
+            .values_list("order__user_id", "variant__product__category_id")
+            .annotate(units=Sum("qty")))
+    per_user = {}
+    for user_id, category_id, units in rows:
+        per_user.setdefault(user_id, Counter())[str(category_id)] += units
+    return per_user
+
+
+def _score_rfm(day: date):
+    """RFM quintiles (R*100 + F*10 + M) for one snapshot date in a single UPDATE."""
+    table = DailyUserSnapshot._meta.db_table
+    with connection.cursor() as cur:
+        cur.execute(f"""
+            UPDATE {table} SET rfm_score = ranked.score
+            FROM (
+                SELECT id,
+                       NTILE(5) OVER (ORDER BY last_purchase_at) * 100
+                     + NTILE(5) OVER (ORDER BY total_orders) * 10
+                     + NTILE(5) OVER (ORDER BY total_spend_toman) AS score
+                FROM {table}
+                WHERE snapshot_date = %s
+            ) AS ranked
+            WHERE {table}.id = ranked.id
+        """, [day.isoformat()])
+
+
+def build_user_snapshots(day: date, rebuild: bool = False) -> int:
+    """Write DailyUserSnapshot rows for `day`. Returns the number of users written."""
+    start, end = day_bounds(day)
+    prev_rows = DailyUserSnapshot.objects.filter(snapshot_date=day - timedelta(days=1))
+
+    if rebuild or not prev_rows.exists():
+        previous = {}
+        window_start = None  # aggregate all history up to `day`
+        changed = set()
+    else:
+        previous = {r["user_id"]: r for r in prev_rows.values("user_id", *USER_SNAPSHOT_FIELDS)}
+        window_start = start
+        changed = _changed_users(start, end)
+
+    orders = _order_deltas(window_start, end)
+    categories = _category_deltas(window_start, end)
+    if changed:
+        # their whole history replaces D-1 + today's orders
+        orders.update(_order_deltas(None, end, changed))
+        categories.update(_category_deltas(None, end, changed))
+        for user_id in changed:
+            previous.pop(user_id, None)
+            if user_id not in orders:  # nothing left that counts as a purchase
+                categories.pop(user_id, None)
+
+    snapshots = []
+    for user_id in previous.keys() | orders.keys():
+        prev = previous.get(user_id)
+        delta = orders.get(user_id)
+        snap = DailyUserSnapshot(snapshot_date=day, user_id=user_id)
+        if prev:
+            for name in USER_SNAPSHOT_FIELDS:
+                setattr(snap, name, prev[name])
+        if delta:
+            snap.total_orders += delta["orders"]
+            snap.total_spend_toman += delta["spend"] or 0
+            snap.lifetime_cogs_toman += delta["cogs"] or 0
+            snap.first_purchase_at = min(filter(None, [snap.first_purchase_at, delta["first"]]))
+            snap.last_purchase_at = max(filter(None, [snap.last_purchase_at, delta["last"]]))
+        if user_id in categories:
+            # running top-k by units; categories that fell out of it restart from 0
+            units = Counter(snap.preferred_categories or {})
+            units.update(categories[user_id])
+            snap.preferred_categories = dict(units.most_common(PREFERRED_CATEGORIES_LIMIT))
+        snap.churn_risk = churn_risk(snap.last_purchase_at, end)
+        snapshots.append(snap)
+
+    with transaction.atomic():
+        # rows of an earlier run of `day` for users with no purchases left
+        if window_start is None:
+            DailyUserSnapshot.objects.filter(snapshot_date=day).delete()
+        elif changed - orders.keys():
+            DailyUserSnapshot.objects.filter(
+                snapshot_date=day, user_id__in=changed - orders.keys()).delete()
+        DailyUserSnapshot.objects.bulk_create(
+            snapshots,
+            batch_size=WRITE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["snapshot_date", "user"],
+            update_fields=USER_SNAPSHOT_FIELDS,
+        )
+        if snapshots:
+            _score_rfm(day)
+    return len(snapshots)
+
+
+# ---------- Inventory ----------
+
+
+def _units_sold(start: datetime, end: datetime | None = None) -> dict:
+    lines = OrderLine.objects.filter(
+        order__status__in=PURCHASED_STATUSES, order__paid_at__gte=start)
+    if end is not None:
+        lines = lines.filter(order__paid_at__lt=end)
+    return dict(lines.order_by().values_list("variant_id").annotate(units=Sum("qty")))
+
+
+def _unit_cost_subquery():
+    """Latest recorded COGS for the variant (OrderLine is the only cost ledger we have)."""
+    return Subquery(
+        OrderLine.objects.filter(variant_id=OuterRef("variant_id"), unit_cogs_toman__gt=0)
+        .order_by("-order__paid_at")
+        .values("unit_cogs_toman")[:1]
+    )
+
+
+def sell_through_rate(sold: int, on_hand: int) -> Decimal | None:
+    """Percentage of the units available during the day that were sold."""
+    available = sold + max(on_hand, 0)
+    if available <= 0:
+        return None
+    return (Decimal(sold) * 100 / available).quantize(Decimal("0.01"))
+
+
+def build_inventory_snapshots(day: date) -> int:
+    """
+    Write DailyInventorySnapshot rows for `day` (idempotent on
+    (snapshot_date, variant)). For past days the closing stock is
+    reconstructed as current on_hand + units sold since the end of `day`.
+    """
+    start, end = day_bounds(day)
+    sold_today = _units_sold(start, end)
+    sold_since = _units_sold(end) if end < timezone.now() else {}
+
+    stock = (StockItem.objects
+             .annotate(unit_cost=_unit_cost_subquery(),
+                       unit_price=effective_price_subquery(at=end, variant_ref="variant_id"))
+             .values_list("variant_id", "on_hand", "unit_cost", "unit_price"))
+
+    snapshots = []
+    for variant_id, on_hand, unit_cost, unit_price in stock.iterator(chunk_size=WRITE_BATCH_SIZE):
+        closing = on_hand + sold_since.get(variant_id, 0)
+        sold = sold_today.get(variant_id, 0)
+        snapshots.append(DailyInventorySnapshot(
+            snapshot_date=day,
+            variant_id=variant_id,
+            units_on_hand=closing,
+            inventory_value_toman=max(closing, 0) * (unit_cost or unit_price or 0),
+            sell_through_rate=sell_through_rate(sold, closing),
+        ))
+
+    DailyInventorySnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=WRITE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["snapshot_date", "variant"],
+        update_fields=["units_on_hand", "inventory_value_toman", "sell_through_rate"],
+    )
+    return len(snapshots)
+
+
+def backfill_inventory_snapshots(first: date, last: date, workers: int = 4) -> dict:
+    """Build every day in [first, last], `workers` contiguous chunks at a time."""
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    if connection.vendor == "sqlite":
+        workers = 1  # SQLite serialises writers anyway
+    workers = max(1, min(workers, len(days)))
+    size = -(-len(days) // workers)
+    chunks = [days[i:i + size] for i in range(0, len(days), size)]
+
+    def run(chunk):
+        try:
+            return {day: build_inventory_snapshots(day) for day in chunk}
+        finally:
+            connection.close()
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for done in pool.map(run, chunks):
+            results.update(done)
+    return results
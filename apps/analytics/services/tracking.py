@@ -0,0 +1,180 @@
+"""
+Buffered EventLog ingestion.
+
+`track()` only appends a small dict to an in-process buffer. A background
+thread writes the buffer with `bulk_create` when it reaches
+ANALYTICS_FLUSH_SIZE events or every ANALYTICS_FLUSH_INTERVAL seconds, and
+whatever is left is flushed at interpreter exit.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.analytics.models import EventLog
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_DROP_NEWEST = "drop_newest"
+BACKPRESSURE_FLUSH = "flush"
+BACKPRESSURE_POLICIES = (BACKPRESSURE_DROP_OLDEST,
+                         BACKPRESSURE_DROP_NEWEST, BACKPRESSURE_FLUSH)
+
+
+class EventBuffer:
+    """Thread-safe event queue with size/time based flushing."""
+
+    def __init__(self, flush_size=500, flush_interval=2.0, max_size=50_000,
+                 backpressure=BACKPRESSURE_DROP_OLDEST):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_size = max(max_size, flush_size)
+        self.backpressure = backpressure
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.dropped = 0
+        self.written = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def put(self, event: dict) -> bool:
+        """Queue one event (EventLog field kwargs). Returns False if dropped."""
+        if self._pid != os.getpid():
+            # forked worker (e.g. gunicorn --preload): start from a clean state
+            self._reset()
+
+        if self.backpressure == BACKPRESSURE_FLUSH and len(self._queue) >= self.max_size:
+            self.flush()
+
+        with self._lock:
+            if len(self._queue) >= self.max_size:
+                self.dropped += 1
+                if self.backpressure == BACKPRESSURE_DROP_NEWEST:
+                    return False
+                self._queue.popleft()
+            self._queue.append(event)
+            size = len(self._queue)
+
+        self._ensure_worker()
+        if size >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """Write everything currently buffered. Returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    n = min(self.flush_size, len(self._queue))
+                    batch = [self._queue.popleft() for _ in range(n)]
+                if not batch:
+                    break
+                try:
+                    EventLog.objects.bulk_create(
+                        [EventLog(**e) for e in batch], batch_size=self.flush_size)
+                except Exception:
+                    self.dropped += len(batch)
+                    logger.exception(
+                        "Dropped %d analytics events after a failed flush", len(batch))
+                else:
+                    written += len(batch)
+            self.written += written
+        return written
+
+    def shutdown(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="eventlog-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._queue:
+                continue
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> EventBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = EventBuffer(
+                    flush_size=settings.ANALYTICS_FLUSH_SIZE,
+                    flush_interval=settings.ANALYTICS_FLUSH_INTERVAL,
+                    max_size=settings.ANALYTICS_MAX_BUFFER,
+                    backpressure=settings.ANALYTICS_BACKPRESSURE,
+                )
+                atexit.register(_buffer.shutdown)
+    return _buffer
+
+
+def track(name, user=None, anonymous_id=None, properties=None, utm=None,
+          *, session_id=None, timestamp=None) -> bool:
+    """
+    Record an analytics event without touching the database on the caller's path.
+    `user` may be a User, an AnonymousUser or None.
+    """
+    user_id = None
+    if user is not None and getattr(user, "is_authenticated", False):
+        user_id = user.pk
+
+    event = dict(
+        name=name,
+        timestamp=timestamp or timezone.now(),
+        user_id=user_id,
+        anonymous_id=anonymous_id,
+        session_id=session_id,
+        properties=properties,
+        utm_json=utm,
+    )
+    if not settings.ANALYTICS_BUFFER_ENABLED:
+        EventLog.objects.create(**event)
+        return True
+    return get_buffer().put(event)
+
+
+def flush() -> int:
+    """Force-write buffered events (management commands, tests, shutdown hooks)."""
+    if _buffer is None:
+        return 0
+    return _buffer.flush()
@@ -0,0 +1,14 @@
+from django.dispatch import receiver
+
+from apps.analytics.services import attribution, sales
+from apps.orders.signals import order_status_changed
+
+
+@receiver(order_status_changed)
+def update_sales_rollups(sender, order, old_status, new_status, **kwargs):
+    sales.on_status_changed(order, old_status, new_status)
+
+
+@receiver(order_status_changed)
+def track_order_paid(sender, order, old_status, new_status, **kwargs):
+    attribution.on_status_changed(order, old_status, new_status)
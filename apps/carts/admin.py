@@ -1,24 +1,45 @@
 from django.contrib import admin
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
 from .models import Cart, CartItem, Checkout
 
 
 class CartItemInline(admin.TabularInline):
     model = CartItem
     extra = 0
+    # a variant <select> per row would list every SKU once per item
+    readonly_fields = ("variant",)
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("variant__product")
 
 
 @admin.register(Cart)
 class CartAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "anonymous_id",
-                    "applied_coupon", "updated_at")
+                    "applied_coupon", "item_count", "updated_at")
+    list_select_related = ("user", "applied_coupon")
     list_filter = ("applied_coupon",)
     search_fields = ("id", "user__phone_number")
+    raw_id_fields = ("user",)
     inlines = [CartItemInline]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(item_count=Count("items"))
+
+    @admin.display(description=_("تعداد آیتم"), ordering="item_count")
+    def item_count(self, obj):
+        return obj.item_count
+
 
 @admin.register(Checkout)
 class CheckoutAdmin(admin.ModelAdmin):
     list_display = ("id", "cart", "status", "phone_number",
                     "payable_toman", "created_at")
+    list_select_related = ("cart",)
+    raw_id_fields = ("cart",)
     list_filter = ("status", "payment_method")
     search_fields = ("cart__id", "phone_number")
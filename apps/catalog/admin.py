@@ -1,6 +1,15 @@
 from .models import GlobalDiscount, Coupon  # top imports if not present
+from django import forms
 from django.contrib import admin
-from .models import Brand, Category, MediaAsset, Product, ProductVariant, VariantPrice, AllowedWeight
+from django.contrib.admin import helpers
+from django.db.models import Count
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy as _
+from apps.common import bulk
+from .models import (
+    Brand, Category, MediaAsset, MediaDerivative, Product, ProductVariant, VariantPrice, AllowedWeight,
+)
+from .services import media_store, pricing, products
 
 
 @admin.register(AllowedWeight)
@@ -20,6 +29,7 @@ class BrandAdmin(admin.ModelAdmin):
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("name_fa", "slug_en", "parent", "is_active")
+    list_select_related = ("parent",)
     list_editable = ("is_active",)
     search_fields = ("name_fa", "slug_en")
     list_filter = ("parent",)
@@ -29,19 +39,54 @@ class VariantPriceInline(admin.TabularInline):
     model = VariantPrice
     extra = 1
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("variant")
+
 
 class ProductVariantInline(admin.TabularInline):
     model = ProductVariant
     extra = 1
 
+    def get_queryset(self, request):
+        # each row is labelled with str(variant), which reads product.name_fa
+        return super().get_queryset(request).select_related("product")
+
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ("name_fa", "slug_en", "brand",
-                    "category", "is_active", "is_featured")
+                    "category", "variant_count", "is_active", "is_featured")
+    list_select_related = ("brand", "category")
     list_editable = ("is_active", "is_featured")
     search_fields = ("name_fa", "slug_en")
     list_filter = ("brand", "category")
+    raw_id_fields = ("cover_image",)
+
+    actions = ["activate", "deactivate"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(variant_count=Count("variants"))
+
+    @admin.display(description=_("تعداد گونه"), ordering="variant_count")
+    def variant_count(self, obj):
+        return obj.variant_count
+
+    @admin.action(description=_("فعال‌سازی محصولات انتخاب‌شده"), permissions=["change"])
+    def activate(self, request, queryset):
+        bulk.run(self, request, queryset, _("فعال‌سازی محصولات"),
+                 lambda ids: products.set_active(ids, True))
+
+    @admin.action(description=_("غیرفعال‌سازی محصولات انتخاب‌شده"), permissions=["change"])
+    def deactivate(self, request, queryset):
+        bulk.run(self, request, queryset, _("غیرفعال‌سازی محصولات"),
+                 lambda ids: products.set_active(ids, False))
+
+
+class RepriceForm(forms.Form):
+    percent = forms.DecimalField(
+        label=_("درصد تغییر قیمت"), max_digits=5, decimal_places=2, min_value=-90, max_value=500,
+        help_text=_("مثبت برای افزایش، منفی برای کاهش"))
+    round_to = forms.IntegerField(label=_("گرد کردن به (تومان)"), min_value=1, initial=1000)
 
 
 @admin.register(ProductVariant)
@@ -51,13 +96,93 @@ class ProductVariantAdmin(admin.ModelAdmin):
     list_editable = ("is_active", "is_default")
     list_filter = ("grind_type", "is_active", "product")
     search_fields = ("sku", "product__name_fa")
+    raw_id_fields = ("product", "image")
     inlines = [VariantPriceInline]
+    actions = ["reprice"]
+
+    def get_queryset(self, request):
+        # every view, not only the changelist: str(variant) reads product.name_fa
+        return super().get_queryset(request).select_related("product", "weight_grams")
+
+    @admin.action(description=_("تغییر درصدی قیمت گونه‌های انتخاب‌شده"), permissions=["change"])
+    def reprice(self, request, queryset):
+        form = RepriceForm(request.POST if "apply" in request.POST else None)
+        if form.is_valid():
+            percent, round_to = form.cleaned_data["percent"], form.cleaned_data["round_to"]
+            bulk.run(self, request, queryset, _("تغییر قیمت"),
+                     lambda ids: pricing.reprice(ids, percent, round_to))
+            return None
+        return TemplateResponse(request, "admin/catalog/productvariant/reprice.html", {
+            **self.admin_site.each_context(request),
+            "title": _("تغییر درصدی قیمت"),
+            "opts": self.model._meta,
+            "form": form,
+            "count": queryset.count(),
+            "selected": request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            "select_across": request.POST.get("select_across", "0"),
+        })
+
+
+class MediaDerivativeInline(admin.TabularInline):
+    model = MediaDerivative
+    extra = 0
+    can_delete = False
+    fields = readonly_fields = ("format", "width", "height", "bytes", "file_path")
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class MediaAssetForm(forms.ModelForm):
+    upload = forms.FileField(label=_("بارگذاری فایل"), required=False)
+
+    class Meta:
+        model = MediaAsset
+        fields = ("upload", "file_path", "alt_fa")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["file_path"].required = False
+
+    def clean(self):
+        cleaned = super().clean()
+        upload = cleaned.get("upload")
+        if upload:
+            self.stored = media_store.put(upload)
+            duplicate = (MediaAsset.objects.filter(content_hash=self.stored.content_hash)
+                         .exclude(pk=self.instance.pk).first())
+            if duplicate is not None:
+                raise forms.ValidationError(
+                    _("این فایل قبلاً با نام «%(path)s» بارگذاری شده است."),
+                    params={"path": duplicate.file_path})
+            cleaned["file_path"] = self.stored.name
+        elif not cleaned.get("file_path"):
+            raise forms.ValidationError(_("یک فایل بارگذاری کنید یا مسیر آن را وارد کنید."))
+        return cleaned
+
+    def save(self, commit=True):
+        asset = super().save(commit=False)
+        if getattr(self, "stored", None):
+            asset.content_hash, asset.size = self.stored.content_hash, self.stored.size
+        elif "file_path" in self.changed_data:
+            asset.content_hash = asset.size = None  # `dedupe_media` hashes it
+        if commit:
+            asset.save()
+        return asset
 
 
 @admin.register(MediaAsset)
 class MediaAssetAdmin(admin.ModelAdmin):
-    list_display = ("file_path", "alt_fa")
-    search_fields = ("file_path", "alt_fa")
+    form = MediaAssetForm
+    list_display = ("file_path", "alt_fa", "size")
+    search_fields = ("file_path", "alt_fa", "content_hash")
+    readonly_fields = ("content_hash", "size", "references")
+    inlines = [MediaDerivativeInline]
+
+    @admin.display(description=_("تعداد استفاده"))
+    def references(self, obj):
+        return media_store.reference_counts([obj.pk])[obj.pk] if obj.pk else 0
 
 
 @admin.register(VariantPrice)
@@ -66,6 +191,12 @@ class VariantPriceAdmin(admin.ModelAdmin):
                     "compare_at_toman", "starts_at", "ends_at")
     list_filter = ("variant__product",)
     search_fields = ("variant__sku",)
+    raw_id_fields = ("variant",)
+
+    def get_queryset(self, request):
+        # every view, not only the changelist: __str__ shows the SKU on delete
+        # confirmations, history and LogEntry.object_repr
+        return super().get_queryset(request).select_related("variant__product")
 
 
 @admin.register(GlobalDiscount)
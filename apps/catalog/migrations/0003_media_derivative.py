@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:22
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_globaldiscount_coupon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaDerivative',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('format', models.CharField(max_length=10, verbose_name='فرمت')),
+                ('width', models.PositiveIntegerField(verbose_name='عرض')),
+                ('height', models.PositiveIntegerField(verbose_name='ارتفاع')),
+                ('bytes', models.PositiveIntegerField(verbose_name='حجم (بایت)')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='هش محتوا')),
+                ('file_path', models.CharField(max_length=255, verbose_name='مسیر فایل')),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='derivatives', to='catalog.mediaasset')),
+            ],
+            options={
+                'verbose_name': 'نسخه تصویر',
+                'verbose_name_plural': 'نسخه\u200cهای تصویر',
+                'unique_together': {('asset', 'format', 'width')},
+            },
+        ),
+    ]
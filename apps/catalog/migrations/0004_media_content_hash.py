@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_media_derivative'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaasset',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name='هش محتوا'),
+        ),
+        migrations.AddField(
+            model_name='mediaasset',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='حجم (بایت)'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db.models.functions import Lower  # add at top if missing
+from django.core.files.storage import default_storage
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.common.models import UUIDModel
@@ -63,6 +64,10 @@ class Category(UUIDModel):
 class MediaAsset(UUIDModel):
     file_path = models.CharField(_("مسیر فایل"), max_length=255)
     alt_fa = models.CharField(_("متن جایگزین"), max_length=180, blank=True)
+    # sha256 of the bytes (services/media_store.py); empty for assets not hashed yet
+    content_hash = models.CharField(
+        _("هش محتوا"), max_length=64, unique=True, null=True, blank=True, editable=False)
+    size = models.PositiveBigIntegerField(_("حجم (بایت)"), null=True, blank=True, editable=False)
 
     class Meta:
         verbose_name = _("رسانه")
@@ -71,6 +76,37 @@ class MediaAsset(UUIDModel):
     def __str__(self):
         return self.file_path
 
+    @property
+    def url(self):
+        """Public URL: absolute paths and full URLs as stored, storage-relative paths via MEDIA_URL."""
+        if self.file_path.startswith("/") or "://" in self.file_path:
+            return self.file_path
+        return default_storage.url(self.file_path)
+
+
+class MediaDerivative(UUIDModel):
+    """A resized / re-encoded copy of a MediaAsset (services/images.py)."""
+    asset = models.ForeignKey(
+        MediaAsset, on_delete=models.CASCADE, related_name="derivatives")
+    format = models.CharField(_("فرمت"), max_length=10)  # "webp", "avif"
+    width = models.PositiveIntegerField(_("عرض"))
+    height = models.PositiveIntegerField(_("ارتفاع"))
+    bytes = models.PositiveIntegerField(_("حجم (بایت)"))
+    content_hash = models.CharField(_("هش محتوا"), max_length=64)  # sha256 hex
+    file_path = models.CharField(_("مسیر فایل"), max_length=255)  # storage-relative
+
+    class Meta:
+        verbose_name = _("نسخه تصویر")
+        verbose_name_plural = _("نسخه‌های تصویر")
+        unique_together = [("asset", "format", "width")]
+
+    def __str__(self):
+        return f"{self.asset_id} {self.width}w.{self.format}"
+
+    @property
+    def url(self):
+        return default_storage.url(self.file_path)
+
 
 class Product(UUIDModel):
     brand = models.ForeignKey(Brand, null=True, blank=True,
@@ -120,8 +156,9 @@ class ProductVariant(UUIDModel):
         indexes = [models.Index(fields=["product", "is_active"])]
 
     def __str__(self):
+        # weight_grams_id is the grams value itself; no AllowedWeight lookup per label
         g = dict(GrindType.choices).get(self.grind_type, "")
-        return f"{self.product.name_fa} — {self.weight_grams} — {g or '—'}"
+        return f"{self.product.name_fa} — {self.weight_grams_id} g — {g or '—'}"
 
 
 class VariantPrice(UUIDModel):
@@ -0,0 +1,179 @@
+"""
+Resized WebP / AVIF derivatives of MediaAsset images.
+
+For every asset, each configured width below the original's width (or just
+the original width for small images) is encoded in every configured format
+and stored as `derivatives/<asset>/<width>w.<hash>.<format>`; the content
+hash in the name keeps URLs immutable for far-future caching. Encoding is
+CPU-bound, so bulk backfills fan out to a process pool: the parent reads
+originals from storage and writes results, the workers only run Pillow on
+bytes (no database or storage access in the children).
+
+`srcset()` / `picture_sources()` build the HTML attributes from the
+derivative rows; prefetch `derivatives` when rendering lists.
+"""
+import hashlib
+import io
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from apps.catalog.models import MediaAsset, MediaDerivative
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # optional until Pillow is installed
+    Image = ImageOps = features = None
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+# preferred first in <picture>
+FORMAT_ORDER = ("avif", "webp")
+
+
+@dataclass
+class BuildStats:
+    assets: int = 0
+    derivatives: int = 0
+    bytes_before: int = 0  # originals
+    bytes_after: int = 0  # largest width, best format
+    skipped: list = field(default_factory=list)  # (asset_id, reason)
+
+
+def require_pillow():
+    if Image is None:
+        raise RuntimeError("Image derivatives need Pillow (pip install pillow).")
+
+
+def supported_formats() -> list[str]:
+    """Configured formats this Pillow build can encode."""
+    require_pillow()
+    return [fmt for fmt in settings.MEDIA_DERIVATIVE_FORMATS if features.check(fmt)]
+
+
+def storage_name(file_path: str) -> str | None:
+    """Storage-relative name of an asset's original, or None for remote files."""
+    if "://" in file_path:
+        return None
+    media_url = "/" + settings.MEDIA_URL.strip("/") + "/"
+    if file_path.startswith(media_url):
+        return file_path[len(media_url):]
+    return file_path.lstrip("/")
+
+
+# ---------- Worker (runs in a child process) ----------
+
+
+def render(data: bytes, widths, formats, quality: dict) -> list[tuple]:
+    """[(format, width, height, encoded bytes), ...] for one original."""
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        targets = sorted({w for w in widths if w < image.width}) or [image.width]
+        results = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                buf = io.BytesIO()
+                resized.save(buf, format=fmt.upper(), quality=quality[fmt])
+                results.append((fmt, width, height, buf.getvalue()))
+        return results
+
+
+# ---------- Parent ----------
+
+
+def pending_assets(force: bool = False):
+    qs = MediaAsset.objects.order_by("pk")
+    if not force:
+        qs = qs.filter(derivatives__isnull=True)
+    return qs.values_list("pk", "file_path")
+
+
+def _save(asset_id, results: list[tuple]) -> list[MediaDerivative]:
+    rows = []
+    for fmt, width, height, data in results:
+        digest = hashlib.sha256(data).hexdigest()
+        name = default_storage.save(
+            f"derivatives/{asset_id}/{width}w.{digest[:12]}.{fmt}", ContentFile(data))
+        rows.append(MediaDerivative(asset_id=asset_id, format=fmt, width=width, height=height,
+                                    bytes=len(data), content_hash=digest, file_path=name))
+    with transaction.atomic():
+        # old files go with their rows (catalog/signals.py)
+        MediaDerivative.objects.filter(asset_id=asset_id).delete()
+        MediaDerivative.objects.bulk_create(rows)
+        # a MediaAsset save tells page caches (cms/signals.py) to re-render with the new srcset
+        MediaAsset.objects.only("pk", "file_path").get(pk=asset_id).save(update_fields=["updated_at"])
+    return rows
+
+
+def build_derivatives(asset_ids=None, force: bool = False, workers: int | None = None) -> BuildStats:
+    """Generate derivatives for assets without any (all with `force`, or just `asset_ids`)."""
+    formats = supported_formats()
+    if not formats:
+        raise RuntimeError(f"Pillow can't encode any of {settings.MEDIA_DERIVATIVE_FORMATS}.")
+    widths = settings.MEDIA_DERIVATIVE_WIDTHS
+    quality = {"webp": settings.MEDIA_WEBP_QUALITY, "avif": settings.MEDIA_AVIF_QUALITY}
+    assets = pending_assets(force or asset_ids is not None)
+    if asset_ids is not None:
+        assets = assets.filter(pk__in=asset_ids)
+
+    stats = BuildStats()
+    workers = workers or settings.MEDIA_DERIVATIVE_WORKERS
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+
+        def collect(done):
+            for future in done:
+                asset_id, size = in_flight.pop(future)
+                try:
+                    rows = _save(asset_id, future.result())
+                except Exception as exc:  # one broken image shouldn't stop a backfill
+                    stats.skipped.append((asset_id, str(exc)))
+                    continue
+                stats.assets += 1
+                stats.derivatives += len(rows)
+                # original vs. the smallest encoding at the largest width
+                largest = max(r.width for r in rows)
+                stats.bytes_before += size
+                stats.bytes_after += min(r.bytes for r in rows if r.width == largest)
+
+        for asset_id, file_path in assets.iterator(chunk_size=500):
+            name = storage_name(file_path)
+            if name is None or not default_storage.exists(name):
+                stats.skipped.append((asset_id, "original not in storage"))
+                continue
+            with default_storage.open(name, "rb") as fh:
+                data = fh.read()
+            in_flight[pool.submit(render, data, widths, formats, quality)] = (asset_id, len(data))
+            if len(in_flight) >= workers * 2:  # bounded: originals are held in memory
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(in_flight).done)
+    return stats
+
+
+# ---------- HTML helpers ----------
+
+
+def _derivatives(asset: MediaAsset) -> list[MediaDerivative]:
+    # uses prefetch_related("derivatives") when present
+    return list(asset.derivatives.all())
+
+
+def srcset(asset: MediaAsset, fmt: str) -> str:
+    """`srcset` attribute value for one format, e.g. "…/320w.ab12.webp 320w, …"."""
+    return ", ".join(f"{d.url} {d.width}w" for d in sorted(
+        (d for d in _derivatives(asset) if d.format == fmt), key=lambda d: d.width))
+
+
+def picture_sources(asset: MediaAsset) -> list[dict]:
+    """[{"type": "image/avif", "srcset": ...}, ...] for a <picture>, best format first."""
+    available = {d.format for d in _derivatives(asset)}
+    return [{"type": MIME_TYPES[fmt], "srcset": srcset(asset, fmt)}
+            for fmt in FORMAT_ORDER if fmt in available]
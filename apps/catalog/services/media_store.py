@@ -0,0 +1,262 @@
+"""
+Content-addressed media storage.
+
+Uploads are streamed chunk by chunk through SHA-256 into a spooled temp
+file, then saved once as `cas/<aa>/<bb>/<sha256><ext>`; identical bytes map
+to the same name, so a re-upload stores nothing and `store()` hands back the
+existing MediaAsset (content_hash is unique).
+
+Usage is counted over every reverse relation to MediaAsset found through
+`_meta.related_objects` (product / variant images, review media, article
+covers, OG images, ...), so new relations are picked up without touching
+this module. Derivatives belong to their asset and don't count as usage.
+Images embedded in CMS rich text (RICH_TEXT_FIELDS) have no relation; an
+asset whose path, or a derivative's path, appears in that HTML is neither
+collected nor merged away.
+`dedupe()` merges assets stored before hashing existed, `collect_garbage()`
+removes unreferenced assets and stray stored objects.
+"""
+import hashlib
+import tempfile
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.catalog.models import MediaAsset, MediaDerivative
+from apps.catalog.services.images import storage_name
+
+CAS_PREFIX = "cas"
+# HTML fields that embed media by URL: (model label, field name)
+RICH_TEXT_FIELDS = (("cms.Article", "content_rich_fa"), ("cms.Page", "body_rich_fa"))
+CHUNK_SIZE = 1024 * 1024
+SPOOL_MAX_SIZE = 10 * 1024 * 1024  # larger uploads spill to disk while hashing
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    name: str
+    content_hash: str
+    size: int
+
+
+def content_name(content_hash: str, extension: str = "") -> str:
+    return f"{CAS_PREFIX}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{extension}"
+
+
+def _extension(filename) -> str:
+    suffix = PurePosixPath(filename or "").suffix.lower()
+    return suffix if 1 < len(suffix) <= 6 and suffix[1:].isalnum() else ""
+
+
+def _chunks(fileobj):
+    if hasattr(fileobj, "chunks"):  # UploadedFile / File
+        yield from fileobj.chunks(CHUNK_SIZE)
+        return
+    while chunk := fileobj.read(CHUNK_SIZE):
+        yield chunk
+
+
+def put(fileobj, filename=None) -> StoredObject:
+    """Store the bytes once under their hash; an identical object already stored is reused."""
+    hasher, size = hashlib.sha256(), 0
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as tmp:
+        for chunk in _chunks(fileobj):
+            hasher.update(chunk)
+            tmp.write(chunk)
+            size += len(chunk)
+        digest = hasher.hexdigest()
+        # bytes an asset already has (possibly under a pre-hash path) aren't stored again
+        existing = MediaAsset.objects.filter(content_hash=digest).values_list("file_path", flat=True).first()
+        if existing and storage_name(existing) and default_storage.exists(storage_name(existing)):
+            return StoredObject(existing, digest, size)
+        name = content_name(digest, _extension(filename or getattr(fileobj, "name", "")))
+        if not default_storage.exists(name):
+            tmp.seek(0)
+            name = default_storage.save(name, File(tmp))
+    return StoredObject(name, digest, size)
+
+
+def store(fileobj, filename=None, alt_fa: str = "") -> tuple[MediaAsset, bool]:
+    """(asset, created): the MediaAsset for these bytes, uploading them if they are new."""
+    obj = put(fileobj, filename)
+    existing = MediaAsset.objects.filter(content_hash=obj.content_hash).first()
+    if existing is not None:
+        return existing, False
+    try:
+        with transaction.atomic():
+            return MediaAsset.objects.create(
+                file_path=obj.name, content_hash=obj.content_hash, size=obj.size, alt_fa=alt_fa), True
+    except IntegrityError:  # same bytes uploaded concurrently
+        return MediaAsset.objects.get(content_hash=obj.content_hash), False
+
+
+def hash_stored(file_path: str) -> StoredObject | None:
+    name = storage_name(file_path)
+    if name is None or not default_storage.exists(name):
+        return None
+    hasher, size = hashlib.sha256(), 0
+    with default_storage.open(name, "rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            hasher.update(chunk)
+            size += len(chunk)
+    return StoredObject(name, hasher.hexdigest(), size)
+
+
+# ---------- References ----------
+
+
+def usage_relations() -> list:
+    """Reverse relations that count as a use of a MediaAsset."""
+    return [rel for rel in MediaAsset._meta.related_objects
+            if rel.related_model is not MediaDerivative and not rel.many_to_many]
+
+
+def reference_counts(asset_ids) -> dict:
+    """{asset_id: number of rows referencing it} (one grouped query per relation)."""
+    counts = dict.fromkeys(asset_ids, 0)
+    for rel in usage_relations():
+        column = rel.field.name
+        for asset_id, n in (rel.related_model._base_manager
+                            .filter(**{f"{column}__in": counts})
+                            .values_list(column).annotate(n=Count("pk")).order_by()):
+            counts[asset_id] += n
+    return counts
+
+
+def _embedded(path_ref):
+    """Q: the path (an OuterRef) occurs in any rich-text field."""
+    q = Q()
+    for label, name in RICH_TEXT_FIELDS:
+        q |= Exists(apps.get_model(label)._base_manager.filter(**{f"{name}__contains": path_ref}))
+    return q
+
+
+def _embedded_asset():
+    """Q on MediaAsset: its path, or one of its derivatives', occurs in rich text."""
+    derivatives = MediaDerivative.objects.filter(asset=OuterRef("pk")).filter(
+        _embedded(OuterRef("file_path")))
+    return _embedded(OuterRef("file_path")) | Exists(derivatives)
+
+
+def unreferenced():
+    qs = MediaAsset.objects.all()
+    for rel in usage_relations():
+        qs = qs.filter(~Exists(rel.related_model._base_manager.filter(
+            **{rel.field.name: OuterRef("pk")})))
+    return qs.exclude(_embedded_asset())
+
+
+def _repoint(duplicate_ids: list, survivor_id):
+    """Move every reference of the duplicates onto the survivor, saving row by row so signals fire."""
+    for rel in usage_relations():
+        column = rel.field.name
+        for obj in rel.related_model._base_manager.filter(**{f"{column}__in": duplicate_ids}):
+            setattr(obj, rel.field.attname, survivor_id)
+            obj.save(update_fields=[column])
+
+
+# ---------- Maintenance ----------
+
+
+@dataclass
+class MediaStats:
+    hashed: int = 0
+    merged: int = 0
+    deleted_assets: int = 0
+    deleted_files: list = field(default_factory=list)
+    missing: list = field(default_factory=list)  # asset ids whose file is gone
+    embedded: list = field(default_factory=list)  # duplicates kept: rich text links their files
+
+
+def _delete_files(names, stats: MediaStats, dry_run: bool, going=()):
+    """Delete stored originals no remaining asset points to (`going`: assets about to be deleted)."""
+    still_used = set(MediaAsset.objects.filter(file_path__in=names).exclude(pk__in=going)
+                     .values_list("file_path", flat=True))
+    for name in sorted(set(names) - still_used):
+        stored = storage_name(name)
+        if stored and default_storage.exists(stored):
+            stats.deleted_files.append(stored)
+            if not dry_run:
+                default_storage.delete(stored)
+
+
+def dedupe(dry_run: bool = False) -> MediaStats:
+    """
+    Hash assets stored without a hash and merge assets with identical bytes.
+    A duplicate embedded in CMS rich text is left unhashed and unmerged (the
+    HTML points at its files); it is reported in `embedded`.
+    """
+    stats = MediaStats()
+    by_hash = {}
+    for pk, content_hash in (MediaAsset.objects.exclude(content_hash=None)
+                             .values_list("pk", "content_hash")):
+        by_hash[content_hash] = pk
+
+    for asset in MediaAsset.objects.filter(content_hash=None).order_by("created_at").iterator():
+        obj = hash_stored(asset.file_path)
+        if obj is None:
+            stats.missing.append(asset.pk)
+            continue
+        stats.hashed += 1
+        survivor_id = by_hash.get(obj.content_hash)
+        if survivor_id is None:
+            by_hash[obj.content_hash] = asset.pk
+            if not dry_run:
+                MediaAsset.objects.filter(pk=asset.pk).update(
+                    content_hash=obj.content_hash, size=obj.size)
+            continue
+        if MediaAsset.objects.filter(pk=asset.pk).filter(_embedded_asset()).exists():
+            stats.embedded.append(asset.pk)
+            continue
+        stats.merged += 1
+        if dry_run:
+            continue
+        with transaction.atomic():
+            _repoint([asset.pk], survivor_id)
+            asset.delete()  # derivatives cascade; cms caches listen to MediaAsset deletes
+        _delete_files([asset.file_path], stats, dry_run=False)
+    return stats
+
+
+def collect_garbage(grace: timedelta = timedelta(days=1), dry_run: bool = False) -> MediaStats:
+    """
+    Delete assets nothing references (created more than `grace` ago, so a
+    fresh upload can still be attached) and stored objects under cas/ that
+    no asset points to.
+    """
+    stats = MediaStats()
+    cutoff = timezone.now() - grace
+    orphans = unreferenced().filter(created_at__lt=cutoff)
+    found = list(orphans.values_list("pk", "file_path"))
+    stats.deleted_assets = len(found)
+    if not dry_run:
+        for asset in orphans.iterator():
+            asset.delete()  # derivatives cascade; cms caches listen to MediaAsset deletes
+    _delete_files([name for _, name in found], stats, dry_run, going=[pk for pk, _ in found])
+
+    used = set(MediaAsset.objects.filter(file_path__startswith=f"{CAS_PREFIX}/")
+               .values_list("file_path", flat=True))
+    for name in _walk(CAS_PREFIX):
+        if name not in used and default_storage.get_modified_time(name) < cutoff:
+            stats.deleted_files.append(name)
+            if not dry_run:
+                default_storage.delete(name)
+    return stats
+
+
+def _walk(prefix: str):
+    try:
+        directories, files = default_storage.listdir(prefix)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f"{prefix}/{name}"
+    for directory in directories:
+        yield from _walk(f"{prefix}/{directory}")
@@ -0,0 +1,57 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from apps.catalog.models import ProductVariant, VariantPrice
+
+
+def active_prices(at=None):
+    """VariantPrice rows whose [starts_at, ends_at) window contains `at` (default: now)."""
+    at = at or timezone.now()
+    return VariantPrice.objects.filter(
+        Q(starts_at__isnull=True) | Q(starts_at__lte=at),
+        Q(ends_at__isnull=True) | Q(ends_at__gt=at),
+    )
+
+
+def effective_price_subquery(at=None, variant_ref="pk", field="price_toman"):
+    """
+    Correlated subquery with the current price of a variant: the newest active
+    VariantPrice. Annotate with it instead of reading `variant.prices` per row.
+    `field` picks another column of that row (e.g. compare_at_toman).
+    """
+    return Subquery(
+        active_prices(at)
+        .filter(variant_id=OuterRef(variant_ref))
+        .order_by("-created_at")
+        .values(field)[:1]
+    )
+
+
+def reprice(variant_ids, percent: Decimal, round_to: int = 1, at=None) -> int:
+    """
+    Start a new price `percent` above (negative: below) each variant's current
+    price, rounded to `round_to` toman. A compare-at price is scaled the same
+    way, so the shown discount keeps its size. Old rows are kept as history;
+    the new row wins as the newest active one. Returns the rows created.
+    """
+    at = at or timezone.now()
+    current = (ProductVariant.objects.filter(pk__in=variant_ids)
+               .annotate(price=effective_price_subquery(at),
+                         compare_at=effective_price_subquery(at, field="compare_at_toman"))
+               .exclude(price=None)
+               .values_list("pk", "price", "compare_at"))
+    factor = (100 + Decimal(percent)) / 100
+
+    def scale(amount):
+        steps = (amount * factor / round_to).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        return max(int(steps) * round_to, 0)
+
+    rows = []
+    for variant_id, price, compare_at in current:
+        rows.append(VariantPrice(variant_id=variant_id, price_toman=scale(price),
+                                 compare_at_toman=scale(compare_at) if compare_at else None,
+                                 starts_at=at))
+    VariantPrice.objects.bulk_create(rows)
+    return len(rows)
@@ -0,0 +1,15 @@
+from django.utils import timezone
+
+from apps.catalog.models import Product
+from apps.catalog.signals import products_changed
+
+
+def set_active(product_ids, is_active: bool) -> int:
+    """(De)activate products with one UPDATE. Returns the products that changed."""
+    changed = list(Product.objects.filter(pk__in=product_ids).exclude(is_active=is_active)
+                   .values_list("pk", flat=True))
+    if changed:
+        # updated_at is what incremental jobs (recommendations) look at
+        Product.objects.filter(pk__in=changed).update(is_active=is_active, updated_at=timezone.now())
+        products_changed.send(sender=Product, product_ids=changed)
+    return len(changed)
@@ -0,0 +1,31 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from apps.catalog.models import MediaAsset, MediaDerivative
+
+# Sent by bulk queryset.update() calls on Product (which skip post_save) so
+# caches keyed on products are invalidated as a per-row save() would. Args:
+# product_ids.
+products_changed = Signal()
+
+
+@receiver(post_init, sender=MediaAsset)
+def remember_file_path(sender, instance, **kwargs):
+    instance._loaded_file_path = instance.__dict__.get("file_path")
+
+
+@receiver(post_save, sender=MediaAsset)
+def drop_stale_derivatives(sender, instance, created, raw=False, **kwargs):
+    """A replaced original invalidates its derivatives; `build_media_derivatives` makes new ones."""
+    if raw or created or instance._loaded_file_path == instance.file_path:
+        return
+    instance._loaded_file_path = instance.file_path
+    MediaDerivative.objects.filter(asset=instance).delete()
+
+
+@receiver(post_delete, sender=MediaDerivative)
+def delete_derivative_file(sender, instance, **kwargs):
+    name = instance.file_path
+    transaction.on_commit(lambda: default_storage.delete(name))
@@ -0,0 +1,17 @@
+from django import template
+
+from apps.catalog.services.images import picture_sources, srcset as _srcset
+
+register = template.Library()
+
+
+@register.inclusion_tag("catalog/_picture.html")
+def picture(asset, sizes="100vw", loading="lazy", css_class=""):
+    """<picture> with AVIF / WebP sources and the original as fallback. Prefetch `derivatives`."""
+    return {"asset": asset, "sources": picture_sources(asset), "sizes": sizes,
+            "loading": loading, "css_class": css_class}
+
+
+@register.simple_tag
+def srcset(asset, fmt="webp"):
+    return _srcset(asset, fmt)
@@ -1,22 +1,25 @@
 from django.contrib import admin
 from .models import (
     Article, ArticleCategory, Tag, ArticleProduct,
-    Page, SeoMeta, SiteSeoDefault
+    Page, SeoMeta, SiteSeoDefault, RelatedArticles
 )
 
 
 class ArticleProductInline(admin.TabularInline):
     model = ArticleProduct
     extra = 0
+    raw_id_fields = ("product",)
 
 
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ("title_fa", "slug_en", "category",
                     "status", "published_at")
+    list_select_related = ("category",)
     list_filter = ("status", "category", "tags")
     search_fields = ("title_fa", "slug_en", "excerpt_fa", "content_rich_fa")
     filter_horizontal = ("tags",)
+    raw_id_fields = ("author", "cover_image")
     inlines = [ArticleProductInline]
     fieldsets = (
         (None, {"fields": ("title_fa", "slug_en",
@@ -52,8 +55,19 @@ class SeoMetaAdmin(admin.ModelAdmin):
                     "meta_robots", "canonical_url")
     list_filter = ("entity_type",)
     search_fields = ("entity_id", "meta_title_fa", "meta_description_fa")
+    raw_id_fields = ("og_image",)
 
 
 @admin.register(SiteSeoDefault)
 class SiteSeoDefaultAdmin(admin.ModelAdmin):
     list_display = ("meta_title_suffix_fa",)
+    raw_id_fields = ("default_og_image",)
+
+
+@admin.register(RelatedArticles)
+class RelatedArticlesAdmin(admin.ModelAdmin):
+    list_display = ("article", "computed_at")
+    list_select_related = ("article",)
+    raw_id_fields = ("article",)
+    search_fields = ("article__title_fa",)
+    readonly_fields = ("tag_ids", "category_id", "signature", "computed_at")
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArticles',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='related', serialize=False, to='cms.article')),
+                ('items', models.JSONField(default=list, verbose_name='مقالات مرتبط')),
+                ('tag_ids', models.JSONField(default=list)),
+                ('category_id', models.UUIDField(blank=True, null=True)),
+                ('signature', models.CharField(max_length=32)),
+                ('computed_at', models.DateTimeField(verbose_name='زمان محاسبه')),
+            ],
+            options={
+                'verbose_name': 'مقالات مرتبط',
+                'verbose_name_plural': 'مقالات مرتبط',
+            },
+        ),
+    ]
@@ -83,6 +83,30 @@ class ArticleProduct(UUIDModel):
         verbose_name_plural = _("ارتباط‌های مقاله و محصول")
         unique_together = [("article", "product")]
 
+
+class RelatedArticles(models.Model):
+    """
+    Precomputed "related articles" of one article (services/related.py):
+    top-k by tag Jaccard similarity plus a same-category bonus. `items` is
+    what the article page renders, so showing it is one primary-key read.
+    """
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True, related_name="related")
+    # [{"id", "slug", "title", "score"}, ...] best first
+    items = models.JSONField(_("مقالات مرتبط"), default=list)
+    # inputs of the last computation, to find what changed since
+    tag_ids = models.JSONField(default=list)
+    category_id = models.UUIDField(null=True, blank=True)
+    signature = models.CharField(max_length=32)
+    computed_at = models.DateTimeField(_("زمان محاسبه"))
+
+    class Meta:
+        verbose_name = _("مقالات مرتبط")
+        verbose_name_plural = _("مقالات مرتبط")
+
+    def __str__(self):
+        return f"Related<{self.article_id}>"
+
 # ---------- Static pages ----------
 
 
@@ -0,0 +1,127 @@
+"""
+Related articles by shared tags and category.
+
+Similarity is tag Jaccard |A ∩ B| / |A ∪ B| plus CATEGORY_BONUS when both
+articles are in the same category. The intersections for one article are a
+row of the sparse product X·Xᵀ (X = article x tag), computed by walking the
+inverted index tag → articles instead of comparing every pair.
+
+Runs are incremental: each RelatedArticles row keeps the tags, category and
+a signature (incl. slug / title / live state) it was computed from. Articles
+whose signature changed, plus every article sharing an old or new tag or
+category with them, are recomputed; so is a list pointing at an article that
+no longer exists. Rows whose list changed bump the article's "related"
+render version.
+"""
+import hashlib
+import heapq
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.cms.models import Article, ArticleStatus, RelatedArticles
+from apps.cms.services import rendering
+
+CATEGORY_BONUS = 0.2
+WRITE_BATCH_SIZE = 1_000
+
+
+def _signature(tag_ids, category_id, live, slug, title) -> str:
+    raw = f"{','.join(tag_ids)}|{category_id}|{live}|{slug}|{title}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _load_articles(now) -> dict:
+    tags = defaultdict(list)
+    for article_id, tag_id in Article.tags.through.objects.values_list("article_id", "tag_id"):
+        tags[article_id].append(str(tag_id))
+    articles = {}
+    for pk, slug, title, category_id, status, published_at in Article.objects.values_list(
+            "pk", "slug_en", "title_fa", "category_id", "status", "published_at"):
+        live = status == ArticleStatus.PUBLISHED and published_at is not None and published_at <= now
+        tag_ids = sorted(tags.get(pk, ()))
+        articles[pk] = {
+            "slug": slug, "title": title, "category_id": category_id, "live": live,
+            "tag_ids": tag_ids, "signature": _signature(tag_ids, category_id, live, slug, title),
+        }
+    return articles
+
+
+def _similar(pk, articles: dict, by_tag: dict, by_category: dict, k: int) -> list[dict]:
+    article = articles[pk]
+    shared = defaultdict(int)
+    for tag_id in article["tag_ids"]:
+        for other in by_tag.get(tag_id, ()):
+            shared[other] += 1
+    same_category = by_category.get(article["category_id"], set())
+
+    scored = []
+    size = len(article["tag_ids"])
+    for other in shared.keys() | same_category:
+        if other == pk:
+            continue
+        inter = shared.get(other, 0)
+        union = size + len(articles[other]["tag_ids"]) - inter
+        score = (inter / union if union else 0.0) + (CATEGORY_BONUS if other in same_category else 0.0)
+        scored.append((score, str(other), other))
+    return [{"id": other_id, "slug": articles[other]["slug"], "title": articles[other]["title"],
+             "score": round(score, 4)}
+            for score, other_id, other in heapq.nlargest(k, scored)]
+
+
+def refresh_related(full: bool = False) -> int:
+    """Recompute related-article lists that may have changed (all with `full`). Returns rows written."""
+    now = timezone.now()
+    articles = _load_articles(now)
+    stored = {pk: (signature, tag_ids, category_id, items) for pk, signature, tag_ids, category_id, items
+              in RelatedArticles.objects.values_list(
+                  "article_id", "signature", "tag_ids", "category_id", "items")}
+
+    # inverted indexes over live articles only: only they can be recommended
+    by_tag, by_category = defaultdict(set), defaultdict(set)
+    for pk, article in articles.items():
+        if article["live"]:
+            for tag_id in article["tag_ids"]:
+                by_tag[tag_id].add(pk)
+            if article["category_id"]:
+                by_category[article["category_id"]].add(pk)
+
+    if full:
+        affected = set(articles)
+    else:
+        changed = {pk for pk, article in articles.items()
+                   if pk not in stored or stored[pk][0] != article["signature"]}
+        affected = set(changed)
+        for pk in changed:
+            old_tags, old_category = (stored[pk][1], stored[pk][2]) if pk in stored else ((), None)
+            for tag_id in {*articles[pk]["tag_ids"], *old_tags}:
+                affected |= by_tag.get(tag_id, set())
+            for category_id in {articles[pk]["category_id"], old_category} - {None}:
+                affected |= by_category.get(category_id, set())
+        affected |= {pk for pk, (_, _, _, items) in stored.items() if pk in articles
+                     and any(uuid.UUID(item["id"]) not in articles for item in items)}
+
+    k = settings.RECOMMENDATIONS_TOP_K
+    rows, bumped = [], []
+    for pk in affected:
+        items = _similar(pk, articles, by_tag, by_category, k)
+        article = articles[pk]
+        rows.append(RelatedArticles(
+            article_id=pk, items=items, tag_ids=article["tag_ids"],
+            category_id=article["category_id"], signature=article["signature"], computed_at=now))
+        if pk not in stored or stored[pk][3] != items:
+            bumped.append(pk)
+
+    RelatedArticles.objects.bulk_create(
+        rows,
+        batch_size=WRITE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["article"],
+        update_fields=["items", "tag_ids", "category_id", "signature", "computed_at"],
+    )
+    for pk in bumped:
+        rendering.bump("related", pk)
+    return len(rows)
+
@@ -0,0 +1,199 @@
+"""
+Rendered-HTML cache for articles and static pages.
+
+A request costs a few cache reads and no queries on a hit:
+
+  1. head     `cms:head:<kind>:<slug>`      id, updated_at, status, published_at
+  2. versions `cms:v:...`                   counters for the fragments and SEO
+  3. html     `cms:html:<kind>:<slug>:<updated_at>:<versions>`
+
+Fragments (an article's tag list and linked products) are cached on their
+own, so editing an article body re-renders it without re-querying tags or
+products. Linked products show live prices, so their fragment has a short
+TTL and is stitched into the cached article HTML on every request. Signals drop heads and bump versions (see cms/signals.py); old
+HTML entries are never read again and just expire.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from apps.catalog.models import Product, ProductVariant
+from apps.catalog.services.pricing import effective_price_subquery
+from apps.cms.models import (
+    Article, ArticleStatus, Page, PageStatus, RelatedArticles, SeoEntityType, Tag,
+)
+from apps.cms.services import seo
+
+ARTICLE = "article"
+PAGE = "page"
+SHARED = "shared"  # tags / categories / media assets: rarely edited, used everywhere
+PRODUCTS_SLOT = "<!--cms:linked-products-->"
+
+
+# ---------- Versions ----------
+
+
+def _version_key(scope, object_id=None) -> str:
+    return f"cms:v:{scope}:{object_id}" if object_id else f"cms:v:{scope}"
+
+
+def versions(*keys) -> list:
+    """Current values of version counters; a missing counter starts at a fresh value."""
+    found = cache.get_many(keys)
+    result = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        result.append(found[key])
+    return result
+
+
+def bump(scope, object_id=None):
+    cache.set(_version_key(scope, object_id), time.time_ns(), None)
+
+
+# ---------- Heads ----------
+
+
+def _head_key(kind, slug) -> str:
+    return f"cms:head:{kind}:{slug}"
+
+
+def forget_head(kind, slug):
+    cache.delete(_head_key(kind, slug))
+
+
+def _load_head(kind, slug) -> dict | None:
+    model = Article if kind == ARTICLE else Page
+    row = (model.objects.filter(slug_en=slug)
+           .values("id", "updated_at", "status", "published_at").first())
+    if row is None:
+        return None
+    cache.set(_head_key(kind, slug), row, settings.CMS_RENDER_CACHE_TIMEOUT)
+    return row
+
+
+def head(kind, slug) -> dict | None:
+    return cache.get(_head_key(kind, slug)) or _load_head(kind, slug)
+
+
+def is_live(row: dict, now=None) -> bool:
+    published = ArticleStatus.PUBLISHED  # same value for PageStatus
+    return (row["status"] == published and row["published_at"] is not None
+            and row["published_at"] <= (now or timezone.now()))
+
+
+# ---------- Fragments ----------
+
+
+def tags_fragment(article_id, tags_version, shared_version) -> str:
+    key = f"cms:frag:tags:{article_id}:{tags_version}:{shared_version}"
+    html = cache.get(key)
+    if html is None:
+        tags = Tag.objects.filter(articles__id=article_id).order_by("name_fa")
+        html = render_to_string("cms/_article_tags.html", {"tags": list(tags)})
+        cache.set(key, html, settings.CMS_RENDER_CACHE_TIMEOUT)
+    return html
+
+
+def _default_variant_price():
+    return Subquery(
+        ProductVariant.objects.filter(product_id=OuterRef("pk"), is_active=True)
+        .order_by("-is_default")
+        .annotate(price=effective_price_subquery())
+        .values("price")[:1]
+    )
+
+
+def products_fragment(article_id, products_version) -> str:
+    """Linked products with their current price; short TTL because prices move on their own."""
+    key = f"cms:frag:products:{article_id}:{products_version}"
+    html = cache.get(key)
+    if html is None:
+        products = (Product.objects
+                    .filter(mentioned_in_articles__article_id=article_id, is_active=True)
+                    .select_related("cover_image")
+                    .prefetch_related("cover_image__derivatives")
+                    .annotate(price_toman=_default_variant_price())
+                    .order_by("name_fa"))
+        html = render_to_string("cms/_article_products.html", {"products": list(products)})
+        cache.set(key, html, settings.CMS_FRAGMENT_CACHE_TIMEOUT)
+    return html
+
+
+# ---------- Pages ----------
+
+
+def render_article(slug, row=None) -> str | None:
+    """Rendered HTML of an article (live or not), from cache when possible."""
+    row = row or head(ARTICLE, slug)
+    if row is None:
+        return None
+    tags_v, products_v, seo_v, related_v, shared_v = versions(
+        _version_key("tags", row["id"]), _version_key("products", row["id"]),
+        _version_key("seo", row["id"]), _version_key("related", row["id"]),
+        _version_key(SHARED))
+    key = (f"cms:html:{ARTICLE}:{slug}:{row['updated_at'].timestamp()}"
+           f":{tags_v}:{seo_v}:{related_v}:{shared_v}")
+    html = cache.get(key)
+    if html is None:
+        article = (Article.objects.select_related("category", "cover_image", "author__profile")
+                   .prefetch_related("cover_image__derivatives")
+                   .get(pk=row["id"]))
+        html = render_to_string("cms/article_detail.html", {
+            "article": article,
+            "seo": seo.resolve_one(SeoEntityType.ARTICLE, article.pk, title=article.title_fa,
+                                   description=article.excerpt_fa,
+                                   image_url=article.cover_image.url if article.cover_image else ""),
+            "tags_html": tags_fragment(article.pk, tags_v, shared_v),
+            # precomputed by services/related.py; bumps the "related" version
+            "related": RelatedArticles.objects.filter(pk=article.pk)
+                                              .values_list("items", flat=True).first() or [],
+            "products_slot": PRODUCTS_SLOT,
+        })
+        cache.set(key, html, settings.CMS_RENDER_CACHE_TIMEOUT)
+    return html.replace(PRODUCTS_SLOT, products_fragment(row["id"], products_v), 1)
+
+
+def render_page(slug, row=None) -> str | None:
+    row = row or head(PAGE, slug)
+    if row is None:
+        return None
+    seo_v, shared_v = versions(_version_key("seo", row["id"]), _version_key(SHARED))
+    key = f"cms:html:{PAGE}:{slug}:{row['updated_at'].timestamp()}:{seo_v}:{shared_v}"
+    html = cache.get(key)
+    if html is None:
+        page = Page.objects.get(pk=row["id"])
+        html = render_to_string("cms/page_detail.html", {
+            "page": page,
+            "seo": seo.resolve_one(SeoEntityType.PAGE, page.pk, title=page.title_fa),
+        })
+        cache.set(key, html, settings.CMS_RENDER_CACHE_TIMEOUT)
+    return html
+
+
+RENDERERS = {ARTICLE: render_article, PAGE: render_page}
+
+
+def warm_scheduled(ahead_minutes: int = 60) -> dict:
+    """
+    Render articles / pages that go live within `ahead_minutes`, so a
+    scheduled release is served from a warm cache.
+    """
+    now = timezone.now()
+    until = now + timedelta(minutes=ahead_minutes)
+    warmed = {}
+    for kind, model, status in ((ARTICLE, Article, ArticleStatus.PUBLISHED),
+                                (PAGE, Page, PageStatus.PUBLISHED)):
+        slugs = list(model.objects.filter(status=status, published_at__gt=now,
+                                          published_at__lte=until).values_list("slug_en", flat=True))
+        for slug in slugs:
+            RENDERERS[kind](slug, _load_head(kind, slug))
+        warmed[kind] = len(slugs)
+    return warmed
@@ -0,0 +1,125 @@
+"""
+Batch SEO resolution: SeoMeta overrides layered over SiteSeoDefault.
+
+`resolve()` takes many (entity_type, entity_id) pairs and loads the SeoMeta
+rows it hasn't seen yet in a single query (og_image joined). Rows — and the
+absence of a row, which is the common case — are kept in a per-process
+dict. Writes to SeoMeta / SiteSeoDefault / MediaAsset bump a generation
+number in the shared cache; every process compares it once per call and
+drops its dict when it moved.
+"""
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.catalog.models import MediaAsset
+from apps.cms.models import SeoMeta, SiteSeoDefault
+
+GENERATION_KEY = "cms:seo:generation"
+META_FIELDS = ("meta_title_fa", "meta_description_fa", "meta_robots", "canonical_url",
+               "og_title_fa", "og_description_fa", "og_image__file_path")
+SITE_KEY = ("site", None)
+
+
+@dataclass(frozen=True)
+class SeoBlock:
+    title: str
+    description: str
+    robots: str
+    canonical: str
+    og_title: str
+    og_description: str
+    og_image: str  # URL or ""
+
+
+_lock = threading.Lock()
+_local = {"generation": None, "rows": {}}
+
+
+def invalidate():
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def _rows() -> dict:
+    """The per-process row dict for the current generation."""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    with _lock:
+        if (_local["generation"] != generation
+                or len(_local["rows"]) > settings.CMS_SEO_LOCAL_CACHE_SIZE):
+            _local["generation"], _local["rows"] = generation, {}
+        return _local["rows"]
+
+
+def _image_url(file_path) -> str:
+    return MediaAsset(file_path=file_path).url if file_path else ""
+
+
+def _load(rows: dict, pairs: set):
+    missing = [p for p in pairs if p not in rows]
+    site_missing = SITE_KEY not in rows
+    if missing:
+        by_type = {}
+        for entity_type, entity_id in missing:
+            by_type.setdefault(entity_type, []).append(entity_id)
+        condition = Q()
+        for entity_type, ids in by_type.items():
+            condition |= Q(entity_type=entity_type, entity_id__in=ids)
+        found = {(r["entity_type"], r["entity_id"]): r for r in
+                 SeoMeta.objects.filter(condition).values("entity_type", "entity_id", *META_FIELDS)}
+        for pair in missing:
+            rows[pair] = found.get(pair)  # None = no override
+    if site_missing:
+        rows[SITE_KEY] = (SiteSeoDefault.objects
+                          .values("meta_title_suffix_fa", "default_meta_description_fa",
+                                  "default_og_image__file_path").first())
+
+
+def merge(row: dict | None, site: dict | None, title="", description="", image_url="") -> SeoBlock:
+    """Entity override > entity's own fields (`title`, ...) > site defaults."""
+    row = row or {}
+    site = site or {}
+    description = (row.get("meta_description_fa") or description
+                   or site.get("default_meta_description_fa") or "")
+    return SeoBlock(
+        title=row.get("meta_title_fa") or f"{title}{site.get('meta_title_suffix_fa') or ''}",
+        description=description,
+        robots=row.get("meta_robots") or "",
+        canonical=row.get("canonical_url") or "",
+        og_title=row.get("og_title_fa") or title,
+        og_description=row.get("og_description_fa") or description,
+        og_image=(_image_url(row.get("og_image__file_path")) or image_url
+                  or _image_url(site.get("default_og_image__file_path"))),
+    )
+
+
+def _key(entity_type, entity_id) -> tuple:
+    return str(entity_type), uuid.UUID(str(entity_id))
+
+
+def resolve(pairs, fallbacks: dict | None = None) -> dict:
+    """
+    {(entity_type, entity_id): SeoBlock} for every pair. `fallbacks` maps a
+    pair to the entity's own {"title", "description", "image_url"}, used
+    where SeoMeta leaves a field empty. At most one query for unseen pairs
+    plus one for the site defaults after an invalidation.
+    """
+    pairs = {_key(*pair) for pair in pairs}
+    fallbacks = {_key(*pair): values for pair, values in (fallbacks or {}).items()}
+    rows = _rows()
+    if any(p not in rows for p in pairs) or SITE_KEY not in rows:
+        _load(rows, pairs)
+    site = rows[SITE_KEY]
+    return {pair: merge(rows[pair], site, **fallbacks.get(pair, {})) for pair in pairs}
+
+
+def resolve_one(entity_type, entity_id, **fallback) -> SeoBlock:
+    pair = _key(entity_type, entity_id)
+    return resolve([pair], {pair: fallback})[pair]
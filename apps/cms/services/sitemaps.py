@@ -0,0 +1,174 @@
+"""
+Static sitemaps for products, categories, articles and pages.
+
+Each section is streamed with `.values_list().iterator()` in (created_at, pk)
+order, so new rows land in the last shard and older shards keep their
+boundaries. Every shard of up to 50,000 URLs gets a digest of its
+(pk, updated_at, loc) rows; a shard is only re-gzipped and rewritten when
+its digest differs from the manifest of the previous run. Canonical URLs
+come from SeoMeta, and entities marked `noindex` are left out. Products and
+categories have no routes here; they are only listed once
+SITEMAP_PRODUCT_PATH / SITEMAP_CATEGORY_PATH point at the storefront's pages.
+
+Files are written into SITEMAP_DIR and served from the site root
+(`/sitemap.xml`, `/sitemap-<section>-<n>.xml.gz`) by the cms sitemap view,
+which only hands out the index and the shards listed in the manifest, so a
+rebuild is live on every worker as soon as it finishes.
+"""
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import timezone as dt_timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from apps.catalog.models import Category, Product
+from apps.cms.models import Article, ArticleStatus, Page, PageStatus, SeoEntityType, SeoMeta
+
+URLS_PER_SHARD = 50_000
+FETCH_CHUNK = 5_000
+INDEX_FILE = "sitemap.xml"
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    model: type
+    entity_type: str
+    path: str  # relative to SITE_URL, formatted with the slug
+
+    def queryset(self):
+        if self.model is Article:
+            return Article.objects.filter(status=ArticleStatus.PUBLISHED,
+                                          published_at__lte=timezone.now())
+        if self.model is Page:
+            return Page.objects.filter(status=PageStatus.PUBLISHED,
+                                       published_at__lte=timezone.now())
+        return self.model.objects.filter(is_active=True)
+
+    def rows(self):
+        """(pk, slug, updated_at, canonical_url, robots) in shard order."""
+        seo = SeoMeta.objects.filter(entity_type=self.entity_type, entity_id=OuterRef("pk"))
+        return (self.queryset()
+                .annotate(canonical=Subquery(seo.values("canonical_url")[:1]),
+                          robots=Subquery(seo.values("meta_robots")[:1]))
+                .order_by("created_at", "pk")
+                .values_list("pk", "slug_en", "updated_at", "canonical", "robots")
+                .iterator(chunk_size=FETCH_CHUNK))
+
+
+def sections() -> list[Section]:
+    """The sections with a URL pattern (shards of dropped ones are removed on the next build)."""
+    candidates = (
+        Section("products", Product, SeoEntityType.PRODUCT, settings.SITEMAP_PRODUCT_PATH),
+        Section("categories", Category, SeoEntityType.CATEGORY, settings.SITEMAP_CATEGORY_PATH),
+        Section("articles", Article, SeoEntityType.ARTICLE, "/blog/{slug}/"),
+        Section("pages", Page, SeoEntityType.PAGE, "/pages/{slug}/"),
+    )
+    return [section for section in candidates if section.path]
+
+
+def _lastmod(value) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class _Shard:
+    def __init__(self, name: str):
+        self.name = name
+        self.digest = hashlib.blake2b(digest_size=16)
+        self.entries = []
+        self.lastmod = None
+
+    def add(self, pk, loc: str, updated_at):
+        self.digest.update(f"{pk}|{updated_at.isoformat()}|{loc}\n".encode())
+        self.entries.append(f"<url><loc>{escape(loc)}</loc>"
+                            f"<lastmod>{_lastmod(updated_at)}</lastmod></url>")
+        self.lastmod = max(self.lastmod or updated_at, updated_at)
+
+    def render(self) -> bytes:
+        xml = (f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">\n'
+               + "\n".join(self.entries) + "\n</urlset>\n")
+        return gzip.compress(xml.encode(), mtime=0)
+
+
+def _shards(section: Section, site_url: str, urls_per_shard: int):
+    shard = _Shard(f"sitemap-{section.name}-1.xml.gz")
+    number = 1
+    for pk, slug, updated_at, canonical, robots in section.rows():
+        if robots and "noindex" in robots.lower():
+            continue
+        if len(shard.entries) == urls_per_shard:
+            yield shard
+            number += 1
+            shard = _Shard(f"sitemap-{section.name}-{number}.xml.gz")
+        shard.add(pk, canonical or site_url + section.path.format(slug=slug), updated_at)
+    if shard.entries:
+        yield shard
+
+
+def read_manifest(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def served_path(name: str) -> Path | None:
+    """The file behind `/<name>` if the last build produced it, else None."""
+    if name != INDEX_FILE and name not in read_manifest(Path(settings.SITEMAP_MANIFEST)):
+        return None
+    path = Path(settings.SITEMAP_DIR) / name
+    return path if path.exists() else None
+
+
+def build_sitemaps(out_dir=None, manifest_path=None, site_url=None, force: bool = False,
+                   urls_per_shard: int = URLS_PER_SHARD) -> dict:
+    """
+    (Re)build the sitemap shards and index. Returns
+    {"urls", "shards", "written": [names], "removed": [names]}.
+    """
+    out_dir = Path(out_dir or settings.SITEMAP_DIR)
+    manifest_path = Path(manifest_path or settings.SITEMAP_MANIFEST)
+    site_url = (site_url or settings.SITE_URL).rstrip("/")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(manifest_path)
+
+    manifest, written, urls = {}, [], 0
+    for section in sections():
+        for shard in _shards(section, site_url, urls_per_shard):
+            digest = shard.digest.hexdigest()
+            urls += len(shard.entries)
+            manifest[shard.name] = {"digest": digest, "count": len(shard.entries),
+                                    "lastmod": _lastmod(shard.lastmod)}
+            unchanged = (previous.get(shard.name, {}).get("digest") == digest
+                         and (out_dir / shard.name).exists())
+            if force or not unchanged:
+                _write_atomic(out_dir / shard.name, shard.render())
+                written.append(shard.name)
+
+    removed = sorted(set(previous) - set(manifest))
+    for name in removed:
+        (out_dir / name).unlink(missing_ok=True)
+
+    if written or removed or not (out_dir / INDEX_FILE).exists():
+        entries = "\n".join(
+            f"<sitemap><loc>{escape(f'{site_url}/{name}')}</loc>"
+            f"<lastmod>{meta['lastmod']}</lastmod></sitemap>"
+            for name, meta in manifest.items())
+        _write_atomic(out_dir / INDEX_FILE, (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">\n'
+            f"{entries}\n</sitemapindex>\n").encode())
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+    return {"urls": urls, "shards": len(manifest), "written": written, "removed": removed}
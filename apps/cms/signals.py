@@ -0,0 +1,82 @@
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.catalog.models import MediaAsset, Product
+from apps.catalog.signals import products_changed
+from apps.cms.models import (
+    Article, ArticleCategory, ArticleProduct, Page, SeoMeta, SiteSeoDefault, Tag,
+)
+from apps.cms.services import rendering, seo
+
+KINDS = {Article: rendering.ARTICLE, Page: rendering.PAGE}
+
+
+@receiver(post_init, sender=Article)
+@receiver(post_init, sender=Page)
+def remember_slug(sender, instance, **kwargs):
+    instance._loaded_slug = instance.__dict__.get("slug_en")
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Page)
+def forget_rendered_head(sender, instance, **kwargs):
+    for slug in {instance._loaded_slug, instance.slug_en} - {None}:
+        rendering.forget_head(KINDS[sender], slug)
+    instance._loaded_slug = instance.slug_en
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def bump_article_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        rendering.bump("tags", instance.pk)
+    elif pk_set:  # tag.articles.add(...): pk_set holds article ids
+        for article_id in pk_set:
+            rendering.bump("tags", article_id)
+    else:  # tag.articles.clear()
+        rendering.bump(rendering.SHARED)
+
+
+@receiver(post_save, sender=ArticleProduct)
+@receiver(post_delete, sender=ArticleProduct)
+def bump_article_products(sender, instance, **kwargs):
+    rendering.bump("products", instance.article_id)
+
+
+@receiver(post_save, sender=Product)
+def bump_articles_of_product(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for article_id in ArticleProduct.objects.filter(product=instance).values_list("article_id", flat=True):
+        rendering.bump("products", article_id)
+
+
+@receiver(products_changed)
+def bump_articles_of_products(sender, product_ids, **kwargs):
+    for article_id in set(ArticleProduct.objects.filter(product_id__in=product_ids)
+                          .values_list("article_id", flat=True)):
+        rendering.bump("products", article_id)
+
+
+@receiver(post_save, sender=SeoMeta)
+@receiver(post_delete, sender=SeoMeta)
+def bump_seo(sender, instance, **kwargs):
+    rendering.bump("seo", instance.entity_id)
+    seo.invalidate()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=ArticleCategory)
+@receiver(post_delete, sender=ArticleCategory)
+@receiver(post_save, sender=MediaAsset)
+@receiver(post_delete, sender=MediaAsset)
+@receiver(post_save, sender=SiteSeoDefault)
+@receiver(post_delete, sender=SiteSeoDefault)
+def bump_shared(sender, **kwargs):
+    rendering.bump(rendering.SHARED)
+    if sender in (MediaAsset, SiteSeoDefault):
+        seo.invalidate()
@@ -0,0 +1,9 @@
+from django.urls import path, re_path
+from .views import article_detail, page_detail, sitemap
+
+urlpatterns = [
+    path("blog/<slug:slug>/", article_detail, name="article-detail"),
+    path("pages/<slug:slug>/", page_detail, name="page-detail"),
+    path("sitemap.xml", sitemap, name="sitemap-index"),
+    re_path(r"^(?P<name>sitemap-[a-z]+-\d+\.xml\.gz)$", sitemap, name="sitemap-shard"),
+]
@@ -1,3 +1,51 @@
-from django.shortcuts import render
+import uuid
+from datetime import datetime, timezone as dt_timezone
 
-# Create your views here.
+from django.http import FileResponse, Http404, HttpResponse
+from django.views.decorators.http import condition
+
+from apps.analytics.services.tracking import track
+from apps.cms.services import rendering, sitemaps
+
+ANONYMOUS_ID_COOKIE = "anonymous_id"
+
+
+def _anonymous_id(request):
+    try:
+        return uuid.UUID(request.COOKIES.get(ANONYMOUS_ID_COOKIE, ""))
+    except ValueError:
+        return None
+
+
+def _live_html(kind, slug):
+    row = rendering.head(kind, slug)
+    if row is None or not rendering.is_live(row):
+        raise Http404
+    return row, rendering.RENDERERS[kind](slug, row)
+
+
+def article_detail(request, slug):
+    row, html = _live_html(rendering.ARTICLE, slug)
+    track("Article Viewed", user=request.user, anonymous_id=_anonymous_id(request),
+          properties={"article_id": str(row["id"]), "slug": slug})
+    return HttpResponse(html)
+
+
+def page_detail(request, slug):
+    _, html = _live_html(rendering.PAGE, slug)
+    return HttpResponse(html)
+
+
+def _sitemap_modified(request, name=sitemaps.INDEX_FILE):
+    path = sitemaps.served_path(name)
+    return path and datetime.fromtimestamp(path.stat().st_mtime, tz=dt_timezone.utc)
+
+
+@condition(last_modified_func=_sitemap_modified)
+def sitemap(request, name=sitemaps.INDEX_FILE):
+    # unchanged shards are not rewritten, so their mtime doubles as Last-Modified
+    path = sitemaps.served_path(name)
+    if path is None:
+        raise Http404
+    content_type = "application/xml" if name == sitemaps.INDEX_FILE else "application/gzip"
+    return FileResponse(path.open("rb"), content_type=content_type)
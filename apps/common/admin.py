@@ -1,4 +1,42 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+
+from .pagination import EstimatedCountPaginator
+
 admin.site.site_header = "پنل مدیریت دانیدور"
 admin.site.site_title = "مدیریت دانیدور"
 admin.site.index_title = "خوش آمدید"
+
+# ?_exact=1 on a changelist asks for a real COUNT(*) instead of the estimate
+EXACT_COUNT_VAR = "_exact"
+
+
+class EstimatedCountChangeList(ChangeList):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_is_estimate = getattr(self.result_count, "is_estimate", False)
+        self.exact_count_url = self.get_query_string({EXACT_COUNT_VAR: 1})
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(EXACT_COUNT_VAR, None)
+        return lookup_params
+
+
+class EstimatedCountAdminMixin:
+    """
+    For changelists over very large tables: planner-estimated page counts,
+    no unfiltered second count and no filter facets (each is another scan).
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    change_list_template = "admin/estimated_count_change_list.html"
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginator = Paginator if EXACT_COUNT_VAR in request.GET else self.paginator
+        return paginator(queryset, per_page, orphans, allow_empty_first_page)
@@ -0,0 +1,122 @@
+"""
+Admin bulk actions run as set-based jobs.
+
+An action hands `run()` its selection and an `apply(ids)` function that
+changes one chunk of primary keys with a few set-based statements (UPDATE
+... WHERE pk IN (...), bulk_create) and returns how many rows it changed.
+Every chunk commits on its own transaction. queryset.update() skips
+save() and its signals, so `apply` also fires whatever cache invalidation
+or signal a per-row save would have.
+
+Selections up to ADMIN_BULK_SYNC_LIMIT rows run inside the request. Larger
+ones run in a background thread of the web process. The thread saves its
+progress in the cache under the job id, and staff can poll it as JSON at
+`admin-bulk-job`; the poll may land on any worker, so the cache has to be
+shared (`check --deploy`, common.E001). Every save is a heartbeat: a job
+whose worker died (recycled, killed) stops beating and is reported as
+failed after ADMIN_BULK_STALE_AFTER seconds instead of running forever.
+"""
+import logging
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+logger = logging.getLogger(__name__)
+
+RUNNING, DONE, FAILED = "running", "done", "failed"
+
+
+@dataclass
+class JobState:
+    id: str
+    label: str
+    total: int
+    processed: int = 0
+    changed: int = 0
+    status: str = RUNNING
+    error: str = ""
+    started_at: str = ""
+    finished_at: str = ""
+    heartbeat_at: str = ""
+
+
+def _key(job_id: str) -> str:
+    return f"admin:bulk:{job_id}"
+
+
+def _save(state: JobState):
+    state.heartbeat_at = timezone.now().isoformat()
+    cache.set(_key(state.id), asdict(state), settings.ADMIN_BULK_PROGRESS_TIMEOUT)
+
+
+def get_state(job_id: str) -> dict | None:
+    state = cache.get(_key(job_id))
+    if state and state["status"] == RUNNING:
+        silent = timezone.now() - datetime.fromisoformat(state["heartbeat_at"])
+        if silent.total_seconds() > settings.ADMIN_BULK_STALE_AFTER:
+            state.update(status=FAILED, error="worker stopped before the job finished")
+    return state
+
+
+def execute(state: JobState, ids: list, apply) -> JobState:
+    """Apply `apply` chunk by chunk and record the progress after each commit."""
+    size = settings.ADMIN_BULK_CHUNK_SIZE
+    try:
+        for start in range(0, len(ids), size):
+            chunk = ids[start:start + size]
+            with transaction.atomic():
+                state.changed += apply(chunk)
+            state.processed += len(chunk)
+            _save(state)
+        state.status = DONE
+    except Exception as exc:  # already-committed chunks stay applied
+        logger.exception("Bulk job %s (%s) failed", state.id, state.label)
+        state.status, state.error = FAILED, str(exc)
+    state.finished_at = timezone.now().isoformat()
+    _save(state)
+    return state
+
+
+def _execute_in_thread(state: JobState, ids: list, apply):
+    try:
+        execute(state, ids, apply)
+    finally:
+        close_old_connections()  # the thread's own connection
+
+
+def run(modeladmin, request, queryset, label, apply) -> JobState:
+    """Run `apply` over the selected rows, in the background for large selections."""
+    ids = list(queryset.order_by().values_list("pk", flat=True))
+    state = JobState(id=uuid.uuid4().hex, label=str(label), total=len(ids),
+                     started_at=timezone.now().isoformat())
+    if len(ids) <= settings.ADMIN_BULK_SYNC_LIMIT:
+        execute(state, ids, apply)
+        if state.status == DONE:
+            modeladmin.message_user(
+                request, f"{state.label}: {state.changed} از {state.total} مورد تغییر کرد.",
+                messages.SUCCESS)
+        else:
+            modeladmin.message_user(
+                request, f"{state.label}: پس از {state.processed} مورد متوقف شد ({state.error})",
+                messages.ERROR)
+        return state
+
+    _save(state)
+    threading.Thread(target=_execute_in_thread, args=(state, ids, apply),
+                     name=f"admin-bulk-{state.id}", daemon=True).start()
+    url = reverse("admin-bulk-job", args=[state.id])
+    modeladmin.message_user(
+        request,
+        format_html('{}: {} مورد در پس‌زمینه پردازش می‌شود. <a href="{}">پیشرفت کار</a>',
+                    state.label, state.total, url),
+        messages.INFO)
+    return state
@@ -0,0 +1,33 @@
+"""
+Deployment checks (`manage.py check --deploy`) on state that every worker
+process has to share, and the helper other apps' checks use.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# backends whose entries live inside one worker process (or nowhere)
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def cache_is_shared(alias: str = "default") -> bool:
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+def require_shared_cache(what: str, check_id: str) -> list:
+    """An Error unless the default cache is shared by all workers."""
+    if cache_is_shared():
+        return []
+    return [Error(
+        f"{what} are kept in a per-process cache: each worker only sees its own.",
+        hint="Set CACHE_URL to a cache every worker shares (e.g. redis://...).",
+        id=check_id,
+    )]
+
+
+@register(Tags.security, deploy=True)
+def check_bulk_progress_cache(app_configs, **kwargs):
+    # progress is polled through whichever worker takes the request
+    return require_shared_cache("Admin bulk-job progress entries", "common.E001")
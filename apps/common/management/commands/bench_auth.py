@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User
+
+BACKENDS = {
+    "model": "django.contrib.auth.backends.ModelBackend",
+    "phone": "apps.accounts.backends.PhoneNumberBackend",
+}
+BENCH_PHONE = "+989129999999"
+BENCH_LOGIN = "09129999999"  # as typed by users: local format
+BENCH_PASSWORD = "bench-password-123"
+# a private cache, so nothing the run does can touch the shared one (token
+# revocations, rate-limit windows, bulk-job progress, CMS renders)
+BENCH_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                            "LOCATION": "bench-auth"}}
+
+
+class Command(BaseCommand):
+    help = "Times phone/password authentication + JWT issuance with ModelBackend vs PhoneNumberBackend."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--fast-hasher", action="store_true",
+                            help="Use MD5 hashing so the lookup path isn't hidden behind PBKDF2")
+
+    def handle(self, *args, **opts):
+        hashers = {"PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"]} \
+            if opts["fast_hasher"] else {}
+        with override_settings(CACHES=BENCH_CACHES, **hashers), transaction.atomic():
+            User.objects.filter(phone_number=BENCH_PHONE).delete()
+            User.objects.create_user(BENCH_PHONE, password=BENCH_PASSWORD)
+            for label, backend in BACKENDS.items():
+                with override_settings(AUTHENTICATION_BACKENDS=[backend]):
+                    self._run(label, opts["iterations"])
+            transaction.set_rollback(True)
+
+    def _run(self, label, iterations):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                user = authenticate(None, phone_number=BENCH_LOGIN, password=BENCH_PASSWORD)
+                str(RefreshToken.for_user(user).access_token)
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {label:<6} mean {statistics.mean(timings):.3f} ms  p50 {statistics.median(timings):.3f} ms  "
+            f"p95 {p95:.3f} ms  {len(queries) / iterations:.2f} queries/login"))
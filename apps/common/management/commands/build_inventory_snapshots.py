@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.analytics.services.snapshots import (
+    backfill_inventory_snapshots, build_inventory_snapshots,
+)
+
+
+class Command(BaseCommand):
+    help = "Builds DailyInventorySnapshot (stock value, sell-through) for a day or a backfill range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="YYYY-MM-DD (default: yesterday)")
+        parser.add_argument("--start", help="Backfill from YYYY-MM-DD (inclusive)")
+        parser.add_argument("--end", help="Backfill until YYYY-MM-DD (inclusive, default: yesterday)")
+        parser.add_argument("--workers", type=int, default=4)
+
+    def _date(self, value, name):
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"--{name} must be YYYY-MM-DD")
+        return day
+
+    def handle(self, *args, **opts):
+        yesterday = timezone.localdate() - timedelta(days=1)
+
+        if opts["start"]:
+            first = self._date(opts["start"], "start")
+            last = self._date(opts["end"], "end") if opts["end"] else yesterday
+            if first > last:
+                raise CommandError("--start is after --end")
+            results = backfill_inventory_snapshots(first, last, workers=opts["workers"])
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ DailyInventorySnapshot {first} → {last}: {len(results)} days, "
+                f"{sum(results.values())} rows"))
+            return
+
+        day = self._date(opts["date"], "date") if opts["date"] else yesterday
+        written = build_inventory_snapshots(day)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ DailyInventorySnapshot {day}: {written} variants"))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.catalog.services.images import build_derivatives
+
+
+class Command(BaseCommand):
+    help = "Encodes resized AVIF / WebP derivatives of media assets in a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--asset", action="append", help="Repeatable asset id; default: assets without derivatives.")
+        parser.add_argument("--force", action="store_true", help="Regenerate every asset (e.g. after changing widths).")
+        parser.add_argument("--workers", type=int, default=settings.MEDIA_DERIVATIVE_WORKERS)
+
+    def handle(self, *args, **opts):
+        try:
+            stats = build_derivatives(opts["asset"], force=opts["force"], workers=opts["workers"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        for asset_id, reason in stats.skipped:
+            self.stdout.write(self.style.WARNING(f"⚠️ {asset_id}: {reason}"))
+        saved = stats.bytes_before - stats.bytes_after
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stats.derivatives} derivatives for {stats.assets} assets "
+            f"({stats.bytes_before // 1024} KB of originals → {stats.bytes_after // 1024} KB "
+            f"at full width, {saved // 1024} KB saved)"))
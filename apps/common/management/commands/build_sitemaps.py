@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.cms.services.sitemaps import URLS_PER_SHARD, build_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Writes gzipped sitemap shards + sitemap.xml into SITEMAP_DIR (served at /sitemap.xml); only changed shards are rewritten."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", default=settings.SITEMAP_DIR)
+        parser.add_argument("--force", action="store_true", help="Rewrite every shard.")
+        parser.add_argument("--urls-per-shard", type=int, default=URLS_PER_SHARD)
+
+    def handle(self, *args, **opts):
+        result = build_sitemaps(opts["out"], force=opts["force"],
+                                urls_per_shard=opts["urls_per_shard"])
+        for name in result["removed"]:
+            self.stdout.write(self.style.WARNING(f"⚠️ Removed stale shard {name}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {result['urls']} URLs in {result['shards']} shards "
+            f"({len(result['written'])} rewritten)"))
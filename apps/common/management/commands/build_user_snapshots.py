@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.analytics.services.snapshots import build_user_snapshots
+
+
+class Command(BaseCommand):
+    help = "Builds DailyUserSnapshot (totals, RFM, churn) for a day from the previous day + that day's orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="YYYY-MM-DD (default: yesterday)")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Aggregate full order history instead of the previous snapshot.")
+
+    def handle(self, *args, **opts):
+        day = timezone.localdate() - timedelta(days=1)
+        if opts["date"]:
+            day = parse_date(opts["date"])
+            if day is None:
+                raise CommandError("--date must be YYYY-MM-DD")
+
+        written = build_user_snapshots(day, rebuild=opts["rebuild"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ DailyUserSnapshot {day}: {written} users"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.media_store import dedupe
+
+
+class Command(BaseCommand):
+    help = "Hashes media assets stored without a content hash and merges identical files into one asset."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        stats = dedupe(dry_run=opts["dry_run"])
+        for asset_id in stats.missing:
+            self.stdout.write(self.style.WARNING(f"⚠️ {asset_id}: file not in storage"))
+        for asset_id in stats.embedded:
+            self.stdout.write(self.style.WARNING(f"⚠️ {asset_id}: duplicate kept, embedded in CMS rich text"))
+        prefix = "[dry-run] " if opts["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {prefix}{stats.hashed} assets hashed, {stats.merged} duplicates merged, "
+            f"{len(stats.deleted_files)} files removed"))
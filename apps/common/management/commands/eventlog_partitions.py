@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.services.partitions import ensure_partitions, is_partitioned, list_partitions
+
+
+class Command(BaseCommand):
+    help = "Creates upcoming monthly EventLog partitions (PostgreSQL). Safe to run daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING(
+                "⚠️ EventLog is not partitioned on this database; nothing to do."))
+            return
+
+        created = ensure_partitions(months_ahead=opts["months_ahead"])
+        for name in created:
+            self.stdout.write(f"created {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(created)} partition(s) created, {len(list_partitions())} total"))
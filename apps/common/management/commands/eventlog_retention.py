@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.analytics.services.partitions import apply_retention, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = "Archives EventLog months past retention to .csv.gz and drops their partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-months", type=int,
+                            default=settings.ANALYTICS_EVENTLOG_RETENTION_MONTHS)
+        parser.add_argument("--archive-dir", default=settings.ANALYTICS_ARCHIVE_DIR)
+        parser.add_argument("--no-archive", action="store_true",
+                            help="Drop expired months without writing an archive.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        archive_dir = None if opts["no_archive"] else opts["archive_dir"]
+        report = apply_retention(
+            opts["keep_months"], archive_dir=archive_dir, dry_run=opts["dry_run"])
+
+        for entry in report:
+            target = entry["partition"] or "rows"
+            suffix = f" → {entry['archive']}" if entry["archive"] else ""
+            self.stdout.write(f"{entry['month']:%Y-%m}: {target}{suffix}")
+
+        if not opts["dry_run"]:
+            ensure_partitions()
+        verb = "would expire" if opts["dry_run"] else "expired"
+        self.stdout.write(self.style.SUCCESS(f"✅ {verb} {len(report)} month(s)"))
@@ -0,0 +1,42 @@
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.services.fake_vendors import FakeVendorServer
+from apps.analytics.services.forwarder import VENDORS, forward_all
+
+
+class Command(BaseCommand):
+    help = "Forwards unsent EventLog rows to GA4 / Mixpanel and marks them as sent."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vendor", action="append", choices=sorted(VENDORS),
+                            help="Repeatable. Defaults to every configured vendor.")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--max-batches", type=int)
+        parser.add_argument("--concurrency", type=int)
+        parser.add_argument("--fake", action="store_true",
+                            help="Post to a local fake endpoint instead of the vendors "
+                                 "(events are not marked as sent).")
+
+    def handle(self, *args, **opts):
+        vendors = opts["vendor"]
+        if opts["fake"] and not vendors:
+            vendors = sorted(VENDORS)
+        if not vendors and not any(cls().is_configured() for cls in VENDORS.values()):
+            raise CommandError("No vendor configured (see ANALYTICS_GA4_* / ANALYTICS_MIXPANEL_*).")
+
+        with (FakeVendorServer() if opts["fake"] else nullcontext()) as fake:
+            stats = forward_all(
+                vendors,
+                batch_size=opts["batch_size"],
+                max_batches=opts["max_batches"],
+                concurrency=opts["concurrency"],
+                endpoints=fake.endpoints() if fake else {},
+            )
+
+        for s in stats:
+            if s.failed_events:
+                self.stdout.write(self.style.WARNING(f"⚠️ {s}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✅ {s}"))
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.media_store import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Deletes media assets nothing references and stored objects no asset points to."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-hours", type=int, default=24,
+                            help="Keep anything newer than this (default 24), e.g. uploads not attached yet.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        stats = collect_garbage(timedelta(hours=opts["grace_hours"]), dry_run=opts["dry_run"])
+        prefix = "[dry-run] " if opts["dry_run"] else ""
+        for name in stats.deleted_files:
+            self.stdout.write(f"{prefix}delete {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {prefix}{stats.deleted_assets} orphan assets, {len(stats.deleted_files)} files"))
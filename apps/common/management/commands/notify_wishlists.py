@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.services.wishlist_alerts import notify_wishlists
+
+
+class Command(BaseCommand):
+    help = "Queues back-in-stock / price-drop SMS for wishlisted variants that changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count the alerts without queueing them or saving the new state")
+
+    def handle(self, *args, **opts):
+        stats = notify_wishlists(dry_run=opts["dry_run"])
+        for kind, variants in stats.changed.items():
+            self.stdout.write(f"{kind}: {variants} variants → {stats.messages[kind]} messages")
+        prefix = "⚠️ Dry run — nothing queued" if opts["dry_run"] else "✅ Wishlist alerts queued"
+        style = self.style.WARNING if opts["dry_run"] else self.style.SUCCESS
+        self.stdout.write(style(f"{prefix} ({stats.variants} wishlisted variants checked)"))
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.services.otp import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Deletes OTP codes that expired more than --grace-hours ago, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--grace-hours", type=int, default=24)
+
+    def handle(self, *args, **opts):
+        deleted = purge_expired(batch_size=opts["batch_size"],
+                                grace=timedelta(hours=opts["grace_hours"]))
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {deleted} expired OTP codes"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.analytics.services.attribution import rebuild, resume_date
+
+
+class Command(BaseCommand):
+    help = "Credits paid orders to the last article viewed before them, per local day."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="YYYY-MM-DD (local date); default: resume from the last rolled-up day")
+        parser.add_argument("--until", help="YYYY-MM-DD (local date, inclusive); default: today")
+
+    def handle(self, *args, **opts):
+        since = parse_date(opts["since"]) if opts["since"] else resume_date()
+        until = parse_date(opts["until"]) if opts["until"] else None
+        if since is None or (opts["until"] and until is None):
+            raise CommandError("--since / --until must be YYYY-MM-DD")
+        orders = rebuild(since, until)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Article attribution rebuilt since {since}: {orders} orders attributed"))
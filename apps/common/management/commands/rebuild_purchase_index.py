@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.services.purchase_index import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recomputes the (user, product) purchase index from purchased orders."
+
+    def handle(self, *args, **opts):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"✅ Purchase index rebuilt: {rows} rows"))
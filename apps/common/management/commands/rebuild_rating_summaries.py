@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.services.ratings import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recomputes ProductRatingSummary (count, sum, histogram, average) from approved reviews."
+
+    def handle(self, *args, **opts):
+        products = rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rating summaries rebuilt for {products} products"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.analytics.services.sales import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recomputes the hourly / daily sales rollups from orders paid since a date."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", required=True, help="YYYY-MM-DD (local date)")
+
+    def handle(self, *args, **opts):
+        since = parse_date(opts["since"])
+        if since is None:
+            raise CommandError("--since must be YYYY-MM-DD")
+        orders = rebuild(since)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Sales rollups rebuilt since {since} from {orders} orders"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.cms.services.related import refresh_related
+from apps.orders.services.co_purchase import rebuild_pairs, refresh_recommendations
+
+
+class Command(BaseCommand):
+    help = "Recomputes related articles and 'bought together' products that changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true",
+                            help="Recompute every list instead of only the affected ones.")
+        parser.add_argument("--rebuild-pairs", action="store_true",
+                            help="Recount the co-purchase matrix from order lines first.")
+
+    def handle(self, *args, **opts):
+        if opts["rebuild_pairs"]:
+            pairs = rebuild_pairs()
+            self.stdout.write(f"co-purchase pairs: {pairs}")
+        articles = refresh_related(full=opts["full"])
+        products = refresh_recommendations(full=opts["full"] or opts["rebuild_pairs"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Related lists refreshed for {articles} articles and {products} products"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.messaging.services.segments import refresh_segments, sync_profiles
+
+
+class Command(BaseCommand):
+    help = "Syncs changed AudienceProfile rows and refreshes audience segment bitmaps."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--segment", action="append",
+                            help="Repeatable. Defaults to every segment.")
+        parser.add_argument("--full", action="store_true",
+                            help="Resync every profile and rebuild segments from scratch")
+
+    def handle(self, *args, **opts):
+        profiles = sync_profiles(full=opts["full"])
+        self.stdout.write(f"{profiles} audience profiles updated")
+        try:
+            results = refresh_segments(opts["segment"], full=opts["full"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        for name, (size, mode) in results.items():
+            self.stdout.write(f"{name}: {size} members ({mode})")
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(results)} segments refreshed"))
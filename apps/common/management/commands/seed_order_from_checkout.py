@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
 
 from apps.carts.models import Checkout, CartItem
 from apps.orders.models import (
@@ -12,6 +12,7 @@ from apps.payments.models import Payment, PaymentStatus
 class Command(BaseCommand):
     help = "Creates a demo Order from the most recent Checkout."
 
+    @transaction.atomic
     def handle(self, *args, **opts):
         checkout = Checkout.objects.order_by(
             "-created_at").select_related("cart__applied_coupon").first()
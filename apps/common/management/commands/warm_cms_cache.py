@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.cms.services.rendering import warm_scheduled
+
+
+class Command(BaseCommand):
+    help = "Pre-renders articles and pages scheduled to go live within --ahead minutes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=60, help="minutes (default 60)")
+
+    def handle(self, *args, **opts):
+        warmed = warm_scheduled(opts["ahead"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Warmed {warmed['article']} articles and {warmed['page']} pages"))
@@ -0,0 +1,54 @@
+"""
+Cache-backed sliding-window rate limiter.
+
+Uses the two-bucket approximation: the count of the current fixed window plus
+the previous window's count weighted by how much of it still overlaps the
+sliding window. Two cache keys per limited identity and never the database.
+A hit is counted first (`add` + `incr`) and judged on the value `incr`
+returns, so concurrent requests each see their own position in the window
+instead of all passing one stale read; on Redis / Memcached that is atomic.
+Rejected hits count too, so a client hammering the limit stays limited.
+The counters only limit anything when every worker shares the cache; the
+OTP limits are covered by `check --deploy` (accounts.E002).
+"""
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window: int  # seconds
+
+    def hit(self, key: str, now: float | None = None) -> tuple[bool, int]:
+        """Count one request for `key`. Returns (allowed, retry_after_seconds)."""
+        now = time.time() if now is None else now
+        current = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+        cur_key = f"rl:{key}:{current}"
+        prev_key = f"rl:{key}:{current - 1}"
+
+        cache.add(cur_key, 0, timeout=self.window * 2)
+        try:
+            count = cache.incr(cur_key)
+        except ValueError:  # expired between add and incr
+            cache.add(cur_key, 1, timeout=self.window * 2)
+            count = 1
+        previous = cache.get(prev_key, 0)
+        if previous * (1 - elapsed) + count > self.limit:
+            return False, self._retry_after(previous, count, elapsed)
+        return True, 0
+
+    def _retry_after(self, previous, count, elapsed) -> int:
+        if count >= self.limit or not previous:
+            return max(1, int((1 - elapsed) * self.window))
+        # wait until the weighted previous window has decayed enough
+        needed = 1 - (self.limit - 1 - count) / previous
+        return max(1, int((needed - elapsed) * self.window))
+
+    def reset(self, key: str, now: float | None = None):
+        now = time.time() if now is None else now
+        current = int(now // self.window)
+        cache.delete_many([f"rl:{key}:{current}", f"rl:{key}:{current - 1}"])
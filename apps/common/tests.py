@@ -1,3 +1,105 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.analytics.models import EventLog
+from apps.catalog.services import media_store
+
+SEED_COMMANDS = ("seed_demo", "seed_promos_carts", "seed_order_from_checkout",
+                 "seed_reviews_messaging", "seed_analytics", "seed_cms")
+
+# session + user, counts, filters/date hierarchy and the page itself; a
+# related object looked up per row or per option pushes a page over
+MAX_CHANGELIST_QUERIES = 8
+MAX_CHANGE_FORM_QUERIES = 10
+# pages that legitimately need more
+QUERY_BUDGETS = {
+    # "references" runs one grouped count per relation using the asset
+    "catalog.mediaasset": {"change": MAX_CHANGE_FORM_QUERIES + len(media_store.usage_relations())},
+}
+
+
+class AdminQueryCountTests(TestCase):
+    """Every registered ModelAdmin renders its changelist and change form in a bounded number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for command in SEED_COMMANDS:
+            call_command(command, stdout=StringIO(), stderr=StringIO())
+        cls.superuser = User.objects.create_superuser("+989120000000", "x")
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def assertMaxQueries(self, url, limit) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        self.assertLessEqual(
+            len(ctx), limit,
+            f"{url} ran {len(ctx)} queries (max {limit}):\n"
+            + "\n".join(q["sql"] for q in ctx.captured_queries))
+        return len(ctx)
+
+    def test_changelists(self):
+        for model, model_admin in admin.site._registry.items():
+            label = model._meta.label_lower
+            with self.subTest(label):
+                url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+                limit = QUERY_BUDGETS.get(label, {}).get("changelist", MAX_CHANGELIST_QUERIES)
+                full_page = self.assertMaxQueries(url, limit)
+                if model._default_manager.count() < 2:
+                    continue
+                # the seeded tables are small, so also require the count not to grow with the rows shown
+                with mock.patch.object(model_admin, "list_per_page", 1):
+                    one_row = self.assertMaxQueries(url, limit)
+                self.assertEqual(full_page, one_row, f"{url}: queries grow with the rows listed")
+
+    def test_change_forms(self):
+        for model in admin.site._registry:
+            label = model._meta.label_lower
+            obj = model._default_manager.order_by("pk").first()
+            if obj is None:
+                continue
+            with self.subTest(label):
+                url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_change",
+                              args=[obj.pk])
+                self.assertMaxQueries(
+                    url, QUERY_BUDGETS.get(label, {}).get("change", MAX_CHANGE_FORM_QUERIES))
+
+
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_analytics", stdout=StringIO(), stderr=StringIO())
+        cls.superuser = User.objects.create_superuser("+989120000000", "x")
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+        self.url = reverse("admin:analytics_eventlog_changelist")
+
+    @mock.patch("apps.common.pagination.estimate_count", return_value=5_000_000)
+    def test_estimate_above_threshold(self, _):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["cl"].result_count, 5_000_000)
+        self.assertTrue(response.context["cl"].count_is_estimate)
+        self.assertContains(response, "_exact=1")
+
+    @mock.patch("apps.common.pagination.estimate_count", return_value=5_000_000)
+    def test_exact_count_opt_in(self, _):
+        response = self.client.get(self.url, {"_exact": 1, "sent_to_ga__exact": 0})
+        cl = response.context["cl"]
+        self.assertEqual(cl.result_count, EventLog.objects.filter(sent_to_ga=False).count())
+        self.assertFalse(cl.count_is_estimate)
 
-# Create your tests here.
+    @mock.patch("apps.common.pagination.estimate_count", return_value=10)
+    def test_small_estimate_counts_exactly(self, _):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["cl"].result_count, EventLog.objects.count())
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import bulk_job_status
+
+urlpatterns = [
+    path("<slug:job_id>/", bulk_job_status, name="admin-bulk-job"),
+]
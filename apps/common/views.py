@@ -1,3 +1,13 @@
-from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, JsonResponse
 
-# Create your views here.
+from apps.common import bulk
+
+
+@staff_member_required
+def bulk_job_status(request, job_id):
+    """Progress of a background admin bulk action (see apps/common/bulk.py)."""
+    state = bulk.get_state(job_id)
+    if state is None:
+        raise Http404("Unknown or expired job.")
+    return JsonResponse(state)
@@ -11,11 +11,23 @@ class WarehouseAdmin(admin.ModelAdmin):
 @admin.register(StockItem)
 class StockItemAdmin(admin.ModelAdmin):
     list_display = ("variant", "on_hand", "reserved", "reorder_level")
+    raw_id_fields = ("variant",)
     search_fields = ("variant__sku", "variant__product__name_fa")
 
+    def get_queryset(self, request):
+        # every view, not only the changelist: __str__ shows the SKU on delete
+        # confirmations, history and LogEntry.object_repr
+        return super().get_queryset(request).select_related("variant__product")
+
 
 @admin.register(StockReservation)
 class StockReservationAdmin(admin.ModelAdmin):
     list_display = ("variant", "qty", "expires_at", "cart_id")
-    list_filter = ("expires_at",)
+    raw_id_fields = ("variant",)
+    date_hierarchy = "expires_at"
     search_fields = ("variant__sku", "cart_id")
+
+    def get_queryset(self, request):
+        # every view, not only the changelist: __str__ shows the SKU on delete
+        # confirmations, history and LogEntry.object_repr
+        return super().get_queryset(request).select_related("variant__product")
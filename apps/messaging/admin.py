@@ -1,5 +1,17 @@
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from .models import Campaign, MessageOutbox, ShortLink, ShortLinkClick
+from django.utils.translation import gettext_lazy as _
+from apps.common import bulk
+from apps.common.admin import EstimatedCountAdminMixin
+from .models import (
+    Campaign, MessageOutbox, ShortLink, ShortLinkClick, AudienceProfile, AudienceSegment
+)
+from .services import outbox
+
+# one-time codes (accounts/services/otp.py) are queued here in plain text
+OTP_CODE_RE = re.compile(rf"\b\d{{{settings.OTP_LENGTH}}}\b")
 
 
 @admin.register(Campaign)
@@ -11,22 +23,65 @@ class CampaignAdmin(admin.ModelAdmin):
 
 
 @admin.register(MessageOutbox)
-class MessageOutboxAdmin(admin.ModelAdmin):
+class MessageOutboxAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("phone_e164", "campaign", "status",
                     "provider", "sent_at", "delivered_at")
-    list_filter = ("status", "provider")
+    list_select_related = ("campaign",)
+    raw_id_fields = ("campaign", "user", "shortlink")
+    date_hierarchy = "created_at"
+    ordering = ("-created_at",)
+    # "provider" choices would be a DISTINCT over the whole table (?provider=... still works)
+    list_filter = ("status",)
     search_fields = ("phone_e164", "provider_msg_id")
+    actions = ["cancel"]
+
+    # existing messages show the body with codes masked; new ones are typed in
+    def get_exclude(self, request, obj=None):
+        return ("body",) if obj else ()
+
+    def get_readonly_fields(self, request, obj=None):
+        return ("masked_body",) if obj else ()
+
+    @admin.display(description=_("متن پیام"))
+    def masked_body(self, obj):
+        return OTP_CODE_RE.sub(lambda m: "•" * len(m.group()), obj.body)
+
+    @admin.action(description=_("لغو پیام‌های در صف انتخاب‌شده"), permissions=["change"])
+    def cancel(self, request, queryset):
+        bulk.run(self, request, queryset, _("لغو پیام‌ها"), outbox.cancel_queued)
 
 
 @admin.register(ShortLink)
 class ShortLinkAdmin(admin.ModelAdmin):
     list_display = ("uuid_code", "campaign", "variant", "created_at")
+    list_select_related = ("campaign",)
+    raw_id_fields = ("campaign",)
     search_fields = ("uuid_code",)
 
 
 @admin.register(ShortLinkClick)
-class ShortLinkClickAdmin(admin.ModelAdmin):
+class ShortLinkClickAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("shortlink", "user", "anonymous_id", "clicked_at", "ip")
-    list_filter = ("clicked_at",)
+    list_select_related = ("shortlink", "user")
+    raw_id_fields = ("shortlink", "user")
+    date_hierarchy = "clicked_at"
+    ordering = ("-clicked_at",)
     search_fields = ("shortlink__uuid_code",
                      "user__phone_number", "anonymous_id")
+
+
+@admin.register(AudienceSegment)
+class AudienceSegmentAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "refreshed_at", "updated_at")
+    readonly_fields = ("size", "refreshed_at")
+    search_fields = ("name",)
+
+
+@admin.register(AudienceProfile)
+class AudienceProfileAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "sms_opt_in", "city",
+                    "total_orders", "churn_risk", "refreshed_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    list_filter = ("sms_opt_in", "churn_risk")
+    search_fields = ("phone_e164", "city")
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:08
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudienceSegment',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.SlugField(max_length=80, unique=True, verbose_name='نام')),
+                ('definition', models.JSONField(verbose_name='تعریف')),
+                ('bitmap', models.BinaryField(default=bytes)),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='تعداد اعضا')),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True, verbose_name='آخرین به\u200cروزرسانی')),
+            ],
+            options={
+                'verbose_name': 'بخش مخاطبان',
+                'verbose_name_plural': 'بخش\u200cهای مخاطبان',
+            },
+        ),
+        migrations.CreateModel(
+            name='AudienceProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_e164', models.CharField(max_length=16, verbose_name='شماره')),
+                ('is_active', models.BooleanField(default=True)),
+                ('sms_opt_in', models.BooleanField(default=False)),
+                ('city', models.CharField(blank=True, max_length=80, verbose_name='شهر')),
+                ('birthday', models.DateField(blank=True, null=True)),
+                ('birthday_month', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('snapshot_date', models.DateField(blank=True, null=True)),
+                ('total_orders', models.PositiveIntegerField(default=0)),
+                ('total_spend_toman', models.BigIntegerField(default=0)),
+                ('last_purchase_at', models.DateTimeField(blank=True, null=True)),
+                ('rfm_score', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('churn_risk', models.CharField(blank=True, max_length=10, null=True)),
+                ('refreshed_at', models.DateTimeField(db_index=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='audience_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'پروفایل مخاطب',
+                'verbose_name_plural': 'پروفایل\u200cهای مخاطبان',
+            },
+        ),
+    ]
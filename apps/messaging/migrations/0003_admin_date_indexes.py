@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_audience_segments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='messageoutbox',
+            index=models.Index(fields=['created_at'], name='messaging_m_created_ee7d86_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shortlinkclick',
+            index=models.Index(fields=['clicked_at'], name='messaging_s_clicked_a83fa7_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_admin_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='messageoutbox',
+            name='status',
+            field=models.CharField(choices=[('queued', 'در صف'), ('sent', 'ارسال شد'), ('delivered', 'تحویل شد'), ('failed', 'ناموفق'), ('cancelled', 'لغو شد')], default='queued', max_length=10, verbose_name='وضعیت'),
+        ),
+    ]
@@ -35,6 +35,7 @@ class MessageStatus(models.TextChoices):
     SENT = "sent", _("ارسال شد")
     DELIVERED = "delivered", _("تحویل شد")
     FAILED = "failed", _("ناموفق")
+    CANCELLED = "cancelled", _("لغو شد")
 
 
 class MessageOutbox(UUIDModel):
@@ -64,7 +65,8 @@ class MessageOutbox(UUIDModel):
     class Meta:
         verbose_name = _("پیام خروجی")
         verbose_name_plural = _("پیام‌های خروجی")
-        indexes = [models.Index(fields=["status", "provider"])]
+        indexes = [models.Index(fields=["status", "provider"]),
+                   models.Index(fields=["created_at"])]
 
     def __str__(self):
         return f"SMS to {self.phone_e164} [{self.status}]"
@@ -101,4 +103,57 @@ class ShortLinkClick(UUIDModel):
     class Meta:
         verbose_name = _("کلیک روی لینک کوتاه")
         verbose_name_plural = _("کلیک‌های لینک کوتاه")
-        indexes = [models.Index(fields=["shortlink", "clicked_at"])]
+        indexes = [models.Index(fields=["shortlink", "clicked_at"]),
+                   models.Index(fields=["clicked_at"])]
+
+
+class AudienceProfile(models.Model):
+    """
+    One flat row per user with the attributes campaigns target on (consent,
+    profile, latest purchase snapshot). The integer `id` is the user's dense
+    index: bit `id` of a segment bitmap says whether the user is a member.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL,
+                                on_delete=models.CASCADE, related_name="audience_profile")
+    phone_e164 = models.CharField(_("شماره"), max_length=16)
+    is_active = models.BooleanField(default=True)
+    sms_opt_in = models.BooleanField(default=False)
+    city = models.CharField(_("شهر"), max_length=80, blank=True)
+    birthday = models.DateField(null=True, blank=True)
+    birthday_month = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    snapshot_date = models.DateField(null=True, blank=True)
+    total_orders = models.PositiveIntegerField(default=0)
+    total_spend_toman = models.BigIntegerField(default=0)
+    last_purchase_at = models.DateTimeField(null=True, blank=True)
+    rfm_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    churn_risk = models.CharField(max_length=10, null=True, blank=True)
+
+    refreshed_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = _("پروفایل مخاطب")
+        verbose_name_plural = _("پروفایل‌های مخاطبان")
+
+    def __str__(self):
+        return f"Audience<{self.pk}, {self.user_id}>"
+
+
+class AudienceSegment(UUIDModel):
+    """
+    Named audience. `definition` is a rule tree over AudienceProfile fields
+    (see services/segments.py); members are stored as a bitmap over
+    AudienceProfile ids so segments compose with bitwise AND / OR / NOT.
+    """
+    name = models.SlugField(_("نام"), max_length=80, unique=True)
+    definition = models.JSONField(_("تعریف"))
+    bitmap = models.BinaryField(default=bytes)
+    size = models.PositiveIntegerField(_("تعداد اعضا"), default=0)
+    refreshed_at = models.DateTimeField(_("آخرین به‌روزرسانی"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("بخش مخاطبان")
+        verbose_name_plural = _("بخش‌های مخاطبان")
+
+    def __str__(self):
+        return self.name
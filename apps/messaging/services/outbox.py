@@ -0,0 +1,10 @@
+from django.utils import timezone
+
+from apps.messaging.models import MessageOutbox, MessageStatus
+
+
+def cancel_queued(message_ids) -> int:
+    """Cancel messages still waiting to be sent (one UPDATE). Returns the messages cancelled."""
+    return (MessageOutbox.objects
+            .filter(pk__in=message_ids, status=MessageStatus.QUEUED)
+            .update(status=MessageStatus.CANCELLED, updated_at=timezone.now()))
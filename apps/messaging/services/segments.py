@@ -0,0 +1,282 @@
+"""
+Audience segments over a denormalized AudienceProfile table.
+
+`sync_profiles` flattens User + UserProfile + the latest DailyUserSnapshot
+into one row per user and only rewrites rows whose values changed, stamping
+them with `refreshed_at`. Segments are rule trees:
+
+    {"field": "city", "op": "in", "value": ["تهران", "کرج"]}
+    {"and": [...]}, {"or": [...]}, {"not": {...}}, {"segment": "vip"}
+
+Each leaf is a single-table filter on AudienceProfile; the result is a
+bitmap (Python int, bit = AudienceProfile.id) and and/or/not are bitwise
+operations. An incremental refresh re-evaluates the tree only for profiles
+refreshed since the segment's last run and patches those bits in.
+"""
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.analytics.models import DailyUserSnapshot
+from apps.messaging.models import AudienceProfile, AudienceSegment
+
+SYNC_BATCH_SIZE = 2_000
+LEAF_OPS = {"exact", "in", "gt", "gte", "lt", "lte", "isnull", "icontains"}
+LEAF_FIELDS = {f.name for f in AudienceProfile._meta.concrete_fields} - {"id", "user"}
+SNAPSHOT_FIELDS = ("total_orders", "total_spend_toman", "last_purchase_at",
+                   "rfm_score", "churn_risk")
+PROFILE_FIELDS = ("phone_e164", "is_active", "sms_opt_in", "city", "birthday",
+                  "birthday_month", "snapshot_date", *SNAPSHOT_FIELDS)
+
+
+# ---------- Bitmaps ----------
+
+
+def to_bitmap(ids) -> int:
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def bitmap_ids(bitmap: int):
+    """Member ids in ascending order."""
+    for offset, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")):
+        while byte:
+            low = byte & -byte
+            yield offset * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+def load_bitmap(segment: AudienceSegment) -> int:
+    return int.from_bytes(bytes(segment.bitmap), "little")
+
+
+def _ids_bitmap(qs) -> int:
+    return to_bitmap(qs.values_list("id", flat=True).iterator(chunk_size=10_000))
+
+
+# ---------- Profiles ----------
+
+
+def _profile_values(user: dict, snapshot: dict | None, snapshot_date) -> dict:
+    birthday = user["profile__birthday"]
+    values = {
+        "phone_e164": str(user["phone_number"]),
+        "is_active": user["is_active"],
+        "sms_opt_in": bool(user["profile__sms_opt_in"]),
+        "city": user["profile__city"] or "",
+        "birthday": birthday,
+        "birthday_month": birthday.month if birthday else None,
+        "snapshot_date": snapshot_date if snapshot else None,
+    }
+    for name in SNAPSHOT_FIELDS:
+        values[name] = snapshot[name] if snapshot else AudienceProfile._meta.get_field(name).get_default()
+    return values
+
+
+def sync_profiles(full: bool = False) -> int:
+    """Upsert AudienceProfile rows whose source data changed. Returns rows written."""
+    started = timezone.now()
+    last_sync = AudienceProfile.objects.aggregate(last=Max("refreshed_at"))["last"]
+    latest_day = DailyUserSnapshot.objects.aggregate(day=Max("snapshot_date"))["day"]
+
+    users = User.objects.all()
+    if not full and last_sync is not None:
+        synced_day = AudienceProfile.objects.aggregate(day=Max("snapshot_date"))["day"]
+        changed = Q(updated_at__gte=last_sync) | Q(profile__updated_at__gte=last_sync)
+        if latest_day and (synced_day is None or latest_day > synced_day):
+            changed |= Q(daily_snapshots__snapshot_date=latest_day)
+        users = users.filter(changed).distinct()
+
+    rows = users.order_by("pk").values(
+        "pk", "phone_number", "is_active",
+        "profile__sms_opt_in", "profile__city", "profile__birthday")
+    written = 0
+    batch = []
+    for user in rows.iterator(chunk_size=SYNC_BATCH_SIZE):
+        batch.append(user)
+        if len(batch) == SYNC_BATCH_SIZE:
+            written += _sync_batch(batch, latest_day, started)
+            batch = []
+    if batch:
+        written += _sync_batch(batch, latest_day, started)
+    return written
+
+
+def _sync_batch(users: list[dict], latest_day, stamp) -> int:
+    ids = [u["pk"] for u in users]
+    snapshots = {s["user_id"]: s for s in DailyUserSnapshot.objects
+                 .filter(snapshot_date=latest_day, user_id__in=ids)
+                 .values("user_id", *SNAPSHOT_FIELDS)} if latest_day else {}
+    existing = {p["user_id"]: p for p in AudienceProfile.objects
+                .filter(user_id__in=ids).values("user_id", *PROFILE_FIELDS)}
+
+    changed = []
+    for user in users:
+        values = _profile_values(user, snapshots.get(user["pk"]), latest_day)
+        current = existing.get(user["pk"])
+        if current is not None and all(current[k] == v for k, v in values.items()):
+            continue
+        changed.append(AudienceProfile(user_id=user["pk"], refreshed_at=stamp, **values))
+
+    AudienceProfile.objects.bulk_create(
+        changed,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=[*PROFILE_FIELDS, "refreshed_at"],
+    )
+    return len(changed)
+
+
+# ---------- Rule evaluation ----------
+
+
+def leaf_q(node: dict) -> Q:
+    field, op = node.get("field"), node.get("op", "exact")
+    if field not in LEAF_FIELDS or op not in LEAF_OPS:
+        raise ValueError(f"Unsupported segment rule: {node!r}")
+    return Q(**{f"{field}__{op}": node.get("value")})
+
+
+def evaluate(node, scope: Q, universe: int, segments: dict) -> int:
+    """
+    Bitmap of profiles within `scope` (a filter whose ids are `universe`)
+    matching the rule tree. `segments` maps names to already-computed bitmaps.
+    """
+    if "and" in node:
+        result = universe
+        for child in node["and"]:
+            result &= evaluate(child, scope, universe, segments)
+        return result
+    if "or" in node:
+        result = 0
+        for child in node["or"]:
+            result |= evaluate(child, scope, universe, segments)
+        return result
+    if "not" in node:
+        return universe & ~evaluate(node["not"], scope, universe, segments)
+    if "segment" in node:
+        if node["segment"] not in segments:
+            raise ValueError(f"Unknown segment: {node['segment']}")
+        return segments[node["segment"]] & universe
+    return _ids_bitmap(AudienceProfile.objects.filter(scope, leaf_q(node)))
+
+
+def dependencies(node) -> set:
+    if "segment" in node:
+        return {node["segment"]}
+    children = node.get("and") or node.get("or") or ([node["not"]] if "not" in node else [])
+    return set().union(*(dependencies(c) for c in children)) if children else set()
+
+
+def _in_dependency_order(segments: list[AudienceSegment]) -> list[AudienceSegment]:
+    by_name = {s.name: s for s in segments}
+    ordered, state = [], {}
+
+    def visit(segment):
+        if state.get(segment.name) == "done":
+            return
+        if state.get(segment.name) == "visiting":
+            raise ValueError(f"Segment cycle through {segment.name}")
+        state[segment.name] = "visiting"
+        for name in dependencies(segment.definition):
+            if name in by_name:
+                visit(by_name[name])
+        state[segment.name] = "done"
+        ordered.append(segment)
+
+    for segment in segments:
+        visit(segment)
+    return ordered
+
+
+def refresh_segments(names=None, full: bool = False) -> dict:
+    """
+    Refresh segments (all by default, plus whatever they reference) in
+    dependency order. A segment is rebuilt from scratch on its first run,
+    after its definition was edited, when a segment it references was
+    rebuilt or refreshed without it, or with `full`; otherwise only profiles
+    refreshed since its last run are re-evaluated.
+    Returns {name: (size, "full" | "incremental")}.
+    """
+    every = {s.name: s for s in AudienceSegment.objects.all()}
+    wanted = _with_dependencies(set(every) if names is None else set(names), every)
+
+    bitmaps = {name: load_bitmap(s) for name, s in every.items()}
+    previous = {name: s.refreshed_at for name, s in every.items()}
+    everyone = _ids_bitmap(AudienceProfile.objects.all())
+    rebuilt, results = set(), {}
+
+    for segment in _in_dependency_order([every[name] for name in wanted]):
+        now = timezone.now()
+        deps = dependencies(segment.definition)
+        rebuild = (full or segment.refreshed_at is None
+                   or segment.updated_at > segment.refreshed_at
+                   or deps & rebuilt
+                   or any(previous.get(d) and previous[d] > segment.refreshed_at for d in deps))
+        if rebuild:
+            bitmap = evaluate(segment.definition, Q(), everyone, bitmaps)
+            rebuilt.add(segment.name)
+        else:
+            scope = Q(refreshed_at__gt=segment.refreshed_at)
+            changed = _ids_bitmap(AudienceProfile.objects.filter(scope))
+            patch = evaluate(segment.definition, scope, changed, bitmaps)
+            bitmap = ((bitmaps[segment.name] & ~changed) | patch) & everyone
+
+        bitmaps[segment.name] = bitmap
+        segment.bitmap = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        segment.size = bitmap.bit_count()
+        segment.refreshed_at = now
+        segment.save(update_fields=["bitmap", "size", "refreshed_at"])
+        results[segment.name] = (segment.size, "full" if rebuild else "incremental")
+    return results
+
+
+def _with_dependencies(names: set, every: dict) -> set:
+    result, pending = set(), [n for n in names if n in every]
+    while pending:
+        name = pending.pop()
+        if name in result:
+            continue
+        result.add(name)
+        pending.extend(d for d in dependencies(every[name].definition) if d in every)
+    return result
+
+
+# ---------- Composing stored segments ----------
+
+
+def audience(expr) -> int:
+    """
+    Compose stored segments without touching AudienceProfile filters:
+    "name", {"and": [...]}, {"or": [...]}, {"not": ...}.
+    """
+    if isinstance(expr, str):
+        expr = {"segment": expr}
+    names = dependencies(expr)
+    segments = {s.name: load_bitmap(s) for s in AudienceSegment.objects.filter(name__in=names)}
+    # only NOT needs the set of all profiles; otherwise "everything" is all ones
+    universe = _ids_bitmap(AudienceProfile.objects.all()) if _negates(expr) else -1
+    return evaluate(expr, Q(), universe, segments)
+
+
+def _negates(node) -> bool:
+    if "not" in node:
+        return True
+    return any(_negates(c) for c in node.get("and", ()) or node.get("or", ()))
+
+
+def members(bitmap: int, fields=("user_id", "phone_e164"), chunk_size: int = 5_000):
+    """Yield AudienceProfile values for the bitmap's members, one id chunk at a time."""
+    chunk = []
+    for profile_id in bitmap_ids(bitmap):
+        chunk.append(profile_id)
+        if len(chunk) == chunk_size:
+            yield from AudienceProfile.objects.filter(id__in=chunk).values(*fields)
+            chunk = []
+    if chunk:
+        yield from AudienceProfile.objects.filter(id__in=chunk).values(*fields)
@@ -1,13 +1,26 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+from apps.common import bulk
+from apps.common.admin import EstimatedCountAdminMixin
 from .models import (
     OrderHeader, OrderLine, Shipment,
-    ReturnRequest, ReturnItem, CouponRedemption
+    ReturnRequest, ReturnItem, CouponRedemption, CustomerProductPurchase,
+    ProductRecommendation,
 )
+from .services import fulfillment
 
 
 class OrderLineInline(admin.TabularInline):
     model = OrderLine
     extra = 0
+    # lines are snapshots of what was sold; a variant <select> per row would list every SKU
+    readonly_fields = ("variant",)
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("variant__product")
 
 
 class ShipmentInline(admin.TabularInline):
@@ -16,23 +29,35 @@ class ShipmentInline(admin.TabularInline):
 
 
 @admin.register(OrderHeader)
-class OrderHeaderAdmin(admin.ModelAdmin):
+class OrderHeaderAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("id", "order_number", "status", "phone_e164",
                     "total_payable_toman", "placed_at", "paid_at")
-    list_filter = ("status", "channel")
+    date_hierarchy = "placed_at"
+    # "channel" choices would be a DISTINCT over the whole table (?channel=... still works)
+    list_filter = ("status",)
     search_fields = ("id", "order_number", "phone_e164", "email")
+    raw_id_fields = ("user", "checkout")
     inlines = [OrderLineInline, ShipmentInline]
+    actions = ["ship"]
+
+    @admin.action(description=_("ثبت ارسال سفارش‌های انتخاب‌شده"), permissions=["change"])
+    def ship(self, request, queryset):
+        bulk.run(self, request, queryset, _("ثبت ارسال"), fulfillment.ship)
 
 
 @admin.register(Shipment)
 class ShipmentAdmin(admin.ModelAdmin):
     list_display = ("order", "status", "carrier",
                     "tracking_number", "shipping_fee_toman")
+    list_select_related = ("order",)
+    raw_id_fields = ("order",)
 
 
 @admin.register(ReturnRequest)
 class ReturnRequestAdmin(admin.ModelAdmin):
     list_display = ("order", "status", "reason_code", "requested_at")
+    list_select_related = ("order",)
+    raw_id_fields = ("order",)
     list_filter = ("status",)
     search_fields = ("order__id",)
 
@@ -40,10 +65,30 @@ class ReturnRequestAdmin(admin.ModelAdmin):
 @admin.register(ReturnItem)
 class ReturnItemAdmin(admin.ModelAdmin):
     list_display = ("return_request", "order_line", "qty")
+    list_select_related = ("return_request", "order_line")
+    raw_id_fields = ("return_request", "order_line")
 
 
 @admin.register(CouponRedemption)
 class CouponRedemptionAdmin(admin.ModelAdmin):
     list_display = ("coupon", "order", "user",
                     "discount_applied_toman", "created_at")
+    list_select_related = ("coupon", "order", "user")
+    raw_id_fields = ("order", "user")
     search_fields = ("coupon__code", "order__id", "user__phone_number")
+
+
+@admin.register(CustomerProductPurchase)
+class CustomerProductPurchaseAdmin(admin.ModelAdmin):
+    list_display = ("user", "product", "order_count", "units", "last_purchased_at")
+    list_select_related = ("user", "product")
+    raw_id_fields = ("user", "product")
+    search_fields = ("user__phone_number", "product__name_fa")
+
+
+@admin.register(ProductRecommendation)
+class ProductRecommendationAdmin(admin.ModelAdmin):
+    list_display = ("product", "computed_at")
+    list_select_related = ("product",)
+    search_fields = ("product__name_fa",)
+    raw_id_fields = ("product",)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_globaldiscount_coupon'),
+        ('orders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerProductPurchase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_count', models.PositiveIntegerField(default=0, verbose_name='تعداد سفارش')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='تعداد اقلام')),
+                ('first_purchased_at', models.DateTimeField(blank=True, null=True, verbose_name='اولین خرید')),
+                ('last_purchased_at', models.DateTimeField(blank=True, null=True, verbose_name='آخرین خرید')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchases', to='catalog.product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchased_products', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'سابقه خرید محصول',
+                'verbose_name_plural': 'سوابق خرید محصول',
+                'indexes': [models.Index(fields=['user', '-last_purchased_at'], name='orders_cust_user_id_5e6098_idx')],
+                'unique_together': {('user', 'product')},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_globaldiscount_coupon'),
+        ('orders', '0002_customer_product_purchase'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductRecommendation',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommendation', serialize=False, to='catalog.product')),
+                ('items', models.JSONField(default=list, verbose_name='محصولات پیشنهادی')),
+                ('computed_at', models.DateTimeField(db_index=True, verbose_name='زمان محاسبه')),
+            ],
+            options={
+                'verbose_name': 'پیشنهاد محصول',
+                'verbose_name_plural': 'پیشنهادهای محصول',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductCoPurchase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders', models.IntegerField(default=0, verbose_name='تعداد سفارش')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('product_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.product')),
+                ('product_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.product')),
+            ],
+            options={
+                'verbose_name': 'خرید همزمان',
+                'verbose_name_plural': 'خریدهای همزمان',
+                'unique_together': {('product_a', 'product_b')},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carts', '0001_initial'),
+        ('orders', '0003_product_recommendations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderheader',
+            index=models.Index(fields=['placed_at'], name='orders_orde_placed__1a3ea9_idx'),
+        ),
+    ]
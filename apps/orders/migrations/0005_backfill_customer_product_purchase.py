@@ -0,0 +1,40 @@
+# Fills CustomerProductPurchase from the orders placed before it existed;
+# the index is only maintained on status changes from 0002 onwards, so
+# verified-purchase checks on older orders would otherwise fail.
+
+from django.db import migrations
+from django.db.models import Count, Max, Min, Sum
+
+# PURCHASED_STATUSES at the time of writing
+PURCHASED_STATUSES = ("paid", "processing", "shipped", "delivered")
+
+
+def backfill_purchases(apps, schema_editor):
+    OrderLine = apps.get_model("orders", "OrderLine")
+    CustomerProductPurchase = apps.get_model("orders", "CustomerProductPurchase")
+    rows = (OrderLine.objects
+            .filter(order__user__isnull=False, order__status__in=PURCHASED_STATUSES)
+            .order_by()
+            .values("order__user_id", "variant__product_id")
+            .annotate(order_count=Count("order_id", distinct=True), units=Sum("qty"),
+                      first=Min("order__paid_at"), last=Max("order__paid_at")))
+    CustomerProductPurchase.objects.bulk_create(
+        [CustomerProductPurchase(
+            user_id=r["order__user_id"], product_id=r["variant__product_id"],
+            order_count=r["order_count"], units=r["units"],
+            first_purchased_at=r["first"], last_purchased_at=r["last"],
+        ) for r in rows],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_placed_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_purchases, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carts', '0001_initial'),
+        ('orders', '0005_backfill_customer_product_purchase'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderheader',
+            index=models.Index(fields=['updated_at'], name='orders_orde_updated_5d9f7e_idx'),
+        ),
+    ]
@@ -3,7 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 
 from apps.common.models import UUIDModel
-from apps.catalog.models import ProductVariant, Coupon
+from apps.catalog.models import Product, ProductVariant, Coupon
 from apps.carts.models import Checkout  # optional link back to checkout
 
 
@@ -18,6 +18,13 @@ class OrderStatus(models.TextChoices):
     REFUNDED = "refunded", _("مسترد شد")
 
 
+# Statuses that count as a completed purchase in reports and snapshots.
+PURCHASED_STATUSES = (
+    OrderStatus.PAID, OrderStatus.PROCESSING,
+    OrderStatus.SHIPPED, OrderStatus.DELIVERED,
+)
+
+
 class OrderHeader(UUIDModel):
     # optional human-friendly sequence you can fill in programmatically
     order_number = models.PositiveBigIntegerField(
@@ -66,6 +73,8 @@ class OrderHeader(UUIDModel):
         verbose_name = _("سفارش")
         verbose_name_plural = _("سفارش‌ها")
         ordering = ["-placed_at"]
+        # default ordering and the admin date hierarchy; incremental exports
+        indexes = [models.Index(fields=["placed_at"]), models.Index(fields=["updated_at"])]
 
     def __str__(self):
         return f"Order<{self.pk}>"
@@ -98,7 +107,7 @@ class OrderLine(UUIDModel):
         verbose_name_plural = _("آیتم‌های سفارش")
 
     def __str__(self):
-        return f"{self.variant.sku} x{self.qty}"
+        return f"{self.product_name_fa_snapshot} x{self.qty}"
 
 
 class ShipmentStatus(models.TextChoices):
@@ -189,3 +198,65 @@ class CouponRedemption(UUIDModel):
         verbose_name = _("ثبت استفاده از کوپن")
         verbose_name_plural = _("ثبت‌های استفاده از کوپن")
         unique_together = [("coupon", "order")]
+
+
+class CustomerProductPurchase(models.Model):
+    """
+    One row per (user, product) the user has bought, maintained from order
+    status changes (services/purchase_index.py). Answers verified-purchase and
+    "buy again" questions without joining OrderLine → ProductVariant → Product.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE, related_name="purchased_products")
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="purchases")
+    order_count = models.PositiveIntegerField(_("تعداد سفارش"), default=0)
+    units = models.PositiveIntegerField(_("تعداد اقلام"), default=0)
+    first_purchased_at = models.DateTimeField(_("اولین خرید"), null=True, blank=True)
+    last_purchased_at = models.DateTimeField(_("آخرین خرید"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("سابقه خرید محصول")
+        verbose_name_plural = _("سوابق خرید محصول")
+        unique_together = [("user", "product")]
+        indexes = [models.Index(fields=["user", "-last_purchased_at"])]
+
+    def __str__(self):
+        return f"Purchase<{self.user_id}, {self.product_id}>"
+
+
+class ProductCoPurchase(models.Model):
+    """
+    Number of purchased orders containing both products: the sparse
+    product x product matrix XᵀX of the order x product matrix X, stored in
+    both directions. The diagonal (a == b) is the product's own order count.
+    Maintained from order status changes (services/co_purchase.py).
+    """
+    product_a = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    product_b = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    orders = models.IntegerField(_("تعداد سفارش"), default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("خرید همزمان")
+        verbose_name_plural = _("خریدهای همزمان")
+        unique_together = [("product_a", "product_b")]
+
+    def __str__(self):
+        return f"CoPurchase<{self.product_a_id}, {self.product_b_id}>"
+
+
+class ProductRecommendation(models.Model):
+    """Top-k "bought together" products of one product; read with one primary-key lookup."""
+    product = models.OneToOneField(
+        Product, on_delete=models.CASCADE, primary_key=True, related_name="recommendation")
+    # [{"id", "slug", "name", "score"}, ...] best first
+    items = models.JSONField(_("محصولات پیشنهادی"), default=list)
+    computed_at = models.DateTimeField(_("زمان محاسبه"), db_index=True)
+
+    class Meta:
+        verbose_name = _("پیشنهاد محصول")
+        verbose_name_plural = _("پیشنهادهای محصول")
+
+    def __str__(self):
+        return f"Recommendation<{self.product_id}>"
@@ -0,0 +1,165 @@
+"""
+"Bought together" recommendations.
+
+ProductCoPurchase is the sparse matrix C = XᵀX of the order x product
+incidence matrix X: C[a][b] = purchased orders containing both a and b,
+C[a][a] = orders containing a. An order entering (or leaving)
+PURCHASED_STATUSES adds (or removes) its outer product with one upsert, so C
+stays current without rescanning OrderLine.
+
+`refresh_recommendations` then re-ranks only products whose row or whose
+neighbours changed since the last run, by cosine similarity
+C[a][b] / sqrt(C[a][a] * C[b][b]), and stores the top-k denormalized in
+ProductRecommendation.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+from itertools import combinations_with_replacement, groupby
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from apps.catalog.models import Product
+from apps.orders.models import (
+    OrderLine, ProductCoPurchase, ProductRecommendation, PURCHASED_STATUSES,
+)
+
+# huge baskets (B2B, giveaways) would add n² pairs of little signal
+MAX_PRODUCTS_PER_ORDER = 50
+UPSERT_BATCH = 500
+REFRESH_BATCH = 1_000
+
+
+def _pairs(product_ids):
+    """Both directions of every pair, diagonal included."""
+    for a, b in combinations_with_replacement(sorted(product_ids), 2):
+        yield a, b
+        if a != b:
+            yield b, a
+
+
+def add_order(product_ids, sign: int):
+    """Add (sign=1) or remove (sign=-1) one order's products from the matrix."""
+    product_ids = set(product_ids)
+    if not product_ids or len(product_ids) > MAX_PRODUCTS_PER_ORDER:
+        return
+    table = connection.ops.quote_name(ProductCoPurchase._meta.db_table)
+    fk = ProductCoPurchase._meta.get_field("product_a")
+    now = ProductCoPurchase._meta.get_field("updated_at").get_db_prep_value(
+        timezone.now(), connection)
+    rows = [(fk.get_db_prep_value(a, connection), fk.get_db_prep_value(b, connection), sign, now)
+            for a, b in _pairs(product_ids)]
+    with connection.cursor() as cur:
+        for start in range(0, len(rows), UPSERT_BATCH):
+            batch = rows[start:start + UPSERT_BATCH]
+            cur.execute(
+                f"INSERT INTO {table} (product_a_id, product_b_id, orders, updated_at) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT (product_a_id, product_b_id) DO UPDATE SET "
+                f"orders = {table}.orders + excluded.orders, updated_at = excluded.updated_at",
+                [value for row in batch for value in row])
+
+
+def on_status_changed(order, old_status, new_status):
+    was_purchase = old_status in PURCHASED_STATUSES
+    is_purchase = new_status in PURCHASED_STATUSES
+    if was_purchase == is_purchase:
+        return
+    product_ids = OrderLine.objects.filter(order_id=order.pk).values_list(
+        "variant__product_id", flat=True)
+    add_order(product_ids, 1 if is_purchase else -1)
+
+
+@transaction.atomic
+def rebuild_pairs() -> int:
+    """Recompute the whole matrix from purchased order lines. Returns stored pairs."""
+    lines = (OrderLine.objects
+             .filter(order__status__in=PURCHASED_STATUSES)
+             .order_by("order_id")
+             .values_list("order_id", "variant__product_id")
+             .iterator(chunk_size=10_000))
+    counts = Counter()
+    for _, rows in groupby(lines, key=lambda row: row[0]):
+        product_ids = {product_id for _, product_id in rows}
+        if len(product_ids) <= MAX_PRODUCTS_PER_ORDER:
+            counts.update(_pairs(product_ids))
+    ProductCoPurchase.objects.all().delete()
+    ProductCoPurchase.objects.bulk_create(
+        [ProductCoPurchase(product_a_id=a, product_b_id=b, orders=n)
+         for (a, b), n in counts.items()],
+        batch_size=2000)
+    return len(counts)
+
+
+def _dirty_products(since) -> set:
+    if since is None:
+        return (set(ProductCoPurchase.objects.values_list("product_a_id", flat=True).distinct())
+                | set(ProductRecommendation.objects.values_list("product_id", flat=True)))
+    changed = set(ProductCoPurchase.objects.filter(updated_at__gt=since)
+                  .values_list("product_a_id", flat=True).distinct())
+    # renamed / (de)activated products show up in their neighbours' lists
+    edited = set(Product.objects.filter(updated_at__gt=since).values_list("pk", flat=True))
+    neighbours = set(ProductCoPurchase.objects.filter(product_a_id__in=edited)
+                     .values_list("product_b_id", flat=True))
+    return changed | edited | neighbours
+
+
+def _top_k(product_ids: list, k: int, min_orders: int) -> dict:
+    """{product_id: items} for one batch of products."""
+    row_of = defaultdict(list)
+    for a, b, n in (ProductCoPurchase.objects
+                    .filter(product_a_id__in=product_ids, orders__gt=0)
+                    .values_list("product_a_id", "product_b_id", "orders")):
+        row_of[a].append((b, n))
+    candidates = {b for row in row_of.values() for b, _ in row} | set(product_ids)
+    own = dict(ProductCoPurchase.objects
+               .filter(product_a_id__in=candidates, product_b_id=F("product_a_id"))
+               .values_list("product_a_id", "orders"))
+    shown = {pk: (slug, name) for pk, slug, name in Product.objects
+             .filter(pk__in=candidates, is_active=True).values_list("pk", "slug_en", "name_fa")}
+
+    result = {}
+    for a in product_ids:
+        scored = []
+        for b, n in row_of.get(a, ()):
+            if b == a or b not in shown or n < min_orders or not own.get(a) or not own.get(b):
+                continue
+            scored.append((n / math.sqrt(own[a] * own[b]), n, str(b), b))
+        result[a] = [
+            {"id": pk, "slug": shown[b][0], "name": shown[b][1], "score": round(score, 4)}
+            for score, _, pk, b in heapq.nlargest(k, scored)
+        ]
+    return result
+
+
+def refresh_recommendations(full: bool = False) -> int:
+    """Re-rank products affected since the last run (all with `full`). Returns rows written."""
+    started = timezone.now()
+    since = None if full else ProductRecommendation.objects.aggregate(
+        last=Max("computed_at"))["last"]
+    dirty = sorted(_dirty_products(since))
+    k = settings.RECOMMENDATIONS_TOP_K
+    min_orders = settings.RECOMMENDATIONS_MIN_CO_PURCHASES
+
+    written = 0
+    for start in range(0, len(dirty), REFRESH_BATCH):
+        batch = dirty[start:start + REFRESH_BATCH]
+        items = _top_k(batch, k, min_orders)
+        ProductRecommendation.objects.bulk_create(
+            [ProductRecommendation(product_id=pk, items=items.get(pk, []), computed_at=started)
+             for pk in batch],
+            update_conflicts=True,
+            unique_fields=["product"],
+            update_fields=["items", "computed_at"],
+        )
+        written += len(batch)
+    ProductCoPurchase.objects.filter(orders__lte=0).delete()
+    return written
+
+
+def recommended_products(product_id) -> list[dict]:
+    return ProductRecommendation.objects.filter(pk=product_id).values_list(
+        "items", flat=True).first() or []
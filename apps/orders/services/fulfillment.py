@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.utils import timezone
+
+from apps.orders.models import OrderHeader, OrderStatus, Shipment, ShipmentStatus
+from apps.orders.signals import announce_after_commit
+
+SHIPPABLE_STATUSES = (OrderStatus.PAID, OrderStatus.PROCESSING)
+
+
+@transaction.atomic
+def ship(order_ids, at=None) -> int:
+    """
+    Mark paid / processing orders as shipped, and their pending shipments with
+    them, in two UPDATEs. Returns the orders shipped.
+    """
+    at = at or timezone.now()
+    orders = list(OrderHeader.objects.select_for_update()
+                  .filter(pk__in=order_ids, status__in=SHIPPABLE_STATUSES))
+    if not orders:
+        return 0
+    ids = [order.pk for order in orders]
+    OrderHeader.objects.filter(pk__in=ids).update(status=OrderStatus.SHIPPED, updated_at=at)
+    (Shipment.objects.filter(order_id__in=ids, status=ShipmentStatus.PENDING)
+     .update(status=ShipmentStatus.SHIPPED, shipped_at=at, updated_at=at))
+    # what post_save would have announced for each order
+    for order in orders:
+        old_status = order.status
+        order.status = order._loaded_status = OrderStatus.SHIPPED
+        announce_after_commit(order, old_status, OrderStatus.SHIPPED)
+    return len(orders)
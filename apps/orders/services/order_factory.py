@@ -1,13 +1,15 @@
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
 from apps.orders.models import OrderHeader, OrderLine, OrderStatus
 from apps.carts.models import Checkout, CartItem
 
 
+@transaction.atomic
 def create_order_from_checkout(checkout: Checkout, gateway_fee_toman: int = 0) -> OrderHeader:
     """
     Idempotent-ish converter (simple): creates an Order from a Checkout and its CartItems.
     If the checkout already has an order, returns it.
+    Atomic, so `order_status_changed` listeners see the order with its lines.
     """
     if hasattr(checkout, "order") and checkout.order:
         return checkout.order
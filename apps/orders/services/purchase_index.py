@@ -0,0 +1,82 @@
+"""
+(user, product) purchase index.
+
+Rows are refreshed for the products of an order whenever it enters or leaves
+PURCHASED_STATUSES (paid, refunded, cancelled). The refresh re-aggregates only
+that user's purchased lines for those products, so it stays correct even
+when several orders of the same user are refunded.
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+
+from apps.catalog.models import Product
+from apps.orders.models import CustomerProductPurchase, OrderLine, PURCHASED_STATUSES
+
+
+def _purchased_lines():
+    return OrderLine.objects.filter(
+        order__user__isnull=False, order__status__in=PURCHASED_STATUSES)
+
+
+def _aggregate(lines):
+    return (lines.order_by()
+            .values("order__user_id", "variant__product_id")
+            .annotate(order_count=Count("order_id", distinct=True), units=Sum("qty"),
+                      first=Min("order__paid_at"), last=Max("order__paid_at")))
+
+
+def _rows(aggregates):
+    return [CustomerProductPurchase(
+        user_id=r["order__user_id"], product_id=r["variant__product_id"],
+        order_count=r["order_count"], units=r["units"],
+        first_purchased_at=r["first"], last_purchased_at=r["last"],
+    ) for r in aggregates]
+
+
+@transaction.atomic
+def refresh(user_id, product_ids):
+    """Recompute the index rows of one user for the given products."""
+    rows = _rows(_aggregate(_purchased_lines().filter(
+        order__user_id=user_id, variant__product_id__in=product_ids)))
+    (CustomerProductPurchase.objects
+     .filter(user_id=user_id, product_id__in=product_ids)
+     .exclude(product_id__in=[r.product_id for r in rows])
+     .delete())
+    CustomerProductPurchase.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user", "product"],
+        update_fields=["order_count", "units", "first_purchased_at", "last_purchased_at"],
+    )
+
+
+def on_status_changed(order, old_status, new_status):
+    if order.user_id is None:
+        return
+    if (old_status in PURCHASED_STATUSES) == (new_status in PURCHASED_STATUSES):
+        return
+    product_ids = set(OrderLine.objects.filter(order_id=order.pk)
+                      .values_list("variant__product_id", flat=True))
+    if product_ids:
+        refresh(order.user_id, product_ids)
+
+
+@transaction.atomic
+def rebuild() -> int:
+    rows = _rows(_aggregate(_purchased_lines()))
+    CustomerProductPurchase.objects.all().delete()
+    CustomerProductPurchase.objects.bulk_create(rows, batch_size=2000)
+    return len(rows)
+
+
+def has_purchased(user_id, product_id) -> bool:
+    """Verified-purchase check: a single unique-index lookup."""
+    return CustomerProductPurchase.objects.filter(
+        user_id=user_id, product_id=product_id).exists()
+
+
+def buy_again(user_id, limit: int = 10):
+    """Active products the user bought, most recent first."""
+    return (Product.objects
+            .filter(purchases__user_id=user_id, is_active=True)
+            .order_by("-purchases__last_purchased_at")[:limit])
@@ -0,0 +1,61 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save
+from django.dispatch import Signal, receiver
+
+from apps.orders.models import OrderHeader
+from apps.orders.services import co_purchase, purchase_index
+
+logger = logging.getLogger(__name__)
+
+# Sent after commit whenever an order is created or its status changes through
+# save(). Args: order, old_status (None on create), new_status.
+# Bulk queryset.update() calls bypass it and must announce it themselves.
+order_status_changed = Signal()
+
+
+def announce_after_commit(order, old_status, new_status):
+    """
+    Send order_status_changed once the transaction commits. Every receiver
+    runs even if another fails: the order is already committed, so a failure
+    is logged rather than raised at whoever saved it.
+    """
+    def send():
+        responses = order_status_changed.send_robust(
+            sender=OrderHeader, order=order, old_status=old_status, new_status=new_status)
+        for handler, response in responses:
+            if isinstance(response, Exception):
+                logger.error("order_status_changed receiver %s failed for order %s (%s -> %s)",
+                             getattr(handler, "__qualname__", handler), order.pk,
+                             old_status, new_status, exc_info=response)
+
+    transaction.on_commit(send)
+
+
+@receiver(post_init, sender=OrderHeader)
+def remember_status(sender, instance, **kwargs):
+    # __dict__ lookup so a deferred status field doesn't trigger a query
+    instance._loaded_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=OrderHeader)
+def announce_status_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else instance._loaded_status
+    new_status = instance.status
+    instance._loaded_status = new_status
+    if old_status == new_status:
+        return
+    announce_after_commit(instance, old_status, new_status)
+
+
+@receiver(order_status_changed)
+def update_purchase_index(sender, order, old_status, new_status, **kwargs):
+    purchase_index.on_status_changed(order, old_status, new_status)
+
+
+@receiver(order_status_changed)
+def update_co_purchases(sender, order, old_status, new_status, **kwargs):
+    co_purchase.on_status_changed(order, old_status, new_status)
@@ -6,5 +6,7 @@ from .models import Payment
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ("order", "gateway", "status", "amount_toman",
                     "authority", "ref_id", "created_at")
+    list_select_related = ("order",)
+    raw_id_fields = ("order", "checkout")
     list_filter = ("gateway", "status")
     search_fields = ("order__id", "authority", "ref_id")
@@ -1,23 +1,57 @@
 from django.contrib import admin
-from .models import Review, ReviewMedia, Wishlist
+from django.utils.translation import gettext_lazy as _
+from apps.common import bulk
+from .models import (
+    Review, ReviewMedia, Wishlist, ProductRatingSummary, WishlistNotification
+)
+from .services import moderation
 
 
 class ReviewMediaInline(admin.TabularInline):
     model = ReviewMedia
     extra = 0
+    raw_id_fields = ("media",)
 
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ("product", "user", "order",
                     "rating", "status", "created_at")
+    list_select_related = ("product", "user", "order")
+    raw_id_fields = ("product", "user", "order")
     list_filter = ("status", "rating")
     search_fields = ("product__name_fa", "user__phone_number",
                      "order__order_number")
     inlines = [ReviewMediaInline]
+    actions = ["approve"]
+
+    @admin.action(description=_("تأیید نظرات انتخاب‌شده"), permissions=["change"])
+    def approve(self, request, queryset):
+        bulk.run(self, request, queryset, _("تأیید نظرات"), moderation.approve)
 
 
 @admin.register(Wishlist)
 class WishlistAdmin(admin.ModelAdmin):
     list_display = ("user", "variant", "created_at")
+    list_select_related = ("user", "variant__product")
+    raw_id_fields = ("user", "variant")
+    search_fields = ("user__phone_number", "variant__sku")
+
+
+@admin.register(ProductRatingSummary)
+class ProductRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ("product", "rating_avg", "rating_count",
+                    "stars_5", "stars_4", "stars_3", "stars_2", "stars_1")
+    list_select_related = ("product",)
+    raw_id_fields = ("product",)
+    search_fields = ("product__name_fa",)
+    ordering = ("-rating_avg",)
+
+
+@admin.register(WishlistNotification)
+class WishlistNotificationAdmin(admin.ModelAdmin):
+    list_display = ("user", "variant", "kind", "price_toman", "created_at")
+    list_select_related = ("user", "variant__product")
+    raw_id_fields = ("user", "variant", "message")
+    list_filter = ("kind",)
     search_fields = ("user__phone_number", "variant__sku")
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_globaldiscount_coupon'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductRatingSummary',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to='catalog.product')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='تعداد نظرات')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='مجموع امتیازها')),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+                ('rating_avg', models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True, verbose_name='میانگین امتیاز')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'خلاصه امتیاز محصول',
+                'verbose_name_plural': 'خلاصه امتیاز محصولات',
+                'indexes': [models.Index(fields=['-rating_avg', '-rating_count'], name='reviews_pro_rating__44535b_idx')],
+            },
+        ),
+    ]
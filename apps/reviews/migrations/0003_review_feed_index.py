@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_globaldiscount_coupon'),
+        ('orders', '0002_customer_product_purchase'),
+        ('reviews', '0002_product_rating_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'status', '-created_at', '-id'], name='review_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_globaldiscount_coupon'),
+        ('messaging', '0001_initial'),
+        ('reviews', '0003_review_feed_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WishlistWatchState',
+            fields=[
+                ('variant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='watch_state', serialize=False, to='catalog.productvariant')),
+                ('in_stock', models.BooleanField(default=False)),
+                ('price_toman', models.PositiveIntegerField(blank=True, null=True)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'وضعیت پایش علاقه\u200cمندی',
+                'verbose_name_plural': 'وضعیت\u200cهای پایش علاقه\u200cمندی',
+            },
+        ),
+        migrations.CreateModel(
+            name='WishlistNotification',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('back_in_stock', 'موجود شد'), ('price_drop', 'کاهش قیمت')], max_length=20, verbose_name='نوع')),
+                ('price_toman', models.PositiveIntegerField(blank=True, null=True)),
+                ('message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.messageoutbox')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wishlist_notifications', to=settings.AUTH_USER_MODEL)),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wishlist_notifications', to='catalog.productvariant')),
+            ],
+            options={
+                'verbose_name': 'اعلان علاقه\u200cمندی',
+                'verbose_name_plural': 'اعلان\u200cهای علاقه\u200cمندی',
+                'indexes': [models.Index(fields=['variant', 'kind', '-created_at'], name='reviews_wis_variant_610f11_idx')],
+            },
+        ),
+    ]
@@ -1,11 +1,13 @@
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.models import UUIDModel
 from apps.catalog.models import Product, ProductVariant, MediaAsset
-from apps.orders.models import OrderHeader
+from apps.orders.models import OrderHeader, OrderLine, PURCHASED_STATUSES
+from apps.orders.services.purchase_index import has_purchased
 
 
 class ReviewStatus(models.TextChoices):
@@ -38,10 +40,61 @@ class Review(UUIDModel):
         ordering = ["-created_at"]
         unique_together = [("product", "user", "order")
                            ]  # 1 review per purchase
+        indexes = [
+            # review feed: keyset on (created_at, id) within one product
+            models.Index(fields=["product", "status", "-created_at", "-id"],
+                         name="review_feed_idx"),
+        ]
 
     def __str__(self):
         return f"Review<{self.product_id}, {self.user_id}, {self.rating}>"
 
+    def clean(self):
+        super().clean()
+        # checked when the review is written; editing or moderating it later
+        # mustn't fail because the order was refunded in between
+        if self._state.adding and self.user_id and self.product_id and not self.is_verified_purchase():
+            raise ValidationError(_("فقط خریداران این محصول می‌توانند برای آن نظر ثبت کنند."))
+
+    def is_verified_purchase(self) -> bool:
+        """The review's own order bought the product, or the purchase index says the user did."""
+        if self.order_id and OrderLine.objects.filter(
+                order_id=self.order_id, order__user_id=self.user_id,
+                order__status__in=PURCHASED_STATUSES, variant__product_id=self.product_id).exists():
+            return True
+        return has_purchased(self.user_id, self.product_id)
+
+
+class ProductRatingSummary(models.Model):
+    """
+    Approved-review aggregates per product, kept in sync on review writes
+    (see services/ratings.py). Listing pages sort by `rating_avg`.
+    """
+    product = models.OneToOneField(
+        Product, primary_key=True, on_delete=models.CASCADE, related_name="rating_summary")
+    rating_count = models.PositiveIntegerField(_("تعداد نظرات"), default=0)
+    rating_sum = models.PositiveIntegerField(_("مجموع امتیازها"), default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    rating_avg = models.DecimalField(
+        _("میانگین امتیاز"), max_digits=3, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("خلاصه امتیاز محصول")
+        verbose_name_plural = _("خلاصه امتیاز محصولات")
+        indexes = [models.Index(fields=["-rating_avg", "-rating_count"])]
+
+    def __str__(self):
+        return f"Rating<{self.product_id}, {self.rating_avg} ({self.rating_count})>"
+
+    @property
+    def histogram(self) -> dict:
+        return {star: getattr(self, f"stars_{star}") for star in range(1, 6)}
+
 
 class ReviewMedia(UUIDModel):
     review = models.ForeignKey(
@@ -67,3 +120,41 @@ class Wishlist(UUIDModel):
 
     def __str__(self):
         return f"Wishlist<{self.user_id}, {self.variant_id}>"
+
+
+class WishlistWatchState(models.Model):
+    """Availability and effective price of a wishlisted variant at the last notify run."""
+    variant = models.OneToOneField(
+        ProductVariant, primary_key=True, on_delete=models.CASCADE, related_name="watch_state")
+    in_stock = models.BooleanField(default=False)
+    price_toman = models.PositiveIntegerField(null=True, blank=True)
+    checked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("وضعیت پایش علاقه‌مندی")
+        verbose_name_plural = _("وضعیت‌های پایش علاقه‌مندی")
+
+
+class WishlistAlertKind(models.TextChoices):
+    BACK_IN_STOCK = "back_in_stock", _("موجود شد")
+    PRICE_DROP = "price_drop", _("کاهش قیمت")
+
+
+class WishlistNotification(UUIDModel):
+    """One wishlist alert sent to a user; later alerts of the same kind wait out a cooldown."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE, related_name="wishlist_notifications")
+    variant = models.ForeignKey(
+        ProductVariant, on_delete=models.CASCADE, related_name="wishlist_notifications")
+    kind = models.CharField(_("نوع"), max_length=20, choices=WishlistAlertKind.choices)
+    price_toman = models.PositiveIntegerField(null=True, blank=True)
+    message = models.ForeignKey("messaging.MessageOutbox", null=True, blank=True,
+                                on_delete=models.SET_NULL, related_name="+")
+
+    class Meta:
+        verbose_name = _("اعلان علاقه‌مندی")
+        verbose_name_plural = _("اعلان‌های علاقه‌مندی")
+        indexes = [models.Index(fields=["variant", "kind", "-created_at"])]
+
+    def __str__(self):
+        return f"WishlistNotification<{self.user_id}, {self.variant_id}, {self.kind}>"
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+from apps.reviews.models import Review, ReviewMedia
+
+
+class ReviewMediaSerializer(serializers.ModelSerializer):
+    file_path = serializers.CharField(source="media.file_path")
+    alt_fa = serializers.CharField(source="media.alt_fa")
+
+    class Meta:
+        model = ReviewMedia
+        fields = ("id", "file_path", "alt_fa")
+
+
+class ReviewSerializer(serializers.ModelSerializer):
+    author = serializers.SerializerMethodField()
+    media = ReviewMediaSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ("id", "rating", "title", "content", "author", "media", "created_at")
+
+    def get_author(self, review) -> str:
+        profile = getattr(review.user, "profile", None)
+        if profile is None:
+            return ""
+        # first name + last initial, never the phone number
+        initial = f" {profile.last_name_fa[:1]}." if profile.last_name_fa else ""
+        return f"{profile.first_name_fa}{initial}".strip()
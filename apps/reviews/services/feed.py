@@ -0,0 +1,77 @@
+"""
+Per-product review feed.
+
+Approved reviews, newest first, paginated by keyset on (created_at, id): the
+cursor carries the last row's position, so deep pages cost the same as the
+first one. Reviewer profile and media come from one join and one prefetch
+regardless of page size. The first page of every product is cached as
+rendered data and dropped whenever a review of that product changes.
+"""
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, Q
+
+from apps.reviews.models import Review, ReviewMedia, ReviewStatus
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(review: Review) -> str:
+    raw = f"{review.created_at.isoformat()}|{review.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def feed_queryset(product_id):
+    return (Review.objects
+            .filter(product_id=product_id, status=ReviewStatus.APPROVED)
+            .select_related("user__profile")
+            .prefetch_related(Prefetch(
+                "media", queryset=ReviewMedia.objects.select_related("media").order_by("created_at")))
+            .order_by("-created_at", "-id"))
+
+
+def review_page(product_id, cursor: str | None = None, limit: int | None = None):
+    """Returns (reviews, next_cursor); next_cursor is None on the last page."""
+    limit = limit or settings.REVIEWS_PAGE_SIZE
+    qs = feed_queryset(product_id)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    rows = list(qs[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def first_page_key(product_id) -> str:
+    return f"reviews:feed:{product_id}"
+
+
+def cached_first_page(product_id, render):
+    """First page (default size) via cache; `render(reviews, next_cursor)` builds the payload."""
+    key = first_page_key(product_id)
+    payload = cache.get(key)
+    if payload is None:
+        payload = render(*review_page(product_id))
+        cache.set(key, payload, settings.REVIEWS_FEED_CACHE_TIMEOUT)
+    return payload
+
+
+def invalidate(product_id):
+    transaction.on_commit(lambda: cache.delete(first_page_key(product_id)))
@@ -0,0 +1,24 @@
+from django.db import transaction
+from django.utils import timezone
+
+from apps.reviews.models import Review, ReviewStatus
+from apps.reviews.services import feed, ratings
+
+
+@transaction.atomic
+def approve(review_ids) -> int:
+    """
+    Approve reviews with one UPDATE, then refresh the rating summaries and
+    feed caches of the affected products (the per-save signals don't run).
+    Returns the reviews approved.
+    """
+    pending = (Review.objects.select_for_update()
+               .filter(pk__in=review_ids).exclude(status=ReviewStatus.APPROVED))
+    product_ids = set(pending.values_list("product_id", flat=True))
+    if not product_ids:
+        return 0
+    changed = pending.update(status=ReviewStatus.APPROVED, updated_at=timezone.now())
+    ratings.refresh_summaries(product_ids)
+    for product_id in product_ids:
+        feed.invalidate(product_id)
+    return changed
@@ -0,0 +1,97 @@
+"""
+Per-product rating summaries (count, sum, 1–5 histogram, average).
+
+Only APPROVED reviews count. A review write that changes what counts
+recomputes its product's row from the Review table under a row lock, so
+concurrent moderation of the same product serializes and the later write
+sees the earlier one (an in-memory delta would be applied twice). Rows are
+only ever created for products that have approved reviews, which keeps a
+review deleted by its product's cascade from recreating the summary.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.reviews.models import ProductRatingSummary, Review, ReviewStatus
+
+STARS = range(1, 6)
+SUMMARY_FIELDS = ["rating_count", "rating_sum", *(f"stars_{s}" for s in STARS),
+                  "rating_avg", "updated_at"]
+
+
+def contribution(status, rating):
+    """Rating a review adds to its product's summary, or None if it doesn't count."""
+    if status == ReviewStatus.APPROVED and rating in STARS:
+        return rating
+    return None
+
+
+def _recompute_avg(summary: ProductRatingSummary):
+    if summary.rating_count:
+        summary.rating_avg = (Decimal(summary.rating_sum) / summary.rating_count).quantize(
+            Decimal("0.01"))
+    else:
+        summary.rating_avg = None
+
+
+@transaction.atomic
+def apply_change(old: tuple | None, new: tuple | None):
+    """
+    Apply one review transition. `old` / `new` are (product_id, status, rating)
+    before and after the write; None for create / delete.
+    """
+    before = (old[0], contribution(old[1], old[2])) if old else (None, None)
+    after = (new[0], contribution(new[1], new[2])) if new else (None, None)
+    if before == after:
+        return
+    refresh_summaries({product_id for product_id, rating in (before, after) if rating is not None})
+
+
+def _summaries(reviews) -> list[ProductRatingSummary]:
+    rows = (reviews.filter(status=ReviewStatus.APPROVED)
+            .order_by()
+            .values("product_id")
+            .annotate(rating_count=Count("id"), rating_sum=Sum("rating"),
+                      **{f"stars_{s}": Count("id", filter=Q(rating=s)) for s in STARS}))
+    summaries = []
+    for row in rows:
+        summary = ProductRatingSummary(**row, updated_at=timezone.now())
+        _recompute_avg(summary)
+        summaries.append(summary)
+    return summaries
+
+
+@transaction.atomic
+def rebuild_summaries() -> int:
+    """Recompute every summary from the Review table in one grouped query."""
+    summaries = _summaries(Review.objects.all())
+    ProductRatingSummary.objects.all().delete()
+    ProductRatingSummary.objects.bulk_create(summaries, batch_size=2000)
+    return len(summaries)
+
+
+@transaction.atomic
+def refresh_summaries(product_ids) -> int:
+    """Recompute the summaries of some products, e.g. after a bulk status UPDATE."""
+    product_ids = set(product_ids)
+    if not product_ids:
+        return 0
+    reviews = Review.objects.filter(product_id__in=product_ids)
+    # give every product with approved reviews a row to lock; a concurrent
+    # insert of the same row makes this wait for that transaction
+    rated = set(reviews.filter(status=ReviewStatus.APPROVED).values_list("product_id", flat=True))
+    ProductRatingSummary.objects.bulk_create(
+        [ProductRatingSummary(product_id=product_id) for product_id in rated], ignore_conflicts=True)
+    locked = set(ProductRatingSummary.objects.select_for_update()
+                 .filter(product_id__in=product_ids).values_list("product_id", flat=True))
+    # counted after the lock, so the reviews of a transaction that held it are included
+    summaries = _summaries(reviews)
+    counted = {summary.product_id for summary in summaries}
+    ProductRatingSummary.objects.filter(product_id__in=locked - counted).delete()
+    ProductRatingSummary.objects.bulk_update(
+        [summary for summary in summaries if summary.product_id in locked], SUMMARY_FIELDS)
+    ProductRatingSummary.objects.bulk_create(
+        [summary for summary in summaries if summary.product_id not in locked], ignore_conflicts=True)
+    return len(summaries)
@@ -0,0 +1,131 @@
+"""
+Back-in-stock and price-drop alerts for wishlisted variants.
+
+Each run reads availability and effective price of every wishlisted variant
+in one query, diffs it against WishlistWatchState from the previous run and
+fans the changed variants out to their wishlisting users with one join per
+alert kind. Users who got the same alert for the variant within the cooldown
+are skipped in SQL, so a flapping restock doesn't spam. Outbox messages and
+notification rows are written with bulk_create.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from apps.catalog.models import ProductVariant
+from apps.catalog.services.pricing import effective_price_subquery
+from apps.messaging.models import MessageOutbox
+from apps.reviews.models import (
+    Wishlist, WishlistAlertKind, WishlistNotification, WishlistWatchState,
+)
+
+WRITE_BATCH_SIZE = 2_000
+
+TEMPLATES = {
+    WishlistAlertKind.BACK_IN_STOCK: "«{name}» که در لیست علاقه‌مندی‌های شماست دوباره موجود شد.",
+    WishlistAlertKind.PRICE_DROP: "قیمت «{name}» به {price:,} تومان کاهش یافت.",
+}
+
+
+@dataclass
+class AlertStats:
+    variants: int = 0
+    changed: dict = field(default_factory=dict)  # kind -> variant count
+    messages: dict = field(default_factory=dict)  # kind -> messages queued
+
+
+def current_states() -> dict:
+    """{variant_id: (in_stock, price)} for every active, wishlisted variant."""
+    rows = (ProductVariant.objects
+            .filter(Exists(Wishlist.objects.filter(variant_id=OuterRef("pk"))),
+                    is_active=True, product__is_active=True)
+            .annotate(price=effective_price_subquery(),
+                      available=F("stock__on_hand") - F("stock__reserved"))
+            .values_list("pk", "available", "price"))
+    return {pk: ((available or 0) > 0, price) for pk, available, price in rows}
+
+
+def diff_states(previous: dict, current: dict) -> dict:
+    """
+    Variants per alert kind. Variants without a previous state only get a
+    baseline; a price drop is only announced while the variant is in stock.
+    """
+    changes = {kind: set() for kind in TEMPLATES}
+    for variant_id, (in_stock, price) in current.items():
+        if variant_id not in previous:
+            continue
+        was_in_stock, old_price = previous[variant_id]
+        if in_stock and not was_in_stock:
+            changes[WishlistAlertKind.BACK_IN_STOCK].add(variant_id)
+        elif in_stock and price is not None and old_price is not None and price < old_price:
+            changes[WishlistAlertKind.PRICE_DROP].add(variant_id)
+    return changes
+
+
+def _recipients(kind, variant_ids, cutoff):
+    recently_notified = WishlistNotification.objects.filter(
+        user_id=OuterRef("user_id"), variant_id=OuterRef("variant_id"),
+        kind=kind, created_at__gte=cutoff)
+    return (Wishlist.objects
+            .filter(variant_id__in=variant_ids, user__is_active=True,
+                    user__profile__sms_opt_in=True)
+            .exclude(Exists(recently_notified))
+            .values_list("user_id", "user__phone_number", "variant_id",
+                         "variant__product__name_fa"))
+
+
+def _fan_out(kind, variant_ids, prices, cutoff, dry_run) -> int:
+    messages, notifications, total = [], [], 0
+
+    def flush():
+        if not dry_run:
+            MessageOutbox.objects.bulk_create(messages, batch_size=WRITE_BATCH_SIZE)
+            WishlistNotification.objects.bulk_create(notifications, batch_size=WRITE_BATCH_SIZE)
+        messages.clear()
+        notifications.clear()
+
+    for user_id, phone, variant_id, name in _recipients(kind, variant_ids, cutoff).iterator(
+            chunk_size=WRITE_BATCH_SIZE):
+        price = prices[variant_id]
+        message = MessageOutbox(user_id=user_id, phone_e164=str(phone),
+                                body=TEMPLATES[kind].format(name=name, price=price or 0))
+        messages.append(message)
+        notifications.append(WishlistNotification(
+            user_id=user_id, variant_id=variant_id, kind=kind, price_toman=price,
+            message=message))
+        total += 1
+        if len(messages) >= WRITE_BATCH_SIZE:
+            flush()
+    if messages:
+        flush()
+    return total
+
+
+def notify_wishlists(dry_run: bool = False) -> AlertStats:
+    current = current_states()
+    previous = {pk: (in_stock, price) for pk, in_stock, price in
+                WishlistWatchState.objects.values_list("variant_id", "in_stock", "price_toman")}
+    changes = diff_states(previous, current)
+    prices = {pk: price for pk, (_, price) in current.items()}
+    cutoff = timezone.now() - timedelta(hours=settings.WISHLIST_ALERT_COOLDOWN_HOURS)
+
+    stats = AlertStats(variants=len(current))
+    with transaction.atomic():
+        for kind, variant_ids in changes.items():
+            stats.changed[kind] = len(variant_ids)
+            stats.messages[kind] = (_fan_out(kind, variant_ids, prices, cutoff, dry_run)
+                                    if variant_ids else 0)
+        if not dry_run:
+            WishlistWatchState.objects.bulk_create(
+                [WishlistWatchState(variant_id=pk, in_stock=in_stock, price_toman=price)
+                 for pk, (in_stock, price) in current.items()],
+                batch_size=WRITE_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["variant"],
+                update_fields=["in_stock", "price_toman", "checked_at"],
+            )
+    return stats
@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.reviews.models import Review, ReviewMedia, ReviewStatus
+from apps.reviews.services import feed, ratings
+
+
+def _state(review):
+    return (review.product_id, review.status, review.rating)
+
+
+@receiver(post_init, sender=Review)
+def remember_rating_state(sender, instance, **kwargs):
+    d = instance.__dict__
+    instance._loaded_rating_state = (d.get("product_id"), d.get("status"), d.get("rating"))
+
+
+@receiver(post_save, sender=Review)
+def update_rating_summary(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else instance._loaded_rating_state
+    new = _state(instance)
+    ratings.apply_change(old, new)
+    if ReviewStatus.APPROVED in (old and old[1], new[1]):
+        _invalidate_feeds(old, new)
+    instance._loaded_rating_state = new
+
+
+@receiver(post_delete, sender=Review)
+def remove_from_rating_summary(sender, instance, **kwargs):
+    old = instance._loaded_rating_state
+    ratings.apply_change(old, None)
+    if old[1] == ReviewStatus.APPROVED:
+        _invalidate_feeds(old, None)
+
+
+def _invalidate_feeds(old, new):
+    for product_id in {state[0] for state in (old, new) if state}:
+        feed.invalidate(product_id)
+
+
+@receiver(post_save, sender=ReviewMedia)
+@receiver(post_delete, sender=ReviewMedia)
+def invalidate_feed_on_media_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    product_id, status = (Review.objects.filter(pk=instance.review_id)
+                          .values_list("product_id", "status").first() or (None, None))
+    if status == ReviewStatus.APPROVED:
+        feed.invalidate(product_id)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import ProductReviewListView
+
+urlpatterns = [
+    path("products/<uuid:product_id>/", ProductReviewListView.as_view(),
+         name="product-reviews"),
+]
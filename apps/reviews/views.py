@@ -1,3 +1,28 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.catalog.models import Product
+from apps.reviews.serializers import ReviewSerializer
+from apps.reviews.services import feed
+
+
+class ProductReviewListView(APIView):
+    """Approved reviews of one product, newest first. Pass `?cursor=` from `next` for more."""
+    serializer_class = ReviewSerializer
+
+    def get(self, request, product_id):
+        def render(reviews, next_cursor):
+            if not reviews:  # only pay for the product lookup on empty pages
+                get_object_or_404(Product, pk=product_id, is_active=True)
+            return {"results": ReviewSerializer(reviews, many=True).data, "next": next_cursor}
+
+        cursor = request.query_params.get("cursor")
+        if not cursor:
+            return Response(feed.cached_first_page(product_id, render))
+        try:
+            page = feed.review_page(product_id, cursor)
+        except feed.InvalidCursor:
+            raise ValidationError({"cursor": "Invalid cursor."})
+        return Response(render(*page))
@@ -89,18 +89,35 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.User"
+AUTHENTICATION_BACKENDS = ["apps.accounts.backends.PhoneNumberBackend"]
+
+# Stateless: request.user is built from token claims (no user query per request).
+# Revocations then rely on the cache alone: needs a shared CACHE_URL (check --deploy).
+ACCOUNTS_STATELESS_JWT = env.bool("ACCOUNTS_STATELESS_JWT", default=False)
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.StatelessJWTAuthentication"
+        if ACCOUNTS_STATELESS_JWT else
+        "apps.accounts.authentication.RevocableJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
 }
 
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "apps.accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.RevocableTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "apps.accounts.authentication.ClaimsUser",
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Danidor API",
     "DESCRIPTION": "E-commerce API",
@@ -127,3 +144,100 @@ PAYMENTS_CALLBACK_BASE = env(
     "PAYMENTS_CALLBACK_BASE", default="http://127.0.0.1:8080")
 ZARRINPAL_CALLBACK_PATH = env(
     "ZARRINPAL_CALLBACK_PATH", default="/api/payments/zarrinpal/verify/")
+
+# --- Analytics / EventLog ingestion ---
+# Events are buffered in-process and written with bulk_create.
+ANALYTICS_BUFFER_ENABLED = env.bool("ANALYTICS_BUFFER_ENABLED", default=True)
+ANALYTICS_FLUSH_SIZE = env.int("ANALYTICS_FLUSH_SIZE", default=500)
+ANALYTICS_FLUSH_INTERVAL = env.float("ANALYTICS_FLUSH_INTERVAL", default=2.0)
+ANALYTICS_MAX_BUFFER = env.int("ANALYTICS_MAX_BUFFER", default=50_000)
+# drop_oldest | drop_newest | flush (caller writes synchronously)
+ANALYTICS_BACKPRESSURE = env("ANALYTICS_BACKPRESSURE", default="drop_oldest")
+# EventLog is partitioned by month on PostgreSQL; older months are archived + dropped.
+ANALYTICS_EVENTLOG_RETENTION_MONTHS = env.int(
+    "ANALYTICS_EVENTLOG_RETENTION_MONTHS", default=13)
+ANALYTICS_ARCHIVE_DIR = env("ANALYTICS_ARCHIVE_DIR", default=str(BASE_DIR / "archive"))
+
+# --- Analytics / server-side forwarding (GA4 Measurement Protocol, Mixpanel /import) ---
+ANALYTICS_GA4_ENDPOINT = env(
+    "ANALYTICS_GA4_ENDPOINT", default="https://www.google-analytics.com/mp/collect")
+ANALYTICS_GA4_MEASUREMENT_ID = env("ANALYTICS_GA4_MEASUREMENT_ID", default="")
+ANALYTICS_GA4_API_SECRET = env("ANALYTICS_GA4_API_SECRET", default="")
+ANALYTICS_MIXPANEL_ENDPOINT = env(
+    "ANALYTICS_MIXPANEL_ENDPOINT", default="https://api.mixpanel.com/import")
+ANALYTICS_MIXPANEL_API_SECRET = env("ANALYTICS_MIXPANEL_API_SECRET", default="")
+ANALYTICS_FORWARD_BATCH_SIZE = env.int("ANALYTICS_FORWARD_BATCH_SIZE", default=1000)
+ANALYTICS_FORWARD_CONCURRENCY = env.int("ANALYTICS_FORWARD_CONCURRENCY", default=4)
+ANALYTICS_FORWARD_MAX_RETRIES = env.int("ANALYTICS_FORWARD_MAX_RETRIES", default=4)
+# Columnar exports for analysts (`export_analytics`); Parquet needs pyarrow, else csv.gz.
+ANALYTICS_EXPORT_DIR = env("ANALYTICS_EXPORT_DIR", default=str(BASE_DIR / "exports"))
+# rows younger than this are left to the next incremental run (late buffer flushes)
+ANALYTICS_EXPORT_LAG_SECONDS = env.int("ANALYTICS_EXPORT_LAG_SECONDS", default=600)
+
+# --- Reviews ---
+REVIEWS_PAGE_SIZE = env.int("REVIEWS_PAGE_SIZE", default=20)
+# First page of each product's review feed is cached until a review on it changes.
+REVIEWS_FEED_CACHE_TIMEOUT = env.int("REVIEWS_FEED_CACHE_TIMEOUT", default=600)
+
+# --- Wishlist alerts (`notify_wishlists`) ---
+# A user gets the same alert (back in stock / price drop) for a variant at most once per cooldown.
+WISHLIST_ALERT_COOLDOWN_HOURS = env.int("WISHLIST_ALERT_COOLDOWN_HOURS", default=72)
+
+# --- OTP ---
+# Codes are HMAC-SHA256 hashed with this key (defaults to SECRET_KEY).
+OTP_HMAC_KEY = env("OTP_HMAC_KEY", default="")
+OTP_LENGTH = env.int("OTP_LENGTH", default=6)
+OTP_TTL_SECONDS = env.int("OTP_TTL_SECONDS", default=120)
+OTP_MAX_ATTEMPTS = env.int("OTP_MAX_ATTEMPTS", default=5)
+# sliding-window limits (requests per window, in seconds)
+OTP_ISSUE_PER_PHONE = env.int("OTP_ISSUE_PER_PHONE", default=3)
+OTP_ISSUE_PER_IP = env.int("OTP_ISSUE_PER_IP", default=20)
+OTP_ISSUE_WINDOW = env.int("OTP_ISSUE_WINDOW", default=600)
+OTP_VERIFY_PER_PHONE = env.int("OTP_VERIFY_PER_PHONE", default=10)
+OTP_VERIFY_PER_IP = env.int("OTP_VERIFY_PER_IP", default=60)
+OTP_VERIFY_WINDOW = env.int("OTP_VERIFY_WINDOW", default=600)
+
+# --- CMS rendering cache ---
+CMS_RENDER_CACHE_TIMEOUT = env.int("CMS_RENDER_CACHE_TIMEOUT", default=86400)
+# linked-products box (shows live prices)
+CMS_FRAGMENT_CACHE_TIMEOUT = env.int("CMS_FRAGMENT_CACHE_TIMEOUT", default=300)
+# per-process SeoMeta rows kept by the SEO resolver before it starts over
+CMS_SEO_LOCAL_CACHE_SIZE = env.int("CMS_SEO_LOCAL_CACHE_SIZE", default=50_000)
+
+# --- Sitemaps (`build_sitemaps`) ---
+SITE_URL = env("SITE_URL", default="https://example.com")
+# served from the site root (/sitemap.xml) by apps.cms.views.sitemap
+SITEMAP_DIR = env("SITEMAP_DIR", default=str(BASE_DIR / "sitemaps"))
+# shard digests of the last run; the view only serves the shards listed here
+SITEMAP_MANIFEST = env("SITEMAP_MANIFEST", default=str(BASE_DIR / "sitemaps-manifest.json"))
+# product / category pages are rendered by the storefront, not this project: set
+# their URL patterns (e.g. "/products/{slug}/") to list them; empty leaves them out
+SITEMAP_PRODUCT_PATH = env("SITEMAP_PRODUCT_PATH", default="")
+SITEMAP_CATEGORY_PATH = env("SITEMAP_CATEGORY_PATH", default="")
+
+# --- Content attribution (`rebuild_article_attribution`) ---
+# an order is credited to the buyer's last article view at most this many days earlier
+ATTRIBUTION_LOOKBACK_DAYS = env.int("ATTRIBUTION_LOOKBACK_DAYS", default=7)
+
+# --- Recommendations (`refresh_recommendations`) ---
+RECOMMENDATIONS_TOP_K = env.int("RECOMMENDATIONS_TOP_K", default=6)
+# pairs bought together fewer times than this are noise, not "bought together"
+RECOMMENDATIONS_MIN_CO_PURCHASES = env.int("RECOMMENDATIONS_MIN_CO_PURCHASES", default=2)
+
+# --- Image derivatives (`build_media_derivatives`, needs Pillow) ---
+MEDIA_DERIVATIVE_WIDTHS = env.list("MEDIA_DERIVATIVE_WIDTHS", cast=int, default=[320, 640, 960, 1280, 1920])
+# best first; formats the installed Pillow can't encode are skipped
+MEDIA_DERIVATIVE_FORMATS = env.list("MEDIA_DERIVATIVE_FORMATS", default=["avif", "webp"])
+MEDIA_WEBP_QUALITY = env.int("MEDIA_WEBP_QUALITY", default=80)
+MEDIA_AVIF_QUALITY = env.int("MEDIA_AVIF_QUALITY", default=55)
+MEDIA_DERIVATIVE_WORKERS = env.int("MEDIA_DERIVATIVE_WORKERS", default=os.cpu_count() or 2)
+
+# --- Admin ---
+# changelists using EstimatedCountAdminMixin show the planner's row estimate above this size
+ADMIN_ESTIMATED_COUNT_THRESHOLD = env.int("ADMIN_ESTIMATED_COUNT_THRESHOLD", default=100_000)
+# bulk admin actions: larger selections run in a background thread
+ADMIN_BULK_SYNC_LIMIT = env.int("ADMIN_BULK_SYNC_LIMIT", default=1_000)
+ADMIN_BULK_CHUNK_SIZE = env.int("ADMIN_BULK_CHUNK_SIZE", default=500)
+ADMIN_BULK_PROGRESS_TIMEOUT = env.int("ADMIN_BULK_PROGRESS_TIMEOUT", default=86400)
+# a running job without a progress save for this long is shown as failed (its worker died)
+ADMIN_BULK_STALE_AFTER = env.int("ADMIN_BULK_STALE_AFTER", default=600)